@@ -0,0 +1,97 @@
+"""Benchmark the row by row and the vectorised adjust_event_and_sports
+on a synthetic h2 stream of 100 000 rows.
+
+The stream repeats the sports list of Paris 2024, each sport header is
+followed by a random number of event headers, some of them named like a
+sport, so the greedy matching of the headers is exercised.
+
+Run from the repository root:
+    python benchmarks/bench_adjust_event_and_sports.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd  # noqa: E402
+
+from paris_frames import paris_frames  # noqa: E402
+
+from olympics_data_project.data_cleaning.clean_paris_data import (  # noqa: E402
+    SPORTS_PATH,
+    adjust_event_and_sports,
+    open_sports_list,
+)
+
+ROWS = 100_000
+SEED = 2024
+
+
+def legacy_adjust_event_and_sports(df: pd.DataFrame, sport_list: list) -> pd.DataFrame:
+    """The row by row version replaced by the vectorised one."""
+    j = 0
+    for i, row in df.iterrows():
+        try:
+            if j >= len(sport_list):
+                df.loc[i, "Sport"] = sport_list[-1]
+            elif row["Sport"] == sport_list[j]:
+                j += 1
+            else:
+                df.loc[i, "Sport"] = sport_list[j - 1]
+        except:  # noqa: E722
+            continue
+    return df
+
+
+def synthetic_stream(sports: list, events: list, rows: int) -> tuple:
+    """Return a DataFrame of h2 headers and the sports list it follows."""
+    rng = random.Random(SEED)
+    sport_list = []
+    h2_data = [rng.choice(events) for _ in range(3)]
+    while len(h2_data) < rows:
+        sport = rng.choice(sports)
+        sport_list.append(sport)
+        h2_data.append(sport)
+        for _ in range(rng.randint(0, 8)):
+            # a few event headers repeat a sport name
+            pool = sports if rng.random() < 0.05 else events
+            h2_data.append(rng.choice(pool))
+
+    # some headers are missing from the stream, the rest are sports
+    sport_list.extend(rng.sample(sports, 3))
+
+    df = pd.DataFrame({"Sport": h2_data[:rows]})
+    df["Event"] = df["Sport"]
+    return df, sport_list
+
+
+def timed(func, df, sport_list):
+    start = time.perf_counter()
+    result = func(df.copy(), sport_list)
+    return result, time.perf_counter() - start
+
+
+def main():
+    sports = sorted(set(open_sports_list(SPORTS_PATH)))
+    events = sorted(set(paris_frames()["adjust_event_and_sports"]["Sport"]))
+    events = [event for event in events if event not in sports]
+    df, sport_list = synthetic_stream(sports, events, ROWS)
+
+    legacy, legacy_seconds = timed(legacy_adjust_event_and_sports, df, sport_list)
+    vectorised, vectorised_seconds = timed(adjust_event_and_sports, df, sport_list)
+
+    pd.testing.assert_frame_equal(vectorised, legacy)
+
+    print(f"{len(df)} h2 headers, {len(sport_list)} sports")
+    print(f"row by row: {legacy_seconds:7.3f}s")
+    print(
+        f"vectorised: {vectorised_seconds:7.3f}s "
+        f"(speedup {legacy_seconds / vectorised_seconds:5.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark the row by row and the vectorised convert_medal_list_to_df
+on the Paris DataFrame replicated 100 times.
+
+Run from the repository root:
+    python benchmarks/bench_convert_medal_list.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd  # noqa: E402
+
+from paris_frames import paris_frames, replicate  # noqa: E402
+
+from olympics_data_project.data_cleaning.clean_paris_data import (  # noqa: E402
+    convert_medal_list_to_df,
+)
+
+REPLICAS = 100
+
+
+def legacy_convert_medal_list_to_df(df: pd.DataFrame) -> pd.DataFrame:
+    """The row by row version replaced by the vectorised one."""
+    temp_df = df.copy()
+    temp_df["Gold"] = None
+    temp_df["Silver"] = None
+    temp_df["Bronze"] = None
+    temp_df["Tie"] = None
+    for i, row in temp_df.iterrows():
+        for medal in row["Medal Winners"]:
+            if "Gold" in medal:
+                count = temp_df.loc[i, "Medal Winners"].count("Gold")
+                if count > 1:
+                    temp_df.loc[i, "Tie"] = row["Medal Winners"]
+                temp_df.loc[i, "Gold"] = medal
+            elif "Silver" in medal:
+                count = temp_df.loc[i, "Medal Winners"].count("Silver")
+                if count > 1:
+                    temp_df.loc[i, "Tie"] = row["Medal Winners"]
+                temp_df.loc[i, "Silver"] = medal
+            elif "Bronze" in medal:
+                count = temp_df.loc[i, "Medal Winners"].count("Bronze")
+                if count > 1:
+                    temp_df.loc[i, "Tie"] = row["Medal Winners"]
+                temp_df.loc[i, "Bronze"] = medal
+    return temp_df
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return result, time.perf_counter() - start
+
+
+def main():
+    df = replicate(paris_frames()["convert_medal_list_to_df"], REPLICAS)
+
+    legacy, legacy_seconds = timed(legacy_convert_medal_list_to_df, df)
+    vectorised, vectorised_seconds = timed(convert_medal_list_to_df, df)
+
+    pd.testing.assert_frame_equal(vectorised, legacy)
+    # missing medals are None, not NaN, like the row by row version
+    for column in ["Gold", "Silver", "Bronze", "Tie"]:
+        assert (
+            vectorised[column].isna() == legacy[column].map(lambda v: v is None)
+        ).all()
+
+    print(f"{len(df)} events ({REPLICAS} copies of Paris 2024)")
+    print(f"row by row: {legacy_seconds:7.3f}s")
+    print(
+        f"vectorised: {vectorised_seconds:7.3f}s "
+        f"(speedup {legacy_seconds / vectorised_seconds:5.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
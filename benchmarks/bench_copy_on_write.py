@@ -0,0 +1,146 @@
+"""Benchmark the memory of the clean_paris_data steps with and without
+pandas copy on write, on the Paris DataFrame replicated 200 times.
+
+Each mode runs in a fresh process. One run measures the peak resident
+memory and the time, a second run traces the allocations of each step
+with tracemalloc: the peak memory while the step runs and the net number
+of memory blocks it leaves allocated, negative when it frees more blocks
+than it keeps.
+
+Run from the repository root:
+    python benchmarks/bench_copy_on_write.py
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd  # noqa: E402
+
+from paris_frames import paris_frames, replicate  # noqa: E402
+
+import olympics_data_project.data_cleaning.clean_paris_data as cpd  # noqa: E402
+from olympics_data_project.data_cleaning.corrections import (  # noqa: E402
+    CorrectionRules,
+)
+
+REPLICAS = 200
+MODES = {"copy": False, "copy on write": True}
+
+
+def remove_ties(df: pd.DataFrame) -> pd.DataFrame:
+    bronze_df, tie_list = cpd.deal_with_ties(df)
+    return cpd.remove_bronze_ties(df, bronze_df, tie_list)
+
+
+def stages(corrections: CorrectionRules) -> list:
+    """The DataFrame steps of clean_paris_data after insert_p_events."""
+    return [
+        ("convert_medal_list_to_df", cpd.convert_medal_list_to_df),
+        ("remove_medal_colors", cpd.remove_medal_colors),
+        ("melt_medals", cpd.melt_medals),
+        (
+            "split_country_athlete",
+            lambda df: cpd.split_country_athlete(df, cpd.COUNTRY_PATH),
+        ),
+        ("remove_bronze_ties", remove_ties),
+        ("fill_athlete_none", cpd.fill_athlete_none),
+        ("create_100m_breastroke", cpd.create_100m_breastroke),
+        ("fix_athletes", lambda df: cpd.fix_athletes(df, corrections)),
+        ("add_paris_columns", cpd.add_paris_columns),
+        ("replace_some_country_names", cpd.replace_some_country_names),
+        ("assign_noc_to_paris", cpd.assign_noc_to_paris),
+    ]
+
+
+def peak_rss_mib() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_mode(copy_on_write: bool, trace: bool) -> dict:
+    """Run the steps once and return the measurements, in this process."""
+    df = replicate(paris_frames()["convert_medal_list_to_df"], REPLICAS)
+    corrections = CorrectionRules.load()
+    result = {"rows": len(df), "input_rss": peak_rss_mib(), "stages": {}}
+
+    if trace:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    with pd.option_context("mode.copy_on_write", copy_on_write):
+        for name, stage in stages(corrections):
+            if not trace:
+                df = stage(df)
+                continue
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            blocks = len(tracemalloc.take_snapshot().traces)
+            df = stage(df)
+            _, peak = tracemalloc.get_traced_memory()
+            result["stages"][name] = {
+                "peak": (peak - before) / 2**20,
+                "blocks": len(tracemalloc.take_snapshot().traces) - blocks,
+            }
+    result["seconds"] = time.perf_counter() - start
+    result["peak_rss"] = peak_rss_mib()
+    result["output_rows"] = len(df)
+
+    if trace:
+        result["traced_peak"] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return result
+
+
+def measure(mode: str, trace: bool) -> dict:
+    """Run a mode in a fresh process, so each peak is its own."""
+    output = subprocess.run(
+        [sys.executable, __file__, mode, "trace" if trace else "rss"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    results = {}
+    for mode in MODES:
+        results[mode] = measure(mode, trace=False)
+        results[mode]["stages"] = measure(mode, trace=True)["stages"]
+
+    rows = results["copy"]["rows"]
+    print(f"{rows} events ({REPLICAS} copies of Paris 2024)\n")
+    print(f"{'':28}" + "".join(f"{mode:>28}" for mode in MODES))
+    print(
+        f"{'peak RSS above input (MiB)':28}"
+        + "".join(
+            f"{results[mode]['peak_rss'] - results[mode]['input_rss']:28.1f}"
+            for mode in MODES
+        )
+    )
+    print(
+        f"{'time (s)':28}"
+        + "".join(f"{results[mode]['seconds']:28.2f}" for mode in MODES)
+    )
+    print(f"\n{'step peak MiB / net blocks':28}")
+    for name in results["copy"]["stages"]:
+        cells = []
+        for mode in MODES:
+            stage = results[mode]["stages"][name]
+            cells.append(f"{stage['peak']:18.1f} / {stage['blocks']:7d}")
+        print(f"{name:28}" + "".join(cells))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        result = run_mode(MODES[sys.argv[1]], sys.argv[2] == "trace")
+        print(json.dumps(result))
+    else:
+        main()
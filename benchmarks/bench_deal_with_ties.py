@@ -0,0 +1,114 @@
+"""Benchmark the row by row and the vectorised deal_with_ties
+on the split Paris DataFrame replicated 100 times.
+
+Run from the repository root:
+    python benchmarks/bench_deal_with_ties.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd  # noqa: E402
+from paris_frames import paris_frames, replicate  # noqa: E402
+
+from olympics_data_project.data_cleaning.clean_paris_data import (  # noqa: E402
+    deal_with_ties,
+    remove_bronze_ties,
+)
+
+REPLICAS = 100
+
+
+def legacy_deal_with_ties(df: pd.DataFrame) -> tuple:
+    """The row by row version replaced by the vectorised one."""
+    temp_df = df[df["Country"].isna()].copy()
+    bronze_list = []
+    tie_list = []
+    bronze_tie_sports = ["WRESTLING", "JUDO", "TAEKWONDO", "BOXING"]
+
+    for i, row in temp_df.iterrows():
+        if (
+            row["Sport"] in bronze_tie_sports
+            and "Bronze" in row["Medal"]
+            and "and" in row["Athlete"]
+        ):
+            athletes = row["Athlete"].split(" and ")
+            try:
+                for athlete in athletes:
+                    if "Dauren Kurugliev" in athlete:
+                        athlete_name = "Dauren Kurugliev"
+                        athlete_country = "Greece"
+                    else:
+                        athlete_split = athlete.split(", ")
+                        athlete_name = athlete_split[0]
+                        athlete_country = athlete_split[1]
+                    bronze_list.append(
+                        {
+                            "Sport": row["Sport"],
+                            "Event": row["Event"],
+                            "Medal": row["Medal"],
+                            "Athlete": athlete_name,
+                            "Country": athlete_country,
+                        }
+                    )
+                    tie_list.append(i)
+            except:  # noqa: E722
+                continue
+
+    two_ties_df = temp_df[
+        (temp_df["Event"] == "MEN’S HORIZONTAL BAR")
+        | (temp_df["Event"] == "WOMEN’S HIGH JUMP")
+    ].copy()
+    for i, row in two_ties_df.iterrows():
+        athletes = row["Athlete"].split(" and ")
+        for athlete in athletes:
+            athlete_split = athlete.split(", ")
+            athlete_name = athlete_split[0]
+            athlete_country = athlete_split[1]
+            bronze_list.append(
+                {
+                    "Sport": row["Sport"],
+                    "Event": row["Event"],
+                    "Medal": row["Medal"],
+                    "Athlete": athlete_name,
+                    "Country": athlete_country,
+                }
+            )
+            tie_list.append(i)
+
+    bronze_df = pd.DataFrame(bronze_list)
+    return bronze_df, tie_list
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return result, time.perf_counter() - start
+
+
+def main():
+    df = replicate(paris_frames()["deal_with_ties"], REPLICAS)
+
+    (legacy_df, legacy_ties), legacy_seconds = timed(legacy_deal_with_ties, df)
+    (bronze_df, tie_list), vectorised_seconds = timed(deal_with_ties, df)
+
+    pd.testing.assert_frame_equal(bronze_df, legacy_df)
+    assert tie_list == legacy_ties
+    pd.testing.assert_frame_equal(
+        remove_bronze_ties(df, bronze_df, tie_list),
+        remove_bronze_ties(df, legacy_df, legacy_ties),
+    )
+
+    print(f"{len(df)} medals, {len(bronze_df)} tied athletes")
+    print(f"row by row: {legacy_seconds:7.3f}s")
+    print(
+        f"vectorised: {vectorised_seconds:7.3f}s "
+        f"(speedup {legacy_seconds / vectorised_seconds:5.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
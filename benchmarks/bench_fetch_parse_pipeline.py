@@ -0,0 +1,98 @@
+"""Benchmark parsing the Olympedia sport pages on the fetch threads against
+the fetch/parse pipeline with a process pool, on pages large enough for
+parsing to be the bottleneck.
+
+Run from the repository root:
+    python benchmarks/bench_fetch_parse_pipeline.py
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(root_dir)
+sys.path.append(os.path.join(root_dir, "tests"))
+
+import pandas as pd  # noqa: E402
+
+from olympics_data_project.web_scrapers.http_client import (  # noqa: E402
+    HttpClient,
+    set_client,
+)
+from olympics_data_project.web_scrapers.tokyo2020_medals_scraper import (  # noqa: E402
+    scrape_all_events_medals,
+)
+from stub_server import StubServer, make_medals_page  # noqa: E402
+
+N_SPORTS = 46
+EVENTS_PER_SPORT = 150
+LATENCY = 0.05
+MAX_WORKERS = 8
+PARSE_WORKERS = (0, 2, 4)
+
+
+def build_site() -> dict:
+    pages = {}
+    for s in range(N_SPORTS):
+        events = {
+            f"Sport {s} Event {e}": [f"Athlete {s}-{e}-{m}" for m in range(3)]
+            + ["USA", "CHN", "JPN"]
+            for e in range(EVENTS_PER_SPORT)
+        }
+        pages[f"/editions/61/sports/S{s:02d}"] = make_medals_page(events)
+    return pages
+
+
+def main():
+    # measure the network path, not the response cache
+    set_client(HttpClient(cache_dir=None))
+
+    pages = build_site()
+    page_size = sum(len(page) for page in pages.values()) / len(pages)
+    with StubServer(pages, latency=LATENCY) as server:
+        links_df = pd.DataFrame(
+            {
+                "href": [server.url(path) for path in pages],
+                "text": [f"Sport {s}" for s in range(N_SPORTS)],
+            }
+        )
+
+        timings = {}
+        results = {}
+        reports = {}
+        for parse_workers in PARSE_WORKERS:
+            output = io.StringIO()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(output):
+                results[parse_workers] = scrape_all_events_medals(
+                    links_df,
+                    max_workers=MAX_WORKERS,
+                    delay=0,
+                    parse_workers=parse_workers,
+                )
+            timings[parse_workers] = time.perf_counter() - start
+            reports[parse_workers] = output.getvalue().splitlines()[-3:]
+
+    assert all(result == results[0] for result in results.values())
+
+    print(
+        f"{N_SPORTS} sport pages of {page_size / 1024:.0f} KiB, "
+        f"{LATENCY}s latency, {MAX_WORKERS} fetch threads"
+    )
+    for parse_workers, seconds in timings.items():
+        label = (
+            "parse on fetch threads"
+            if parse_workers == 0
+            else (f"parse_workers={parse_workers}")
+        )
+        print(f"{label:>24}: {seconds:6.2f}s (speedup {timings[0] / seconds:4.1f}x)")
+        if parse_workers:
+            for line in reports[parse_workers]:
+                print(f"{'':>26}{line}")
+
+
+if __name__ == "__main__":
+    main()
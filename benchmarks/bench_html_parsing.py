@@ -0,0 +1,65 @@
+"""Benchmark the parse time and peak memory of each parser backend
+on the saved HTML fixtures, with and without the strainers.
+
+Run from the repository root:
+    python benchmarks/bench_html_parsing.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(root_dir)
+
+from olympics_data_project.web_scrapers.html_parsing import (  # noqa: E402
+    AP_NEWS_STRAINER,
+    MEDALS_STRAINER,
+    available_parsers,
+    make_soup,
+)
+
+FIXTURES_DIR = os.path.join(root_dir, "tests", "fixtures", "html")
+FIXTURES = {
+    "ap_news_medal_winners.html": AP_NEWS_STRAINER,
+    "olympedia_sport_medals.html": MEDALS_STRAINER,
+}
+REPEATS = 5
+
+
+def measure(html, parser, strainer):
+    """Return the best parse time and the peak traced memory."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        make_soup(html, parse_only=strainer, parser=parser)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    soup = make_soup(html, parse_only=strainer, parser=parser)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del soup
+
+    return best, peak
+
+
+def main():
+    print(
+        f"{'fixture':<30} {'parser':<12} {'mode':<9} {'time (ms)':>10} {'peak (MB)':>10}"
+    )
+    for name, strainer in FIXTURES.items():
+        with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+            html = f.read()
+        for parser in available_parsers():
+            for mode, parse_only in [("full", None), ("strained", strainer)]:
+                seconds, peak = measure(html, parser, parse_only)
+                print(
+                    f"{name:<30} {parser:<12} {mode:<9} "
+                    f"{seconds * 1000:>10.1f} {peak / 1e6:>10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark combining the processed datasets from scratch against the
+incremental combine, with nothing changed and with one dataset changed.
+
+The datasets are copied to a temporary directory, with the Kaggle dataset
+repeated to stand for the rows of more Games. A change appends a row to
+the Tokyo dataset.
+
+Run from the repository root:
+    python benchmarks/bench_incremental_combine.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(root_dir)
+
+import pandas as pd  # noqa: E402
+
+import olympics_data_project.data_cleaning.combine_datasets as cd  # noqa: E402
+from olympics_data_project.data_cleaning import schema  # noqa: E402
+
+KAGGLE_REPLICAS = 10
+
+
+def copy_sources(tmp_dir: Path) -> dict:
+    sources = {}
+    for name, path in cd.SOURCES.items():
+        sources[name] = tmp_dir / path.name
+        shutil.copy(path, sources[name])
+
+    kaggle = pd.read_csv(cd.KAGGLE_PATH)
+    pd.concat([kaggle] * KAGGLE_REPLICAS).to_csv(sources["kaggle"], index=False)
+    return sources
+
+
+def from_scratch(sources: dict) -> pd.DataFrame:
+    """The combine without a cache, as combine_datasets then format_the_strings."""
+    frames = [schema.read_csv(path)[cd.FINAL_COLUMNS] for path in sources.values()]
+    return cd.format_the_strings(schema.concat(frames))
+
+
+def timed(func) -> tuple:
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_dir = Path(tmp_dir)
+        sources = copy_sources(tmp_dir)
+        cache_dir = tmp_dir / "cache"
+
+        def incremental():
+            return cd.combine_incremental(sources, cache_dir)
+
+        full_df, full_seconds = timed(lambda: from_scratch(sources))
+        _, cold_seconds = timed(incremental)
+        warm_df, warm_seconds = timed(incremental)
+        pd.testing.assert_frame_equal(warm_df, schema.apply_schema(full_df))
+
+        with open(sources["tokyo"], "a") as f:
+            f.write("Ann,FRA,2020,Summer,Tokyo,Judo,Open,Gold,France\n")
+        changed_df, changed_seconds = timed(incremental)
+        pd.testing.assert_frame_equal(
+            changed_df, schema.apply_schema(from_scratch(sources))
+        )
+
+    print(f"{len(warm_df)} rows, Kaggle dataset repeated {KAGGLE_REPLICAS} times")
+    print(f"from scratch:          {full_seconds:7.3f}s")
+    print(f"incremental, cold:     {cold_seconds:7.3f}s")
+    print(
+        f"incremental, no change:{warm_seconds:7.3f}s "
+        f"(speedup {full_seconds / warm_seconds:5.1f}x)"
+    )
+    print(
+        f"incremental, tokyo:    {changed_seconds:7.3f}s "
+        f"(speedup {full_seconds / changed_seconds:5.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Benchmark the peak memory of reading the Kaggle athlete events csv whole
+and then filtering it, against read_medal_rows which filters each chunk.
+
+athlete_events.csv is not in the repository, so a synthetic csv with the
+same 15 columns, number of rows and share of medal and Summer rows is
+written to a temporary directory. Each reader runs in a fresh process so
+each peak resident memory is its own.
+
+Run from the repository root:
+    python benchmarks/bench_kaggle_reader.py
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(root_dir)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import olympics_data_project.data_cleaning.clean_kaggle_data as ckd  # noqa: E402
+
+ROWS = 271_116
+MEDAL_SHARE = 0.147
+SUMMER_SHARE = 0.82
+
+
+def write_athlete_events(path: str, rows: int = ROWS, seed: int = 0) -> None:
+    """Write a synthetic csv in the layout of athlete_events.csv."""
+    rng = np.random.default_rng(seed)
+    noc = np.array(["USA", "FRA", "GBR", "GER", "ITA", "JPN", "AUS", "CAN"])
+    sports = np.array(["Athletics", "Swimming", "Rowing", "Fencing", "Judo"])
+    medals = np.array(["Gold", "Silver", "Bronze"], dtype=object)
+    year = rng.choice(np.arange(1896, 2017, 4), rows)
+    summer = rng.random(rows) < SUMMER_SHARE
+    sport = rng.choice(sports, rows)
+    medal = np.where(rng.random(rows) < MEDAL_SHARE, rng.choice(medals, rows), None)
+
+    pd.DataFrame(
+        {
+            "ID": np.arange(1, rows + 1),
+            "Name": [f"Athlete {i}" for i in rng.integers(0, 135_000, rows)],
+            "Sex": rng.choice(["M", "F"], rows),
+            "Age": rng.integers(14, 60, rows).astype(float),
+            "Height": rng.normal(175, 10, rows).round(),
+            "Weight": rng.normal(70, 12, rows).round(),
+            "Team": [f"{team}-{n}" for team, n in zip(rng.choice(noc, rows), year % 3)],
+            "NOC": rng.choice(noc, rows),
+            "Games": [
+                f"{y} {'Summer' if s else 'Winter'}" for y, s in zip(year, summer)
+            ],
+            "Year": year,
+            "Season": np.where(summer, "Summer", "Winter"),
+            "City": rng.choice(["Athina", "London", "Paris", "Sydney"], rows),
+            "Sport": sport,
+            "Event": [f"{s} Men's Event {n}" for s, n in zip(sport, year % 7)],
+            "Medal": medal,
+        }
+    ).to_csv(path, index=False)
+
+
+def read_whole(path: str) -> pd.DataFrame:
+    """The current path: read every row and column, then filter."""
+    df = ckd.import_data(path)
+    df = ckd.remove_null_medals(df)
+    return ckd.remove_winter_olympics(df)
+
+
+READERS = {"whole csv": read_whole, "chunked": ckd.read_medal_rows}
+
+
+def peak_rss_mib() -> float:
+    """Return the peak resident memory of this process.
+
+    The high water mark of /proc is reset by exec, ru_maxrss keeps the peak
+    of the parent that wrote the csv, so it is only used without /proc.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_reader(reader: str, path: str) -> dict:
+    """Read the csv once and return the measurements, in this process."""
+    result = {"baseline_rss": peak_rss_mib()}
+    start = time.perf_counter()
+    df = READERS[reader](path)
+    result["seconds"] = time.perf_counter() - start
+    result["peak_rss"] = peak_rss_mib()
+    result["rows"] = len(df)
+    result["frame_mib"] = df.memory_usage(deep=True).sum() / 2**20
+    return result
+
+
+def measure(reader: str, path: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, __file__, reader, path],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "athlete_events.csv")
+        write_athlete_events(path)
+        size = os.path.getsize(path) / 2**20
+
+        pd.testing.assert_frame_equal(
+            ckd.remove_columns(ckd.read_medal_rows(path)),
+            ckd.remove_columns(read_whole(path)),
+        )
+        results = {reader: measure(reader, path) for reader in READERS}
+
+    print(f"{ROWS} rows, {size:.1f} MiB csv")
+    print(f"{'':28}" + "".join(f"{reader:>14}" for reader in READERS))
+    for label, value in [
+        ("medal rows kept", lambda r: f"{r['rows']:14d}"),
+        ("kept frame (MiB)", lambda r: f"{r['frame_mib']:14.1f}"),
+        (
+            "peak RSS above start (MiB)",
+            lambda r: f"{r['peak_rss'] - r['baseline_rss']:14.1f}",
+        ),
+        ("time (s)", lambda r: f"{r['seconds']:14.2f}"),
+    ]:
+        print(f"{label:28}" + "".join(value(results[reader]) for reader in READERS))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        print(json.dumps(run_reader(sys.argv[1], sys.argv[2])))
+    else:
+        main()
@@ -0,0 +1,97 @@
+"""Benchmark reading a sport or a Games from the partitioned Parquet
+dataset against parsing the whole all_olympics_data.csv and filtering it.
+
+The dataset is written to a temporary directory from the combined csv. The
+bytes read are the sizes of the files of the partitions that match the
+filters. Needs pyarrow.
+
+Run from the repository root:
+    python benchmarks/bench_parquet_store.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(root_dir)
+
+import pandas as pd  # noqa: E402
+
+from olympics_data_project.data_cleaning import parquet_store, schema  # noqa: E402
+from olympics_data_project.data_cleaning.combine_datasets import (  # noqa: E402
+    SAVE_PATH,
+)
+
+REPEATS = 5
+
+# name: (filter of the csv rows, read_olympics arguments)
+LOADS = {
+    "everything": (lambda df: df, {}),
+    "swimming": (lambda df: df[df["Sport"] == "Swimming"], {"sports": ["Swimming"]}),
+    "Tokyo 2020": (lambda df: df[df["Year"] == 2020], {"years": [2020]}),
+    "Tokyo 2020 medals": (
+        lambda df: df.loc[df["Year"] == 2020, ["Country", "Medal"]],
+        {"years": [2020], "columns": ["Country", "Medal"]},
+    ),
+}
+
+
+def partition_bytes(path: Path, kwargs: dict) -> int:
+    """Return the size of the files of the partitions read."""
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    filters = parquet_store.partition_filters(
+        kwargs.get("seasons"), kwargs.get("years"), kwargs.get("sports")
+    )
+    expression = None if filters is None else pq.filters_to_expression(filters)
+    return sum(
+        os.path.getsize(fragment.path)
+        for fragment in dataset.get_fragments(filter=expression)
+    )
+
+
+def best_time(func) -> tuple:
+    seconds = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = func()
+        seconds.append(time.perf_counter() - start)
+    return result, min(seconds)
+
+
+def main():
+    if not parquet_store.available():
+        print("pyarrow is not installed, skipping the Parquet benchmark")
+        return
+
+    csv_bytes = os.path.getsize(SAVE_PATH)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "all_olympics_data"
+        parquet_store.save_parquet(schema.read_csv(SAVE_PATH), path)
+
+        print(
+            f"{'load':20} {'rows':>7} {'csv KiB':>9} {'parquet KiB':>12} "
+            f"{'csv s':>7} {'parquet s':>10}"
+        )
+        for name, (select, kwargs) in LOADS.items():
+            csv_df, csv_seconds = best_time(lambda: select(pd.read_csv(SAVE_PATH)))
+            df, parquet_seconds = best_time(
+                lambda: parquet_store.read_olympics(path, **kwargs)
+            )
+            assert len(df) == len(csv_df)
+            assert list(df.columns) == list(csv_df.columns)
+
+            print(
+                f"{name:20} {len(df):7d} {csv_bytes / 1024:9.0f} "
+                f"{partition_bytes(path, kwargs) / 1024:12.0f} "
+                f"{csv_seconds:7.3f} {parquet_seconds:10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Benchmark parsing the medals event by event, as the Tokyo cleaning did
+before parse_tokyo_medals (a DataFrame per event with create_event_df, then
+splitting the athletes and NOC and expanding the ties row by row), and at
+once with parse_tokyo_medals, on a synthetic medals json of many Games in
+the Olympedia format of tokyo2020_medals.json.
+
+The batched parser keeps the rows in the order of the events and fixes
+the events the index patterns of split_medals get wrong (the mixed judo
+team, the empty medal after a tie), those are left out of the check.
+
+Run from the repository root:
+    python benchmarks/bench_parse_tokyo_medals.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(root_dir)
+
+import pandas as pd  # noqa: E402
+
+from olympics_data_project.data_cleaning.clean_tokyo_data import (  # noqa: E402
+    FINAL_COLUMNS,
+    TOKYO_2020,
+    create_event_df,
+    parse_tokyo_medals,
+)
+
+GAMES = 10
+
+
+def synthetic_games(games: int) -> dict:
+    """Return the Tokyo medals repeated for each Games, the events of the
+    n-th Games are suffixed with its number."""
+    with open(TOKYO_2020) as f:
+        tokyo = json.load(f)
+
+    data = {}
+    for n in range(games):
+        for sport, events in tokyo.items():
+            sport_events = data.setdefault(sport, {})
+            for event, results in events.items():
+                sport_events[f"{event} (Games {n + 1})"] = results
+    return data
+
+
+def legacy_build_tokyo_frame(path) -> pd.DataFrame:
+    """The concat of a DataFrame per event."""
+    with open(path) as f:
+        data_tokyo = json.load(f)
+
+    sports_ls = list()
+    events_lS = list()
+    medals_ls = list()
+
+    for key, val in data_tokyo.items():
+        sport = key
+        for event, results in val.items():
+            sports_ls.append(sport)
+            events_lS.append(event)
+            medals_ls.append(results)
+
+    tokyo_df = pd.DataFrame(
+        {"Sport": sports_ls, "Event": events_lS, "Results": medals_ls}
+    )
+
+    expanded_tokyo_df = pd.DataFrame(columns=FINAL_COLUMNS)
+
+    for i, row in tokyo_df.iterrows():
+        temp_df = create_event_df(row)
+        expanded_tokyo_df = pd.concat([expanded_tokyo_df, temp_df], ignore_index=True)
+
+    return expanded_tokyo_df
+
+
+def legacy_split_athelete_country(df: pd.DataFrame) -> pd.DataFrame:
+    """Split the athlete and NOC of the rows that are not ties."""
+    new_df = df.copy()
+    for i, row in df.iterrows():
+        if len(row["Athlete"]) == 1:
+            new_df.at[i, "Athlete"] = None
+            new_df.at[i, "NOC"] = row["Athlete"][0]
+        elif len(row["Athlete"]) == 2:
+            new_df.at[i, "Athlete"] = row["Athlete"][0]
+            new_df.at[i, "NOC"] = row["Athlete"][1]
+
+    return new_df
+
+
+def legacy_remove_ties(df: pd.DataFrame) -> pd.DataFrame:
+    """Expand the ties tie by tie, a tie has two athletes."""
+    ties = [
+        i
+        for i, row in df.iterrows()
+        if (row["Athlete"] == row["NOC"] and len(row["Athlete"]) > 0)
+    ]
+    for i in ties:
+        athletes_and_countries = df.loc[i, "Athlete"]
+        assert (
+            len(athletes_and_countries) == 4
+        ), f"Index {i}, There should be 4 values in the list"
+        temp_df = df.loc[i].copy()
+        temp_df = temp_df.to_frame().T
+        temp_df = pd.concat([temp_df, temp_df], ignore_index=True)
+        temp_df.loc[0, "Athlete"] = athletes_and_countries[0]
+        temp_df.loc[0, "NOC"] = athletes_and_countries[2]
+        temp_df.loc[0, "Medal"] = temp_df.loc[0, "Medal"] + " (Tie)"
+        temp_df.loc[1, "Athlete"] = athletes_and_countries[1]
+        temp_df.loc[1, "NOC"] = athletes_and_countries[3]
+        temp_df.loc[1, "Medal"] = temp_df.loc[1, "Medal"] + " (Tie)"
+        df = pd.concat([df, temp_df], ignore_index=True)
+
+    clean_ties_df = df.drop(ties)
+
+    return clean_ties_df
+
+
+def event_by_event(path) -> pd.DataFrame:
+    return legacy_remove_ties(
+        legacy_split_athelete_country(legacy_build_tokyo_frame(path))
+    )
+
+
+def comparable(df: pd.DataFrame) -> pd.DataFrame:
+    """Return the rows both parsers agree on, sorted."""
+    judo_team = (df["Sport"] == "Judo") & df["Event"].str.startswith("Team, Mixed")
+    empty_medal = df["Athlete"].apply(lambda athlete: isinstance(athlete, list))
+    return (
+        df[~judo_team & ~empty_medal]
+        .astype(str)
+        .sort_values(list(df.columns))
+        .reset_index(drop=True)
+    )
+
+
+def timed(func, path):
+    start = time.perf_counter()
+    result = func(path)
+    return result, time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "synthetic_medals.json")
+        with open(path, "w") as f:
+            json.dump(synthetic_games(GAMES), f)
+
+        legacy_df, legacy_seconds = timed(event_by_event, path)
+        df, batched_seconds = timed(parse_tokyo_medals, path)
+
+    pd.testing.assert_frame_equal(comparable(df), comparable(legacy_df))
+
+    print(f"{GAMES} Games, {len(df)} medal winners")
+    print(f"event by event: {legacy_seconds:7.3f}s")
+    print(
+        f"batched:        {batched_seconds:7.3f}s "
+        f"(speedup {legacy_seconds / batched_seconds:5.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark the Tokyo 2020 medal crawl replayed from a recorded archive,
+with and without injected latency, so the concurrency and parsing changes
+can be measured without the network.
+
+Run from the repository root:
+    python benchmarks/bench_replay_scrape.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(root_dir)
+sys.path.append(os.path.join(root_dir, "tests"))
+
+import pandas as pd  # noqa: E402
+
+from olympics_data_project.web_scrapers.http_client import (  # noqa: E402
+    HttpClient,
+    set_client,
+)
+from olympics_data_project.web_scrapers.recorder import (  # noqa: E402
+    record_traffic,
+    replay_traffic,
+)
+from olympics_data_project.web_scrapers.tokyo2020_medals_scraper import (  # noqa: E402
+    scrape_all_events_medals,
+)
+from stub_server import StubServer, make_medals_page  # noqa: E402
+
+N_SPORTS = 46
+EVENTS_PER_SPORT = 8
+LATENCIES = (0.0, 0.05, 0.2)
+WORKERS = (1, 8)
+
+
+def build_site() -> dict:
+    pages = {}
+    for s in range(N_SPORTS):
+        events = {
+            f"Sport {s} Event {e}": [f"Athlete {s}-{e}-{m}" for m in range(3)]
+            + ["USA", "CHN", "JPN"]
+            for e in range(EVENTS_PER_SPORT)
+        }
+        pages[f"/editions/61/sports/S{s:02d}"] = make_medals_page(events)
+    return pages
+
+
+def main():
+    pages = build_site()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        archive_path = Path(tmp_dir) / "traffic.jsonl.gz"
+
+        # record one crawl of the stub website
+        with StubServer(pages) as server:
+            links_df = pd.DataFrame(
+                {
+                    "href": [server.url(path) for path in pages],
+                    "text": [f"Sport {s}" for s in range(N_SPORTS)],
+                }
+            )
+            client = HttpClient(cache_dir=None)
+            record_traffic(client.session, archive_path)
+            set_client(client)
+            recorded = scrape_all_events_medals(links_df, max_workers=8, delay=0)
+
+        # the stub server is stopped, every crawl below is answered by the archive
+        timings = {}
+        for latency in LATENCIES:
+            for workers in WORKERS:
+                client = HttpClient(cache_dir=None)
+                replay_traffic(client.session, archive_path, latency=latency)
+                set_client(client)
+                start = time.perf_counter()
+                replayed = scrape_all_events_medals(
+                    links_df, max_workers=workers, delay=0
+                )
+                timings[latency, workers] = time.perf_counter() - start
+                assert replayed == recorded
+
+        archive_size = archive_path.stat().st_size
+
+    print(f"{N_SPORTS} sport pages replayed, archive of {archive_size / 1024:.0f} KiB")
+    for (latency, workers), seconds in timings.items():
+        print(f"latency={latency:4.2f}s max_workers={workers:>2}: {seconds:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark the row by row and the vectorised split_country_athlete
+on the melted Paris DataFrame replicated 20 times.
+
+Run from the repository root:
+    python benchmarks/bench_split_country_athlete.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd  # noqa: E402
+from paris_frames import paris_frames, replicate  # noqa: E402
+
+from olympics_data_project.data_cleaning.clean_paris_data import (  # noqa: E402
+    COUNTRY_PATH,
+    split_country_athlete,
+)
+
+REPLICAS = 20
+
+
+def legacy_split_country_athlete(df: pd.DataFrame, path: str) -> pd.DataFrame:
+    """The row by row version replaced by the vectorised one."""
+    temp_df = df.copy()
+    other_temp_df = df.copy()
+    countries = pd.read_csv(path)
+    country = countries["country_name"].tolist()
+    temp_df["Country"] = None
+    for i, row in other_temp_df.iterrows():
+        if row["Athlete"] is None:
+            continue
+        elif "," in row["Athlete"]:
+            athlete = row["Athlete"].split(", ")
+            if athlete[1].strip() in country:
+                temp_df.loc[i, "Country"] = athlete[1].strip()
+                temp_df.loc[i, "Athlete"] = athlete[0]
+            elif athlete[1].strip() == "Britain":
+                temp_df.loc[i, "Country"] = "Great Britain"
+                temp_df.loc[i, "Athlete"] = athlete[0]
+            elif athlete[1].strip() == "AIN":
+                temp_df.loc[i, "Country"] = "Belarus"
+                temp_df.loc[i, "Athlete"] = athlete[0]
+            elif athlete[0].strip() == "Yang":
+                temp_df.loc[i, "Country"] = "China"
+                temp_df.loc[i, "Athlete"] = "Yang Liu"
+            elif athlete[1].strip().endswith("."):
+                country_updated = athlete[1][:-1]
+                if country_updated in country:
+                    temp_df.loc[i, "Country"] = country_updated
+                    temp_df.loc[i, "Athlete"] = athlete[0]
+        elif " (" in row["Athlete"]:
+            athlete = row["Athlete"].split(" (")
+            if athlete[0].strip() in country:
+                temp_df.loc[i, "Country"] = athlete[0].strip()
+                temp_df.loc[i, "Athlete"] = athlete[1].strip().replace(")", "")
+        else:
+            temp_df.loc[i, "Country"] = row["Athlete"]
+    for i, row in temp_df[temp_df["Country"].isna()].iterrows():
+        if row["Athlete"] is None:
+            continue
+        elif " (" in row["Athlete"]:
+            athlete = row["Athlete"].split(" (")
+            if athlete[0].strip() in country:
+                temp_df.loc[i, "Country"] = athlete[0].strip()
+                temp_df.loc[i, "Athlete"] = athlete[1]
+            elif athlete[0].strip() == "Britain":
+                temp_df.loc[i, "Country"] = "Great Britain"
+                temp_df.loc[i, "Athlete"] = athlete[1]
+    return temp_df
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    result = func(df, COUNTRY_PATH)
+    return result, time.perf_counter() - start
+
+
+def main():
+    df = replicate(paris_frames()["split_country_athlete"], REPLICAS)
+
+    legacy, legacy_seconds = timed(legacy_split_country_athlete, df)
+    vectorised, vectorised_seconds = timed(split_country_athlete, df)
+
+    pd.testing.assert_frame_equal(vectorised, legacy)
+    # missing values are None, not NaN, like the row by row version
+    for column in ["Athlete", "Country"]:
+        assert (
+            vectorised[column].isna() == legacy[column].map(lambda v: v is None)
+        ).all()
+
+    print(f"{len(df)} medals ({REPLICAS} copies of Paris 2024)")
+    print(f"row by row: {legacy_seconds:7.3f}s")
+    print(
+        f"vectorised: {vectorised_seconds:7.3f}s "
+        f"(speedup {legacy_seconds / vectorised_seconds:5.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
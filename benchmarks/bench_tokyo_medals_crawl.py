@@ -0,0 +1,77 @@
+"""Benchmark the sequential and concurrent Tokyo 2020 medal crawls
+against a local stub of the Olympedia sport pages.
+
+Run from the repository root:
+    python benchmarks/bench_tokyo_medals_crawl.py
+"""
+
+import os
+import sys
+import time
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(root_dir)
+sys.path.append(os.path.join(root_dir, "tests"))
+
+import pandas as pd  # noqa: E402
+
+from olympics_data_project.web_scrapers.http_client import (  # noqa: E402
+    HttpClient,
+    set_client,
+)
+from olympics_data_project.web_scrapers.tokyo2020_medals_scraper import (  # noqa: E402
+    scrape_all_events_medals,
+)
+from stub_server import StubServer, make_medals_page  # noqa: E402
+
+N_SPORTS = 46
+EVENTS_PER_SPORT = 8
+LATENCY = 0.2
+
+
+def build_site() -> dict:
+    pages = {}
+    for s in range(N_SPORTS):
+        events = {
+            f"Sport {s} Event {e}": [f"Athlete {s}-{e}-{m}" for m in range(3)]
+            + ["USA", "CHN", "JPN"]
+            for e in range(EVENTS_PER_SPORT)
+        }
+        pages[f"/editions/61/sports/S{s:02d}"] = make_medals_page(events)
+    return pages
+
+
+def main():
+    # measure the network path, not the response cache
+    set_client(HttpClient(cache_dir=None))
+
+    pages = build_site()
+    with StubServer(pages, latency=LATENCY) as server:
+        links_df = pd.DataFrame(
+            {
+                "href": [server.url(path) for path in pages],
+                "text": [f"Sport {s}" for s in range(N_SPORTS)],
+            }
+        )
+
+        timings = {}
+        results = {}
+        for workers in (1, 4, 8, 16):
+            start = time.perf_counter()
+            results[workers] = scrape_all_events_medals(
+                links_df, max_workers=workers, delay=0
+            )
+            timings[workers] = time.perf_counter() - start
+
+    assert all(result == results[1] for result in results.values())
+
+    print(f"{N_SPORTS} sport pages, {LATENCY}s latency per page")
+    for workers, seconds in timings.items():
+        print(
+            f"max_workers={workers:>2}: {seconds:6.2f}s "
+            f"(speedup {timings[1] / seconds:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Build the intermediate DataFrames of the Paris cleaning, so the
+benchmarks can time one step on the same input the pipeline gives it."""
+
+import os
+import sys
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(root_dir)
+
+import pandas as pd  # noqa: E402
+
+import olympics_data_project.data_cleaning.clean_paris_data as cpd  # noqa: E402
+
+
+def paris_frames() -> dict:
+    """Return the DataFrame given to each step of clean_paris_data, by step name.
+
+    Runs the same steps as clean_paris_data without saving the p events.
+    """
+    data = cpd.load_data(cpd.PARIS_PATH)
+    h2_data = cpd.remove_dates_from_h2(data["h2"])
+    h2_data = cpd.remove_symbols_from_h2(h2_data)
+    h2_data = cpd.combine_cycling_pursuit(h2_data)
+    h2_data = cpd.update_3x3_basketball(h2_data)
+    h2_data = cpd.clean_swimming_relays(h2_data)
+    p_data = cpd.remove_headlines_from_p(data["p"])
+    p_data = cpd.clean_medals_events_from_p(p_data)
+
+    grouped = cpd.group_medals_with_events(p_data)
+    grouped_medals = [medals for _, medals in grouped]
+    medal_events = [event for event, _ in grouped]
+    combined_data = cpd.combine_grouped_medals_with_h2(h2_data, grouped_medals)
+
+    frames = {}
+    df = cpd.convert_to_df(combined_data)
+    frames["adjust_event_and_sports"] = df.copy()
+    df = cpd.adjust_event_and_sports(df)
+    df = cpd.replace_sport(df)
+    frames["insert_p_events"] = df.copy()
+    df = cpd.insert_p_events(df, medal_events)
+    frames["convert_medal_list_to_df"] = df
+    df = cpd.convert_medal_list_to_df(df)
+    df = cpd.remove_medal_colors(df)
+    df = cpd.melt_medals(df)
+    frames["split_country_athlete"] = df
+    df = cpd.split_country_athlete(df, cpd.COUNTRY_PATH)
+    frames["deal_with_ties"] = df
+    return frames
+
+
+def replicate(df: pd.DataFrame, times: int) -> pd.DataFrame:
+    """Stack copies of the DataFrame with a fresh index."""
+    return pd.concat([df] * times, ignore_index=True)
@@ -2,6 +2,9 @@ from pathlib import Path
 
 import pandas as pd
 
+from olympics_data_project.data_cleaning import schema
+from olympics_data_project.data_cleaning.instrumentation import stage
+
 # Get the current script's directory
 base_dir = Path(__file__).parent
 # convert the path to the project directory
@@ -23,22 +26,80 @@ FINAL_COLUMNS = [
     "Medal",
 ]
 
-
+# the columns of the Kaggle csv used by the cleaners and their types
+KAGGLE_DTYPES = {
+    "Name": "object",
+    "Team": "object",
+    "NOC": "object",
+    "Year": "int64",
+    "Season": "object",
+    "City": "object",
+    "Sport": "object",
+    "Event": "object",
+    "Medal": "object",
+}
+# rows read at a time, the medal rows are about 15% of the csv
+CHUNK_SIZE = 50_000
+
+
+@stage
 def import_data(path: str) -> pd.DataFrame:
     """Import the Olympics dataset from the specified path."""
     return pd.read_csv(path)
 
 
+@stage
+def read_medal_rows(
+    path: str,
+    usecols: list = None,
+    season: str = "Summer",
+    chunksize: int = CHUNK_SIZE,
+) -> pd.DataFrame:
+    """Read the medal rows of the Kaggle csv chunk by chunk.
+
+    Only the used columns are read, with explicit types, and the rows without
+    a medal or of another season are dropped from each chunk, so the memory
+    follows the medal rows rather than the whole csv. The rows keep their
+    line number in the csv as index, as with import_data followed by
+    remove_null_medals and remove_winter_olympics.
+
+    Args:
+        path (str): the Kaggle csv.
+        usecols (list): the columns to read, all the KAGGLE_DTYPES by default.
+        season (str): the season to keep, None keeps both seasons.
+        chunksize (int): the number of rows read at a time.
+
+    Returns:
+        pd.DataFrame: the medal rows with the used columns.
+    """
+    if usecols is None:
+        usecols = list(KAGGLE_DTYPES)
+    dtype = {column: KAGGLE_DTYPES[column] for column in usecols}
+
+    medal_chunks = []
+    with pd.read_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize) as reader:
+        for chunk in reader:
+            keep = chunk["Medal"].notna()
+            if season is not None:
+                keep &= chunk["Season"] == season
+            medal_chunks.append(chunk[keep])
+
+    return pd.concat(medal_chunks)
+
+
+@stage
 def remove_null_medals(df: pd.DataFrame) -> pd.DataFrame:
     """Remove rows with NaN values in the 'Medal' column."""
     return df.dropna(subset=["Medal"])
 
 
+@stage
 def remove_winter_olympics(df: pd.DataFrame) -> pd.DataFrame:
     """Keep only Summer Olympics data."""
     return df[df["Season"] == "Summer"]
 
 
+@stage
 def remove_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Remove unnecessary columns and rename Team as Country
     and Name as Athlete."""
@@ -47,6 +108,7 @@ def remove_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df[FINAL_COLUMNS]
 
 
+@stage
 def remove_hyphen_numbers(df: pd.DataFrame) -> pd.DataFrame:
     """Remove Country names that end in -1, -2, -3."""
     # use regex to remove any Team names that end in -1, -2, -3
@@ -56,14 +118,13 @@ def remove_hyphen_numbers(df: pd.DataFrame) -> pd.DataFrame:
 
 def save_data(df: pd.DataFrame, path: str) -> None:
     """Save the cleaned dataset to the specified path."""
-    df.to_csv(path, index=False)
+    schema.save_csv(df, path)
 
 
 if __name__ == "__main__":
     print("Cleaning Kaggle Olympic (1896-2016) data...")
-    df = import_data(KAGGLE_DATA_PATH)
-    df = remove_null_medals(df)
-    df = remove_winter_olympics(df)
+    # only the Summer medal rows are kept while reading
+    df = read_medal_rows(KAGGLE_DATA_PATH)
     df = remove_columns(df)
     df = remove_hyphen_numbers(df)
     save_data(df, CLEAN_DATA_PATH)
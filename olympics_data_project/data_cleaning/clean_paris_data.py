@@ -4,9 +4,15 @@
 import json
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import regex as re
 
+from olympics_data_project.data_cleaning import paris_tokens, reference_data, schema
+from olympics_data_project.data_cleaning.corrections import CorrectionRules
+from olympics_data_project.data_cleaning.instrumentation import stage
+from olympics_data_project.data_cleaning.paris_tokens import SPORT, tokenize
+
 # Get the current script's directory
 base_dir = Path(__file__).parent
 # convert the path to the project directory
@@ -21,37 +27,45 @@ CSV_SAVE_PATH = project_dir / "data" / "processed" / "paris2024_results.csv"
 NOC_PATH = project_dir / "data" / "raw" / "noc_regions.csv"
 
 
+def stage_copy(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy the DataFrame a cleaning step changes, so the input is not changed.
+
+    With copy on write the copy is lazy, the columns are only copied when
+    the step writes to them. Without it the whole DataFrame is copied.
+    """
+    return df.copy(deep=pd.options.mode.copy_on_write is not True)
+
+
 def save_data_to_csv(df: pd.DataFrame, path: str):
     """Save the DataFrame to a csv file"""
-    df.to_csv(path, index=False)
+    schema.save_csv(df, path)
     print(f"File saved to {path}")
 
 
-def clean_paris_data(path):
+def clean_paris_data(path, copy_on_write: bool = False):
     """Clean the json data and save it to a csv file.
-    Final csv file has columns Sport, Event, Medal, Athlete, and Country"""
+    Final csv file has columns Sport, Event, Medal, Athlete, and Country
+
+    With copy_on_write the steps run with pandas copy on write, the steps
+    share the columns they do not change instead of copying them.
+    """
+    if copy_on_write:
+        with pd.option_context("mode.copy_on_write", True):
+            return clean_paris_data(path)
 
     data = load_data(path)
-    # remove dates from h2 data
-    h2_data = remove_dates_from_h2(data["h2"])
-    # remove symbols from h2 data
-    h2_data = remove_symbols_from_h2(h2_data)
-    # combine the CYCLING and TEAM PURSUIT data
-    h2_data = combine_cycling_pursuit(h2_data)
-    # update the 3X3 BASKETBALL data
-    h2_data = update_3x3_basketball(h2_data)
-    # clean the SWIMMING RELAYS data
-    h2_data = clean_swimming_relays(h2_data)
-    # remove headlines from p data
-    p_data = remove_headlines_from_p(data["p"])
-    # clean medals events from p data
-    p_data = clean_medals_events_from_p(p_data)
-    data = {"h2": h2_data, "p": p_data}
+    # clean the h2 and p data in one pass, the h2 data are the sports
+    # and the p data are the events and medals
+    h2_data, p_data = split_tokens(data)
+    # the corrections that are not made by the cleaning steps
+    corrections = CorrectionRules.load()
 
     # group the medals with the events
-    grouped_medals = group_medals(data)
+    grouped = group_medals_with_events(p_data)
+    grouped_medals = [medals for _, medals in grouped]
+    medal_events = [event for event, _ in grouped]
     # combine the grouped medals with the h2 data
-    combined_data = combine_grouped_medals_with_h2(h2_data, grouped_medals)
+    combined_data = combine_grouped_medals_with_h2(h2_data, grouped_medals, corrections)
     # geat the events from the p data
     p_events = get_p_events(p_data)
     # store the p events in a json file
@@ -63,7 +77,7 @@ def clean_paris_data(path):
     # replace the sport names
     df = replace_sport(df)
     # insert the p events into the DataFrame
-    df = insert_p_events(df, p_events)
+    df = insert_p_events(df, medal_events, corrections)
     # convert the medal list to a DataFrame
     df = convert_medal_list_to_df(df)
     # remove the medal colors
@@ -79,8 +93,8 @@ def clean_paris_data(path):
     df = fill_athlete_none(df)
     # create the 100m breaststroke event due to miss data
     df = create_100m_breastroke(df)
-    # fix the kayak double event
-    df = fix_kayak_double(df)
+    # fix the athletes of the kayak double event
+    df = fix_athletes(df, corrections)
     # add the columns for Year, City, and Season for Paris 2024
     df = add_paris_columns(df)
     # replace some country names
@@ -91,6 +105,7 @@ def clean_paris_data(path):
     return df
 
 
+@stage
 def load_data(path):
     """Load in the json data from a file path"""
     with open(path) as f:
@@ -98,6 +113,24 @@ def load_data(path):
     return data
 
 
+@stage
+def split_tokens(data: dict) -> tuple:
+    """Clean the h2 and p data in one pass.
+
+    Returns:
+        tuple: the list of h2 values and the list of p values
+    """
+    h2_data = []
+    p_data = []
+    for token in tokenize(data):
+        if token.kind == SPORT:
+            h2_data.append(token.text)
+        else:
+            p_data.append(token.text)
+    return h2_data, p_data
+
+
+@stage
 def remove_dates_from_h2(h2_data: list) -> list:
     """Remove any string values that are dates
     Example of string date removed is 'Sunday, Aug. 11'
@@ -108,20 +141,10 @@ def remove_dates_from_h2(h2_data: list) -> list:
     Returns:
         list: list of the h2 tag data with dates removed
     """
-
-    # regex pattern to match day of the week
-    day_of_week = re.compile(r"([A-Z][a-z]+day)")
-    # create a copy of the data
-    h2_list = h2_data.copy()
-
-    for val in h2_data:
-        # check if the value matches the regex pattern
-        if day_of_week.match(val):
-            h2_list.remove(val)
-
-    return h2_list
+    return list(paris_tokens.without_dates(h2_data))
 
 
+@stage
 def remove_symbols_from_h2(h2_data: list) -> list:
     """Keep only values that have some letters in them
 
@@ -131,25 +154,10 @@ def remove_symbols_from_h2(h2_data: list) -> list:
     Returns:
         list: list of the h2 tag data with symbols removed
     """
-
-    # create an empty list to store the updated data
-    cleaned_h2_data = []
-
-    # regex pattern to match any string with letters
-    has_letters = re.compile(r"[a-zA-Z]")
-
-    for val in h2_data:
-        if val.startswith("3X3 BASKETBALL"):
-            cleaned_h2_data.append(val)
-        # check if the value matches the regex pattern
-        elif not has_letters.match(val):
-            continue
-        else:
-            cleaned_h2_data.append(val)
-
-    return cleaned_h2_data
+    return list(paris_tokens.with_letters(h2_data))
 
 
+@stage
 def combine_cycling_pursuit(h2_data: list) -> list:
     """The data for CYCLING and TEAM PURSUIT needs to be combined.
 
@@ -159,60 +167,25 @@ def combine_cycling_pursuit(h2_data: list) -> list:
     Returns:
         list: list of the h2 tag data with CYCLING and TEAM PURSUIT combined
     """
-
-    updated_h2_data = []
-
-    for i, val in enumerate(h2_data):
-        if val == "CYCLING" and "TEAM PURSUIT" in h2_data[i + 1]:
-            continue
-
-        elif "TEAM PURSUIT" in val:
-            updated_h2_data.append(f"CYCLING {val}")
-
-        else:
-            updated_h2_data.append(val)
-
-    return updated_h2_data
+    return list(paris_tokens.combine_cycling_pursuit(h2_data))
 
 
+@stage
 def update_3x3_basketball(h2_data: list) -> list:
     """The Women's 3X3 Basketball simply says WOMEN,
     this needs to be updated to WOMEN's 3X3 BASKETBALL and
     Men's 3X3 Basketball needs to be updated from 3X3 BASKETBALL
     to MEN'S 3X3 BASKETBALL"""
-
-    updated_h2_data = []
-
-    womens_index = None
-
-    for i, val in enumerate(h2_data):
-        if val == "3X3 BASKETBALL":
-            updated_h2_data.append(f"MEN’S {val}")
-            womens_index = i + 1
-        elif womens_index == i:
-            updated_h2_data.append("WOMEN’S 3X3 BASKETBALL")
-        else:
-            updated_h2_data.append(val)
-
-    return updated_h2_data
+    return list(paris_tokens.update_3x3_basketball(h2_data))
 
 
+@stage
 def clean_swimming_relays(h2_data: list) -> list:
-    updated_h2_data = []
-
-    for i, val in enumerate(h2_data):
-        if val == "SWIMMING" and "1500M" in h2_data[i + 1]:
-            updated_h2_data.append("WOMEN’S 50M FREESTYLE")
-            updated_h2_data.append("WOMEN’S 4x100M MEDLEY RELAY")
-        elif val == "MEN’S 1500M FREESTYLE":
-            updated_h2_data.append(val)
-            updated_h2_data.append("MEN’S 4x100M MEDLEY RELAY")
-        else:
-            updated_h2_data.append(val)
-
-    return updated_h2_data
+    """Add the medley relays that are missing from the swimming headings"""
+    return list(paris_tokens.clean_swimming_relays(h2_data))
 
 
+@stage
 def remove_headlines_from_p(p_data: list) -> list:
     """Remove any string values that are not events or results.
     Events are all uppercase strings.
@@ -224,28 +197,10 @@ def remove_headlines_from_p(p_data: list) -> list:
     Returns:
         list: list of the p tag data with non-event and non-result strings removed
     """
-
-    # create list for the results data
-    results_data = []
-
-    for val in p_data:
-        # if the value is an all uppercase string, it is an event
-        if val.isupper():
-            results_data.append(val)
-        # if the value starts with Gold, Silver, or Bronze, it is a result
-        elif (
-            val.lower().startswith("gold:")
-            or val.lower().startswith("silver:")
-            or val.lower().startswith("bronze:")
-        ):
-            results_data.append(val)
-        # remove any events that slipped through the first check
-        elif val.lower().startswith("men") or val.lower().startswith("women"):
-            results_data.append(val)
-
-    return results_data
+    return list(paris_tokens.p_results(p_data))
 
 
+@stage
 def clean_medals_events_from_p(p_data: list) -> list:
     """Look if there are any values that are combined event and medal.
     Example: 'WOMEN'S MARATION Gold: Peres Jepchirchir, Kenya'
@@ -258,43 +213,10 @@ def clean_medals_events_from_p(p_data: list) -> list:
         list: list of the p tag data with combined event and medal
         strings split into two separate values
     """
-
-    # new list of event results
-    event_results = []
-
-    # match string that has Gold, Silver, or Bronze but not at the start
-    medals = re.compile(r"(?<!^)(Gold:|GOLD:|Silver:|Bronze:)")
-
-    for val in p_data:
-        # check if the value matches the regex pattern
-        if medals.search(val):
-            if "Gold:" in val:
-                event, medal = val.split("Gold:")
-                medal = "Gold:" + medal
-                event_results.append(event.rstrip())
-                event_results.append(medal)
-            elif "GOLD:" in val:
-                event, medal = val.split("GOLD:")
-                medal = "Gold:" + medal
-                event_results.append(event.rstrip())
-                event_results.append(medal)
-            elif "Silver:" in val:
-                event, medal = val.split("Silver:")
-                medal = "Silver:" + medal
-                event_results.append(event.rstrip())
-                event_results.append(medal)
-            elif "Bronze:" in val:
-                event, medal = val.split("Bronze:")
-                medal = "Bronze:" + medal
-                event_results.append(event.rstrip())
-                event_results.append(medal)
-
-        else:
-            event_results.append(val)
-
-    return event_results
+    return [token.text for token in paris_tokens.split_event_medals(p_data)]
 
 
+@stage
 def get_p_events(p_data: list) -> list:
     """Get all the events from the p data
 
@@ -318,20 +240,27 @@ def get_p_events(p_data: list) -> list:
     return events
 
 
-def group_medals(data: dict) -> list:
-    """Group the medals in a list and assign them to the event
+@stage
+def group_medals_with_events(p_data: list) -> list:
+    """Group the medals of each event with the event heading before them.
+
+    Some events are only named in the h2 tags, their medals follow the
+    previous event without a heading of their own.
 
     Args:
-        data (dict): dictionary of the cleaned data
+        p_data (list): the cleaned p tags.
+
     Returns:
-        list: list of the events and their respective medal winners
+        list: an (event, medals) tuple for each event, event is None
+            when the medals have no heading.
     """
-    # create a dictionary to store the event and medal results
+    # create a list to store the event and medal results
     event_results = []
     # create a list of medals
     medals_list = []
+    event = None
 
-    for val in data["p"]:
+    for val in p_data:
         # if the value starts with Gold:
         if val.startswith("Gold:"):
             medals_list.append(val)
@@ -339,52 +268,65 @@ def group_medals(data: dict) -> list:
         elif val.startswith("Silver:"):
             medals_list.append(val)
             # two exceptions where no Bronze medal was awarded
-            if "Sofiane Oumiha, France" in val:
-                medals_list.append("Bronze: No medal awarded")
-                event_results.append(medals_list)
-                medals_list = []
-            elif "Nurbek Oralbay, Kazakhstan" in val:
+            if "Sofiane Oumiha, France" in val or "Nurbek Oralbay, Kazakhstan" in val:
                 medals_list.append("Bronze: No medal awarded")
-                event_results.append(medals_list)
+                event_results.append((event, medals_list))
+                event = None
                 medals_list = []
 
         # if the value starts with Bronze:
         elif val.startswith("Bronze:"):
+            medals_list.append(val)
+            # two events where the next result is also a bronze medal
             if "Amin Mirzazadeh, Iran" in val:
-                medals_list.append(val)
+                continue
             elif "Zholaman Sharshenbekov, Kyrgyzstan" in val:
-                medals_list.append(val)
-            else:
-                medals_list.append(val)
-                event_results.append(medals_list)
-                medals_list = []
+                continue
+            event_results.append((event, medals_list))
+            event = None
+            medals_list = []
+
+        # any other value is the heading of the next medals
+        else:
+            event = val
 
     return event_results
 
 
-def combine_grouped_medals_with_h2(h2_data: list, grouped_medals: list) -> list:
+@stage
+def group_medals(data: dict) -> list:
+    """Group the medals in a list and assign them to the event
+
+    Args:
+        data (dict): dictionary of the cleaned data
+    Returns:
+        list: list of the events and their respective medal winners
+    """
+    return [medals for _, medals in group_medals_with_events(data["p"])]
+
+
+@stage
+def combine_grouped_medals_with_h2(
+    h2_data: list, grouped_medals: list, corrections: CorrectionRules = None
+) -> list:
     """Takes in a list of h2 Sports names and a list of medals with athlete names.
     Combines the two lists into a single list of lists.
     This allows to get the correct sport associated with the results.
+
+    The h2 corrections are applied first, they add the sports missing from
+    the h2 tags and remove the extra ones.
     """
-    try:
-        h2_data.pop(251)
-        h2_data.pop(254)
-        h2_data.insert(256, "MEN’S 90KG")
-        h2_data.insert(276, "MEN’S 4X200M FREESTYLE RELAY")
-        h2_data.insert(172, "SWIMMING")
-        h2_data.pop(173)
-        h2_data.pop(251)
-        h2_data.insert(251, "CYCLING")
-
-    except:
-        pass
+    if corrections is None:
+        corrections = CorrectionRules.load()
+
+    h2_data = corrections.correct_h2(h2_data)
 
     combined_data = [[x, y] for x, y in zip(h2_data, grouped_medals)]
 
     return combined_data
 
 
+@stage
 def convert_to_df(cleaned_data: list) -> pd.DataFrame:
     """Convert the cleaned data to a pandas DataFrame"""
     df = pd.DataFrame(cleaned_data, columns=["Sport", "Medal Winners"])
@@ -402,22 +344,53 @@ def open_sports_list(path: str) -> list:
     return sports
 
 
-def adjust_event_and_sports(df: pd.DataFrame) -> pd.DataFrame:
-    SPORT_LIST = open_sports_list(SPORTS_PATH)
-    j = 0
-    for i, row in df.iterrows():
-        try:
-            if j >= len(SPORT_LIST):
-                df.loc[i, "Sport"] = SPORT_LIST[-1]
-            elif row["Sport"] == SPORT_LIST[j]:
-                j += 1
-            else:
-                df.loc[i, "Sport"] = SPORT_LIST[j - 1]
-        except:
-            continue
+@stage
+def adjust_event_and_sports(df: pd.DataFrame, sport_list: list = None) -> pd.DataFrame:
+    """Replace the events in the Sport column with the sport they belong to.
+
+    The sports list has the sport headers in the order of the article. The
+    first row after the previous header that has the next sport of the list
+    is a header, every row belongs to the last header before it. The rows
+    before the first header get the last sport of the list.
+
+    Args:
+        df (pd.DataFrame): the DataFrame with the h2 data in the Sport column
+        sport_list (list): the sport headers in order, loaded from the
+            sports list file if None
+
+    Returns:
+        pd.DataFrame: the DataFrame with the sport of each row
+    """
+    if sport_list is None:
+        sport_list = reference_data.sports_list(SPORTS_PATH)
+    if not sport_list:
+        return df
+
+    # the positions of the rows of each sport, in order
+    rows_by_sport = pd.Series(np.arange(len(df))).groupby(df["Sport"].to_numpy())
+    rows_by_sport = rows_by_sport.indices
+
+    # find the header of each sport of the list after the previous header
+    is_header = np.zeros(len(df), dtype=bool)
+    position = -1
+    for sport in sport_list:
+        rows = rows_by_sport.get(sport)
+        if rows is None:
+            break
+        next_row = np.searchsorted(rows, position, side="right")
+        if next_row == len(rows):
+            break
+        position = rows[next_row]
+        is_header[position] = True
+
+    # number the rows by the header they follow, 0 before the first header
+    header_number = is_header.cumsum()
+    df["Sport"] = np.asarray(sport_list, dtype=object)[header_number - 1]
+
     return df
 
 
+@stage
 def replace_sport(df: pd.DataFrame) -> pd.DataFrame:
     df["Sport"] = df["Sport"].replace(
         {
@@ -439,102 +412,95 @@ def save_p_events(p_events: list):
     print(f"File saved to {P_EVENTS_PATH}")
 
 
-def insert_p_events(df: pd.DataFrame, p_events: list) -> pd.DataFrame:
-    temp_events = p_events.copy()
-    temp_df = df.copy()
-
-    # remove index 72 from temp_events
-    temp_events.pop(72)
-
-    # remove index 132 from temp_events
-    temp_events.pop(132)
-
-    # remove index 134 from temp_events
-    temp_events.pop(134)
-
-    # remove WOMEN'S 4X100M MEDLEY RELAY
-    temp_events.remove("WOMEN’S 4x100M MEDLEY RELAY")
-    # remove MEN'S 4X100M MEDLEY RELAY
-    temp_events.remove("MEN’S 4x100M MEDLEY RELAY")
-
-    j = 0
-    for i, row in temp_df.iterrows():
-        if i == 28:
-            temp_df.loc[i, "Event"] = "MEN’S"
-        if i == 60:
-            temp_df.loc[i, "Event"] = "WOMEN’S"
-        if i == 103:
-            temp_df.loc[i, "Event"] = "WOMEN’S KITE"
-        if i == 114:
-            temp_df.loc[i, "Event"] = "MEN’S DINGHY"
-            j += 2
-        if i == 251:
-            temp_df.loc[i, "Event"] = "WOMEN’S PARK"
-        if i == 253:
-            temp_df.loc[i, "Event"] = "WOMEN’S SYNCHRONIZED 10-METER PLATFORM"
-        if i == 314:
-            temp_df.loc[i, "Event"] = "MEN’S"
-        if row["Sport"] == row["Event"]:
-            try:
-                temp_df.loc[i, "Event"] = temp_events[j]
-                j += 1
-            except:
-                print(i)
+@stage
+def insert_p_events(
+    df: pd.DataFrame, medal_events: list, corrections: CorrectionRules = None
+) -> pd.DataFrame:
+    """Name the events of the rows that only have a sport.
+
+    A row named after its sport gets the event heading of its medals from
+    the p data. The event corrections are applied last, they are matched by
+    the sport, event and medal winners of the row.
+
+    Args:
+        df (pd.DataFrame): rows with Sport, Event and Medal Winners columns
+        medal_events (list): the event heading of each group of medals,
+            None when the medals have no heading
+        corrections (CorrectionRules): the corrections, loaded from the
+            corrections file if None
+
+    Returns:
+        pd.DataFrame: the DataFrame with the events inserted
+    """
+    if corrections is None:
+        corrections = CorrectionRules.load()
+
+    temp_df = stage_copy(df)
+
+    # the rows and the groups of medals are in the same order
+    events = pd.Series(
+        medal_events[: len(df)], index=df.index[: len(medal_events)], dtype=object
+    ).reindex(df.index)
+    is_sport = (df["Sport"] == df["Event"]) & events.notna()
+    temp_df["Event"] = temp_df["Event"].mask(is_sport, events)
+
+    corrected = corrections.correct_events(df)
+    temp_df["Event"] = corrected.where(corrected.notna(), temp_df["Event"])
+
     return temp_df
 
 
+MEDAL_COLORS = ["Gold", "Silver", "Bronze"]
+
+
+@stage
 def convert_medal_list_to_df(df: pd.DataFrame) -> pd.DataFrame:
     """Take the results from column Medal Winners and split them into
     separate columns for Gold, Silver, and Bronze.
     Put Medal Winners results in the Tie column if there is a tie"""
 
     # create copy of the DataFrame
-    temp_df = df.copy()
+    temp_df = stage_copy(df)
+
+    # one row per medal, indexed by the row of its event
+    medals = temp_df["Medal Winners"].explode().dropna()
+
+    # a medal is Gold if it has Gold in it, then Silver, then Bronze
+    color = pd.Series(None, index=medals.index, dtype=object)
+    for medal_color in reversed(MEDAL_COLORS):
+        color[medals.str.contains(medal_color, regex=False, na=False)] = medal_color
+    medals = pd.DataFrame({"Color": color, "Medal": medals}).dropna(subset="Color")
+
+    # the last medal of each color wins
+    by_color = medals.groupby([medals.index, "Color"])["Medal"].last().unstack()
 
     # create new columns for Gold, Silver, and Bronze
-    temp_df["Gold"] = None
-    temp_df["Silver"] = None
-    temp_df["Bronze"] = None
-    temp_df["Tie"] = None
+    for medal_color in MEDAL_COLORS:
+        if medal_color in by_color:
+            column = by_color[medal_color].reindex(temp_df.index)
+            temp_df[medal_color] = column.astype(object).where(column.notna(), None)
+        else:
+            temp_df[medal_color] = None
 
-    # iterate through the DataFrame
-    for i, row in temp_df.iterrows():
-        # iterate through the medals
-        for medal in row["Medal Winners"]:
-            # check if the medal is Gold
-            if "Gold" in medal:
-                # check the count of Gold medals
-                count = temp_df.loc[i, "Medal Winners"].count("Gold")
-                # check if there is a tie
-                if count > 1:
-                    temp_df.loc[i, "Tie"] = row["Medal Winners"]
-                temp_df.loc[i, "Gold"] = medal
-            # check if the medal is Silver
-            elif "Silver" in medal:
-                # check the count of Silver medals
-                count = temp_df.loc[i, "Medal Winners"].count("Silver")
-                # check if there is a tie
-                if count > 1:
-                    temp_df.loc[i, "Tie"] = row["Medal Winners"]
-                temp_df.loc[i, "Silver"] = medal
-            # check if the medal is Bronze
-            elif "Bronze" in medal:
-                # check the count of Bronze medals
-                count = temp_df.loc[i, "Medal Winners"].count("Bronze")
-                # check if there is a tie
-                if count > 1:
-                    temp_df.loc[i, "Tie"] = row["Medal Winners"]
-                temp_df.loc[i, "Bronze"] = medal
+    # there is a tie if a color appears more than once in the list of medals
+    exact = medals["Medal"][medals["Medal"].isin(MEDAL_COLORS)]
+    counts = exact.groupby([exact.index, exact]).size()
+    tie_index = counts[counts > 1].index.get_level_values(0).unique()
+
+    temp_df["Tie"] = None
+    if len(tie_index):
+        temp_df.loc[tie_index, "Tie"] = temp_df.loc[tie_index, "Medal Winners"]
 
     return temp_df
 
 
+@stage
 def remove_medal_colors(df: pd.DataFrame) -> pd.DataFrame:
     """For each value in the Gold, Silver, and Bronze columns,
     remove the color from the string"""
 
     # create copy of the DataFrame
-    temp_df = df.copy()
+    temp_df = stage_copy(df)
 
     # remove the color from the Gold column
     temp_df["Gold"] = temp_df["Gold"].str.replace("Gold: ", "")
@@ -546,6 +512,7 @@ def remove_medal_colors(df: pd.DataFrame) -> pd.DataFrame:
     return temp_df
 
 
+@stage
 def melt_medals(df: pd.DataFrame) -> pd.DataFrame:
     """Create a melted table of the Gold, Silver, and Bronze medals
     to list medal color and the athlete for each event
@@ -553,11 +520,8 @@ def melt_medals(df: pd.DataFrame) -> pd.DataFrame:
     The new columns will be Sport, Event, Medal, and Athlete.
     Where each medal color is listed in Medal along wtih the athlete name"""
 
-    # create a copy of the DataFrame
-    temp_df = df.copy()
-
-    # melt the DataFrame
-    melted_df = temp_df.melt(
+    # melt the DataFrame, melt does not change df
+    melted_df = df.melt(
         id_vars=["Sport", "Event"],
         value_vars=["Gold", "Silver", "Bronze"],
         var_name="Medal",
@@ -567,172 +531,152 @@ def melt_medals(df: pd.DataFrame) -> pd.DataFrame:
     return melted_df
 
 
+@stage
 def split_country_athlete(df: pd.DataFrame, path: str) -> pd.DataFrame:
     """The Athlete column has the athlete name and country.
     Check the country name against the list of countries and split the
     athlete name and country into separate columns"""
 
     # create a copy of the DataFrame
-    temp_df = df.copy()
-    other_temp_df = df.copy()
+    temp_df = stage_copy(df)
 
-    # load the list of countries from csv
-    countries = pd.read_csv(path)
-    country = countries["country_name"].tolist()
+    # the set of countries and the names and aliases of the countries
+    country = reference_data.country_names(path)
+    country_names = reference_data.canonical_countries(path)
 
     # create a new column for the country
     temp_df["Country"] = None
 
-    # iterate through the DataFrame
-    for i, row in other_temp_df.iterrows():
-        if row["Athlete"] is None:
-            continue
-        elif "," in row["Athlete"]:
-            # split Athlete column on the comma
-            athlete = row["Athlete"].split(", ")
-            # check if the country is in the list of countries
-            if athlete[1].strip() in country:
-                temp_df.loc[i, "Country"] = athlete[1].strip()
-                temp_df.loc[i, "Athlete"] = athlete[0]
-            elif athlete[1].strip() == "Britain":
-                temp_df.loc[i, "Country"] = "Great Britain"
-                temp_df.loc[i, "Athlete"] = athlete[0]
-            elif athlete[1].strip() == "AIN":
-                temp_df.loc[i, "Country"] = "Belarus"
-                temp_df.loc[i, "Athlete"] = athlete[0]
-            elif athlete[0].strip() == "Yang":
-                temp_df.loc[i, "Country"] = "China"
-                temp_df.loc[i, "Athlete"] = "Yang Liu"
-            # if the athlete[1] ends with period remove it
-            elif athlete[1].strip().endswith("."):
-                country_updated = athlete[1][:-1]
-                if country_updated in country:
-                    temp_df.loc[i, "Country"] = country_updated
-                    temp_df.loc[i, "Athlete"] = athlete[0]
-        elif " (" in row["Athlete"]:
-            # split Athlete column on the (
-            athlete = row["Athlete"].split(" (")
-            # check if the country is in the list of countries
-            if athlete[0].strip() in country:
-                temp_df.loc[i, "Country"] = athlete[0].strip()
-                temp_df.loc[i, "Athlete"] = athlete[1].strip().replace(")", "")
-        else:
-            temp_df.loc[i, "Country"] = row["Athlete"]
+    # read the athletes from the input, temp_df is changed below
+    athletes = df["Athlete"]
+    is_text = athletes.map(lambda athlete: isinstance(athlete, str))
+    has_comma = is_text & athletes.str.contains(",", regex=False, na=False)
+    has_bracket = is_text & athletes.str.contains(" (", regex=False, na=False)
+
+    # Athlete, Country: split on the comma
+    athlete = athletes[has_comma].str.split(", ", regex=False)
+    name, place = athlete.str[0], athlete.str[1]
+    found = place.str.strip().map(country_names).astype(object)
+    # Yang Liu is listed as Yang, Liu
+    is_yang = found.isna() & (name.str.strip() == "Yang")
+    found[is_yang] = "China"
+    name[is_yang] = "Yang Liu"
+    # remove the period at the end of the country
+    has_period = found.isna() & place.str.strip().str.endswith(".")
+    without_period = place[has_period].str[:-1]
+    found[has_period] = without_period.where(without_period.isin(country))
+    found = found.dropna()
+    temp_df.loc[found.index, "Country"] = found
+    temp_df.loc[found.index, "Athlete"] = name[found.index]
+
+    # Country (Athlete): split on the bracket
+    bracketed = has_bracket & ~has_comma
+    athlete = athletes[bracketed].str.split(" (", regex=False)
+    place = athlete.str[0].str.strip()
+    found = place[place.isin(country)]
+    temp_df.loc[found.index, "Country"] = found
+    temp_df.loc[found.index, "Athlete"] = (
+        athlete.str[1][found.index].str.strip().str.replace(")", "", regex=False)
+    )
+
+    # the athlete is the country for team events
+    team = is_text & ~has_comma & ~has_bracket
+    temp_df.loc[team, "Country"] = athletes[team]
 
     # do a second pass to deal with multiple athletes
-    for i, row in temp_df[temp_df["Country"].isna()].iterrows():
-        if row["Athlete"] is None:
-            continue
-        elif "," and " (" in row["Athlete"]:
-            # split Athlete column on the comma
-            athlete = row["Athlete"].split(" (")
-            # check if the country is in the list of countries
-            if athlete[0].strip() in country:
-                temp_df.loc[i, "Country"] = athlete[0].strip()
-                temp_df.loc[i, "Athlete"] = athlete[1]
-            elif athlete[0].strip() == "Britain":
-                temp_df.loc[i, "Country"] = "Great Britain"
-                temp_df.loc[i, "Athlete"] = athlete[1]
+    second_pass = has_bracket & temp_df["Country"].isna()
+    athlete = athletes[second_pass].str.split(" (", regex=False)
+    found = (
+        athlete.str[0]
+        .str.strip()
+        .map({"Britain": "Great Britain", **{name: name for name in country}})
+        .dropna()
+    )
+    temp_df.loc[found.index, "Country"] = found
+    temp_df.loc[found.index, "Athlete"] = athlete.str[1][found.index]
 
     return temp_df
 
 
-def deal_with_ties(df: pd.DataFrame) -> pd.DataFrame:
+# sports where two bronze medals are awarded in each event
+BRONZE_TIE_SPORTS = ["WRESTLING", "JUDO", "TAEKWONDO", "BOXING"]
+# events with a tie, the Gymnastics Horizontal Bar and the Track and field high jump
+TIED_EVENTS = ["MEN’S HORIZONTAL BAR", "WOMEN’S HIGH JUMP"]
+# athletes listed without their country
+ATHLETE_COUNTRIES = {"Dauren Kurugliev": "Greece"}
+
+
+@stage
+def deal_with_ties(
+    df: pd.DataFrame,
+    bronze_tie_sports: list = BRONZE_TIE_SPORTS,
+    tied_events: list = TIED_EVENTS,
+) -> tuple:
     """Events with multiple Bronze medals are Judo, Wrestling, Taekwondo and Boxing.
     As well, there were ties for Bronze in Women's High Jump, Men's Gymnastics Horizoantal Bar,
-    and Women's K-2 500M Sprint."""
-    temp_df = df[df["Country"].isna()].copy()
-
-    # list to store the bronze results
-    bronze_list = []
-
-    # create a list of indices with ties
-    tie_list = []
-
-    # create a list of bronze tie sports
-    bronze_tie_sports = ["WRESTLING", "JUDO", "TAEKWONDO", "BOXING"]
-
-    # look for the events with multiple bronze medals
-    for i, row in temp_df.iterrows():
-        if (
-            row["Sport"] in bronze_tie_sports
-            and "Bronze" in row["Medal"]
-            and "and" in row["Athlete"]
-        ):
-            # split the athlete column on the word 'and'
-            athletes = row["Athlete"].split(" and ")
-            # create a new row for each athlete
-            try:
-                for athlete in athletes:
-                    if "Dauren Kurugliev" in athlete:
-                        athlete_name = "Dauren Kurugliev"
-                        athlete_country = "Greece"
-
-                    else:
-                        athlete_split = athlete.split(", ")
-                        athlete_name = athlete_split[0]
-                        athlete_country = athlete_split[1]
-                    bronze_list.append(
-                        {
-                            "Sport": row["Sport"],
-                            "Event": row["Event"],
-                            "Medal": row["Medal"],
-                            "Athlete": athlete_name,
-                            "Country": athlete_country,
-                        }
-                    )
-                    tie_list.append(i)
-            except:
-                continue
+    and Women's K-2 500M Sprint.
+
+    The athletes of a tie are listed together as 'Athlete, Country and
+    Athlete, Country', each one gets its own row. The athletes of a row
+    stop at the first athlete without a country.
+
+    Returns:
+        tuple: a DataFrame with a row per athlete of the ties and the
+            index of the tied row of each athlete
+    """
+    temp_df = df[df["Country"].isna()]
+
+    # look for the events with multiple bronze medals, then the tied events
+    bronze_ties = (
+        temp_df["Sport"].isin(bronze_tie_sports)
+        & temp_df["Medal"].str.contains("Bronze", regex=False, na=False)
+        & temp_df["Athlete"].str.contains("and", regex=False, na=False)
+    )
+    other_ties = temp_df["Event"].isin(tied_events) & ~bronze_ties
+    tied_df = pd.concat([temp_df[bronze_ties], temp_df[other_ties]])
 
-    # split the Gymnastics Horizontal Bar tie at index 772
-    # and the Track and field high jump tie
-    two_ties_df = temp_df[
-        (temp_df["Event"] == "MEN’S HORIZONTAL BAR")
-        | (temp_df["Event"] == "WOMEN’S HIGH JUMP")
-    ].copy()
-    for i, row in two_ties_df.iterrows():
-        # split the athlete column on the word 'and'
-        athletes = row["Athlete"].split(" and ")
-        # create a new row for each athlete
-        for athlete in athletes:
-            athlete_split = athlete.split(", ")
-            athlete_name = athlete_split[0]
-            athlete_country = athlete_split[1]
-            bronze_list.append(
-                {
-                    "Sport": row["Sport"],
-                    "Event": row["Event"],
-                    "Medal": row["Medal"],
-                    "Athlete": athlete_name,
-                    "Country": athlete_country,
-                }
-            )
-            tie_list.append(i)
-
-    # create a DataFrame from the list of bronze results
-    bronze_df = pd.DataFrame(bronze_list)
-
-    return bronze_df, tie_list
+    # split the athlete column on the word 'and', one row per athlete
+    athletes = tied_df["Athlete"].str.split(" and ", regex=False).explode()
+    tie_index = athletes.index.to_numpy()
+    athletes = athletes.reset_index(drop=True)
 
+    athlete_split = athletes.str.split(", ", regex=False)
+    athlete_name = athlete_split.str[0]
+    athlete_country = athlete_split.str[1]
+    for name, country in ATHLETE_COUNTRIES.items():
+        listed = athletes.str.contains(name, regex=False)
+        athlete_name = athlete_name.mask(listed, name)
+        athlete_country = athlete_country.mask(listed, country)
 
+    # drop the athletes from the first one without a country
+    failed = athlete_country.isna().groupby(tie_index).cummax()
+
+    bronze_df = tied_df.loc[tie_index, ["Sport", "Event", "Medal"]]
+    bronze_df = bronze_df.assign(
+        Athlete=athlete_name.to_numpy(), Country=athlete_country.to_numpy()
+    )[~failed.to_numpy()]
+
+    return bronze_df.reset_index(drop=True), tie_index[~failed.to_numpy()].tolist()
+
+
+@stage
 def remove_bronze_ties(
     df: pd.DataFrame, bronze_df: pd.DataFrame, tie_list: list
 ) -> pd.DataFrame:
     """Remove the rows with bronze ties and append the bronze_df to the original df"""
 
-    temp_df = df.copy()
-    temp_df = temp_df.drop(tie_list)
+    temp_df = df.drop(tie_list)
     temp_df = pd.concat([temp_df, bronze_df], ignore_index=True)
 
     return temp_df
 
 
+@stage
 def fill_athlete_none(df: pd.DataFrame) -> pd.DataFrame:
     """Manually add the athlete and country for the following
     events that were missed"""
 
-    temp_df = df.copy()
+    temp_df = stage_copy(df)
 
     na_df = temp_df[temp_df["Athlete"].isna()]
 
@@ -757,12 +701,11 @@ def fill_athlete_none(df: pd.DataFrame) -> pd.DataFrame:
     return temp_df
 
 
+@stage
 def create_100m_breastroke(df: pd.DataFrame) -> pd.DataFrame:
     """Manually add the athlete and country for the
     MEN'S 100M BREASTSTROKE event"""
 
-    temp_df = df.copy()
-
     # create a dictionary of the data
     data = [
         {
@@ -796,40 +739,21 @@ def create_100m_breastroke(df: pd.DataFrame) -> pd.DataFrame:
     return temp_df
 
 
-# clean up the following edge cases
-# row 695 "WOMEN'S KAKAK DOUBLE 500M" Ahtlete needs to remove " and Hungary"
-# Copy row 695 and change Athelete to "Noemi Pup and Sara Fojt" and Country to "Hungary"
-
-
-def fix_kayak_double(df: pd.DataFrame) -> pd.DataFrame:
-    """There was a tie for bronze in the WOMEN'S KAKAK DOUBLE 500M event.
-    The athlete format is strange because there are two athlete
-    names per country. The German athletes are listed correctly but the
-    Hungarian"""
-
-    temp_df = df.copy()
+@stage
+def fix_athletes(df: pd.DataFrame, corrections: CorrectionRules = None) -> pd.DataFrame:
+    """Fix the athletes the results list in a strange format.
+    There was a tie for bronze in the WOMEN'S KAKAK DOUBLE 500M event,
+    the German athletes are listed correctly but the Hungarian athletes
+    are added to the German result. The corrections file changes the
+    German athletes and adds a row for the Hungarian athletes."""
 
-    # remove the extra data from Athlete column
-    temp_df.loc[695, "Athlete"] = temp_df.loc[695, "Athlete"].replace(
-        " and Hungary", ""
-    )
-
-    # duplicate the row and change the Athlete and Country
-    hungary = temp_df.loc[695, :].to_dict()
-
-    # change the Athlete and Country
-    hungary["Athlete"] = "Noemi Pup and Sara Fojt"
-    hungary["Country"] = "Hungary"
-
-    # convert dict to DataFrame
-    hungary = pd.DataFrame(hungary, index=[0])
+    if corrections is None:
+        corrections = CorrectionRules.load()
 
-    # concatenate the new row to the DataFrame
-    temp_df = pd.concat([temp_df, hungary], ignore_index=True)
-
-    return temp_df
+    return corrections.correct_athletes(df)
 
 
+@stage
 def add_paris_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Add columns for Year, City, and Season.
     This allows the data to be combined with other Olympic data
@@ -839,7 +763,7 @@ def add_paris_columns(df: pd.DataFrame) -> pd.DataFrame:
     Season: Summer
     """
 
-    temp_df = df.copy()
+    temp_df = stage_copy(df)
 
     temp_df["Year"] = 2024
     temp_df["City"] = "Paris"
@@ -848,12 +772,13 @@ def add_paris_columns(df: pd.DataFrame) -> pd.DataFrame:
     return temp_df
 
 
+@stage
 def replace_some_country_names(df: pd.DataFrame) -> pd.DataFrame:
     """Replace St. Lucia with Saint Lucia and Britain with Great Britain
     and Albany with Albania and Tadzhikistan with Tajikistan.
     Replace AIN with Refugee Olympic Team"""
 
-    temp_df = df.copy()
+    temp_df = stage_copy(df)
 
     temp_df["Country"] = temp_df["Country"].replace(
         {
@@ -868,18 +793,13 @@ def replace_some_country_names(df: pd.DataFrame) -> pd.DataFrame:
     return temp_df
 
 
+@stage
 def assign_noc_to_paris(df: pd.DataFrame) -> pd.DataFrame:
     """Match the NOC with the Country name for the Paris 2024 dataframe."""
 
-    # load the NOC data
-    noc_df = pd.read_csv(NOC_PATH)
-    noc_df = noc_df.drop_duplicates(subset="region")
-
-    # rename region column to Country
-    noc_df.rename(columns={"region": "Country"}, inplace=True)
-
-    # merge the dataframes
-    final_df = pd.merge(df, noc_df[["NOC", "Country"]], on="Country", how="left")
+    # look up the NOC of each country
+    noc = df["Country"].map(reference_data.noc_by_region(NOC_PATH))
+    final_df = df.assign(NOC=noc).reset_index(drop=True)
 
     # fix Great Britain NOC
     final_df.loc[final_df["Country"] == "Great Britain", "NOC"] = "GBR"
@@ -6,9 +6,14 @@
 import json
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import regex as re
 
+from olympics_data_project.data_cleaning import reference_data, schema
+from olympics_data_project.data_cleaning.clean_kaggle_data import read_medal_rows
+from olympics_data_project.data_cleaning.instrumentation import stage
+
 # Get the current script's directory
 base_dir = Path(__file__).parent
 # convert the path to the project directory
@@ -26,8 +31,11 @@ TOKYO_CITY = "Tokyo"
 
 FINAL_COLUMNS = ["Athlete", "NOC", "Year", "Season", "City", "Sport", "Event", "Medal"]
 MEDALS = ["Gold", "Silver", "Bronze"]
+# the results are athlete names and NOC, an NOC is three capital letters
+NOC_REGEX = r"[A-Z]{3}"
 
 
+@stage
 def process_kaggle_olympics_data(file_path: str) -> pd.DataFrame:
     """Takes in the path to the kaggle olympics data.
     This is data from 1896 to 2016 and includes Summer and Winter Olympics.
@@ -44,16 +52,15 @@ def process_kaggle_olympics_data(file_path: str) -> pd.DataFrame:
 
     # create a list of the final columns to keep
     columns = ["Team", "NOC", "Year", "Season", "City", "Sport", "Event", "Medal"]
-    # load old olympic data
-    old_df = pd.read_csv(file_path)
-    # remove the non-medal rows
-    old_df = old_df[old_df["Medal"].notnull()]
+    # load the medal rows of the old olympic data
+    old_df = read_medal_rows(file_path, usecols=columns, season=None)
     # create the final dataframe
     final_summer_df = old_df[columns]
 
     return final_summer_df
 
 
+@stage
 def create_event_df(df_row: pd.Series) -> pd.DataFrame:
     """Takes in a row from the Tokyo 2020 dataframe and creates a new dataframe
     with the athlete, noc, year, season, city, sport, event and medal columns.
@@ -65,31 +72,44 @@ def create_event_df(df_row: pd.Series) -> pd.DataFrame:
         pd.DataFrame: A new dataframe with the athlete, noc, year, season, city, sport, event and medal columns.
     """
 
-    sport = df_row["Sport"]
-    event = df_row["Event"]
-    results = df_row["Results"]
+    rows = event_rows(df_row["Sport"], df_row["Event"], df_row["Results"])
+
+    # create a DataFrame from the collected rows
+    final_event_df = pd.DataFrame(rows, columns=FINAL_COLUMNS)
+
+    return final_event_df
+
+
+def event_rows(
+    sport: str,
+    event: str,
+    results: list,
+    year: str = TOKYO_YEAR,
+    season: str = TOKYO_SEASON,
+    city: str = TOKYO_CITY,
+) -> list:
+    """Return a row per medal of an event, in the order of FINAL_COLUMNS.
 
+    The Athlete and NOC of a row are the same list of athletes and NOC of
+    the medal, parse_tokyo_medals gives a row per medal winner instead.
+    """
     # create a list of the athletes and their respective NOC
     medal_tuple = split_medals(results)
-    gold, silver, bronze = medal_tuple[0], medal_tuple[1], medal_tuple[2]
-
-    # create a list to hold each row as a list of values
-    rows = []
 
-    # iterate through the medals and athletes
-    for medal, athlete, noc in zip(
-        MEDALS, [gold, silver, bronze], [gold, silver, bronze]
-    ):
-        rows.append(
-            [athlete, noc, TOKYO_YEAR, TOKYO_SEASON, TOKYO_CITY, sport, event, medal]
-        )
+    return [
+        (athlete, athlete, year, season, city, sport, event, medal)
+        for medal, athlete in zip(MEDALS, medal_tuple)
+    ]
 
-    # create a DataFrame from the collected rows
-    final_event_df = pd.DataFrame(rows, columns=FINAL_COLUMNS)
 
-    return final_event_df
+def iter_medal_results(data: dict):
+    """Yield the sport, event and results of each event of the medals json."""
+    for sport, events in data.items():
+        for event, results in events.items():
+            yield sport, event, results
 
 
+@stage
 def split_medals(results: list) -> tuple:
     """Takes in a list of athlete names and/or NOC to parse.
     The list is of the results from the event and uses the order in the list
@@ -170,92 +190,142 @@ def split_medals(results: list) -> tuple:
     return gold, silver, bronze
 
 
-def split_athelete_country(df):
-    """Takes in a dataframe and splits the athlete and country into separate columns.
+@stage
+def parse_tokyo_medals(
+    path=TOKYO_2020,
+    year: str = TOKYO_YEAR,
+    season: str = TOKYO_SEASON,
+    city: str = TOKYO_CITY,
+) -> pd.DataFrame:
+    """Parse the results of every event of the medals json at once into a row
+    per medal winner.
+
+    The results of all the events are flattened into one Series and the NOC
+    are found with a single regex. The results of an event are runs of
+    athletes, each followed by a run of their NOC, or a run of teams (NOC
+    only). A run of athletes, or a single team, shares a placing and the
+    medal of a placing follows the number of winners before it, so a tie for
+    gold is followed by bronze and a tie for silver by no bronze:
+
+        ["Gianmarco Tamberi", "Mutaz Essa Barshim", "ITA", "QAT", "Maksim Nedasekau", "BLR"]
+        Gold (Tie) for Tamberi and Barshim, Bronze for Nedasekau
+
+        ["FRA", "JPN", "GER", "ISR"]
+        Gold for FRA, Silver for JPN and Bronze (Tie) for GER and ISR
+
+    Any number of tied winners is supported, and the rows are kept in the
+    order of the events.
 
     Args:
-        df (pd.DataFrame): A dataframe with the athlete and country in the same column.
+        path (str): the medals json, with the results of each event by sport.
+        year (str): the year of the Games.
+        season (str): Summer or Winter.
+        city (str): the host city.
 
     Returns:
-        pd.DataFrame: A dataframe with the athlete and country in separate columns.
+        pd.DataFrame: a row per medal winner with the FINAL_COLUMNS, the
+            Athlete is None for a team.
+
+    Raises:
+        ValueError: if the athletes of an event do not pair up with their NOC.
     """
+    with open(path) as f:
+        data = json.load(f)
 
-    # create a new dataframe with the athlete and country split
-    new_df = df.copy()
-    for i, row in df.iterrows():
-        # for team sports choose None for Athlete
-        if len(row["Athlete"]) == 1:
-            new_df.at[i, "Athlete"] = None
-            new_df.at[i, "NOC"] = row["Athlete"][0]
-        # fpr individual sports split the athlete and country
-        elif len(row["Athlete"]) == 2:
-            new_df.at[i, "Athlete"] = row["Athlete"][0]
-            new_df.at[i, "NOC"] = row["Athlete"][1]
-
-    return new_df
-
-
-def remove_ties(df):
-    """Takes in the tokyo 2020 dataframe and processes the medal ties
-    by extracting the proper athlete and country values from the list object
-    in the columns Athlete and NOC. The medal column is also updated with
-    (Tie) to signify that there was a tie. For each tie, there is an individual
-    row created for each athlete and country with duplicate medal values."""
-    # get an index list of medal ties
-    ties = [
-        i
-        for i, row in df.iterrows()
-        if (row["Athlete"] == row["NOC"] and len(row["Athlete"]) > 0)
-    ]
-    # for each tie create a duplicate row with the second value values and reset the index
-    for i in ties:
-        athletes_and_countries = df.loc[i, "Athlete"]
-        assert (
-            len(athletes_and_countries) == 4
-        ), f"Index {i}, There should be 4 values in the list"
-        # create a temp dataframe from the tied results row
-        temp_df = df.loc[i].copy()
-        temp_df = temp_df.to_frame().T
-        # make a duplicate row
-        temp_df = pd.concat([temp_df, temp_df], ignore_index=True)
-        # take the first athlete and country and put it in the first row
-        temp_df.loc[0, "Athlete"] = athletes_and_countries[0]
-        temp_df.loc[0, "NOC"] = athletes_and_countries[2]
-        temp_df.loc[0, "Medal"] = temp_df.loc[0, "Medal"] + " (Tie)"
-        # take the second athlete and country and put it in the second row
-        temp_df.loc[1, "Athlete"] = athletes_and_countries[1]
-        temp_df.loc[1, "NOC"] = athletes_and_countries[3]
-        temp_df.loc[1, "Medal"] = temp_df.loc[1, "Medal"] + " (Tie)"
-        # append the new rows
-        df = pd.concat([df, temp_df], ignore_index=True)
-
-    # remove the tied rows
-    clean_ties_df = df.drop(ties)
-
-    return clean_ties_df
+    events = list(iter_medal_results(data))
+    lengths = np.array([len(results) for _, _, results in events], dtype=np.int64)
+    tokens = pd.Series(
+        [value for _, _, results in events for value in results], dtype=object
+    )
+    event_id = np.repeat(np.arange(len(events)), lengths)
+    n_tokens = len(tokens)
+    is_noc = tokens.str.match(NOC_REGEX).to_numpy(dtype=bool)
+    values = tokens.to_numpy()
+
+    # split the results of each event into runs of athletes and runs of NOC
+    is_start = np.ones(n_tokens, dtype=bool)
+    is_start[1:] = (is_noc[1:] != is_noc[:-1]) | (event_id[1:] != event_id[:-1])
+    run_id = np.cumsum(is_start) - 1
+    run_starts = np.flatnonzero(is_start)
+    run_lengths = np.diff(np.append(run_starts, n_tokens))
+    run_event = event_id[run_starts]
+    offset = np.arange(n_tokens) - run_starts[run_id]
+
+    # a run of NOC that starts an event is a run of teams, any other run of
+    # NOC is the countries of the athletes before it
+    is_first_run = np.ones(len(run_starts), dtype=bool)
+    is_first_run[1:] = run_event[1:] != run_event[:-1]
+    is_team = is_noc & is_first_run[run_id]
+    is_winner = ~is_noc | is_team
+
+    # pair each athlete with the NOC at the same offset of the next run
+    athlete_run = run_id[~is_noc]
+    country_run = np.minimum(athlete_run + 1, len(run_starts) - 1)
+    unpaired = (
+        (country_run == athlete_run)
+        | (run_event[country_run] != run_event[athlete_run])
+        | (run_lengths[country_run] != run_lengths[athlete_run])
+    )
+    if unpaired.any():
+        sport, event, _ = events[run_event[athlete_run[unpaired][0]]]
+        raise ValueError(f"{sport}, {event}: the athletes do not pair up with an NOC")
+    noc = values.copy()
+    noc[~is_noc] = values[run_starts[country_run] + offset[~is_noc]]
+
+    # a placing is a run of athletes or a single team
+    placing = np.where(is_team, np.arange(n_tokens), run_starts[run_id])[is_winner]
+    winner_event = event_id[is_winner]
+    # the number of winners before each winner and before its placing
+    rank = np.arange(len(placing)) - np.searchsorted(winner_event, winner_event)
+    place = rank[np.searchsorted(placing, placing)]
+    medal_id = np.minimum(place, len(MEDALS) - 1)
+
+    # a medal with more than one winner in an event is a tie
+    medal_key = winner_event * len(MEDALS) + medal_id
+    winners = np.searchsorted(medal_key, medal_key, side="right") - np.searchsorted(
+        medal_key, medal_key
+    )
+    medal = np.asarray(MEDALS, dtype=object)[medal_id]
+    medal = np.where(winners > 1, medal + " (Tie)", medal)
+
+    sports = np.array([sport for sport, _, _ in events], dtype=object)
+    event_names = np.array([event for _, event, _ in events], dtype=object)
+    athlete = np.where(is_team, None, values)[is_winner]
+
+    return pd.DataFrame(
+        {
+            "Athlete": athlete,
+            "NOC": noc[is_winner],
+            "Year": year,
+            "Season": season,
+            "City": city,
+            "Sport": sports[winner_event],
+            "Event": event_names[winner_event],
+            "Medal": medal,
+        },
+        columns=FINAL_COLUMNS,
+    )
 
 
+@stage
 def clean_noc_data(df: pd.DataFrame) -> pd.DataFrame:
     """Some NOC values are lists and should be strings."""
     df["NOC"] = df["NOC"].apply(lambda x: ",".join(x) if isinstance(x, list) else x)
     return df
 
 
+@stage
 def assign_country_to_tokyo(df: pd.DataFrame) -> pd.DataFrame:
     """Match the NOC with the Country name for the Tokyo 2020 dataframe."""
 
-    # load the NOC data
-    noc_df = pd.read_csv(NOC_PATH)
-
-    # merge the dataframes
-    final_df = pd.merge(df, noc_df[["NOC", "region"]], on="NOC", how="left")
-
-    # rename columns
-    final_df.rename(columns={"region": "Country"}, inplace=True)
+    # look up the region of each NOC
+    country = df["NOC"].map(reference_data.region_by_noc(NOC_PATH))
+    final_df = df.assign(Country=country).reset_index(drop=True)
 
     return final_df
 
 
+@stage
 def fill_na_athlete(df: pd.DataFrame) -> pd.DataFrame:
     """Fill the None values in the Athlete column with the Country value."""
     df["Athlete"] = df["Athlete"].fillna(df["Country"])
@@ -263,40 +333,8 @@ def fill_na_athlete(df: pd.DataFrame) -> pd.DataFrame:
 
 
 if __name__ == "__main__":
-    # Load the json file
-    with open(TOKYO_2020) as f:
-        data_tokyo = json.load(f)
-
-    sports_ls = list()
-    events_lS = list()
-    medals_ls = list()
-
-    # iterate through the keys (Sport) and results
-    for key, val in data_tokyo.items():
-        sport = key
-        for event, results in val.items():
-            sports_ls.append(sport)
-            events_lS.append(event)
-            medals_ls.append(results)
-
-    # create a dataframe
-    tokyo_df = pd.DataFrame(
-        {"Sport": sports_ls, "Event": events_lS, "Results": medals_ls}
-    )
-
-    expanded_tokyo_df = pd.DataFrame(columns=FINAL_COLUMNS)
-
-    # iterate through the rows and extract the team, noc and medal
-    # from the results column and add them to the final dataframe
-    for i, row in tokyo_df.iterrows():
-        temp_df = create_event_df(row)
-        expanded_tokyo_df = pd.concat([expanded_tokyo_df, temp_df], ignore_index=True)
-
-    # split the athlete and country values into the correct columns
-    final_tokyo_df = split_athelete_country(expanded_tokyo_df)
-
-    # process the ties
-    cleaned_final_tokyo_df = remove_ties(final_tokyo_df)
+    # parse a row for each medal winner from the json file
+    cleaned_final_tokyo_df = parse_tokyo_medals(TOKYO_2020)
 
     # clean noc data to remove any lists
     cleaned_final_tokyo_df = clean_noc_data(cleaned_final_tokyo_df)
@@ -313,4 +351,4 @@ if __name__ == "__main__":
     )
 
     # save the final dataframe
-    cleaned_final_tokyo_df.to_csv(CSV_SAVE_PATH, index=False)
+    schema.save_csv(cleaned_final_tokyo_df, CSV_SAVE_PATH)
@@ -1,7 +1,13 @@
+import hashlib
+import json
+import os
 from pathlib import Path
 
 import pandas as pd
 
+from olympics_data_project.data_cleaning import parquet_store, schema
+from olympics_data_project.data_cleaning.instrumentation import stage
+
 # Get the current script's directory
 base_dir = Path(__file__).parent
 # convert the path to the project directory
@@ -13,6 +19,14 @@ PARIS_PATH = project_dir / "data" / "processed" / "paris2024_results.csv"
 KAGGLE_PATH = project_dir / "data" / "processed" / "kaggle1896_to_2016_results.csv"
 SAVE_PATH = project_dir / "data" / "processed" / "all_olympics_data.csv"
 
+# the processed datasets combined, in order
+SOURCES = {"tokyo": TOKYO_PATH, "paris": PARIS_PATH, "kaggle": KAGGLE_PATH}
+
+# Construct the path to the cache of the normalised datasets
+CACHE_DIR = project_dir / "data" / "cache" / "combine"
+# change when normalise_part changes, so every part is built again
+CACHE_VERSION = 1
+
 
 FINAL_COLUMNS = [
     "Athlete",
@@ -27,14 +41,24 @@ FINAL_COLUMNS = [
 ]
 
 
-def save_combined_data() -> None:
+def save_combined_data(parquet: bool = False, incremental: bool = False) -> None:
     """Save the combined paris, tokyo, and kaggle datasets to
-    a csv file."""
-    combined_data = combine_datasets()
-    combined_data = format_the_strings(combined_data)
-    combined_data.to_csv(SAVE_PATH, index=False)
-
-
+    a csv file, and to the Parquet dataset partitioned by Season/Year/Sport
+    if parquet is True (this needs pyarrow).
+
+    If incremental is True, only the datasets that changed since the last
+    incremental run are read and normalised again, see combine_incremental."""
+    if incremental:
+        combined_data = combine_incremental()
+    else:
+        combined_data = combine_datasets()
+        combined_data = format_the_strings(combined_data)
+    schema.save_csv(combined_data, SAVE_PATH)
+    if parquet:
+        parquet_store.save_parquet(combined_data)
+
+
+@stage
 def combine_datasets() -> pd.DataFrame:
     """Concatenate the three datasets into one."""
     tokyo_df = import_tokyo_data(TOKYO_PATH)
@@ -46,26 +70,147 @@ def combine_datasets() -> pd.DataFrame:
     paris_df = paris_df[FINAL_COLUMNS]
     kaggle_df = kaggle_df[FINAL_COLUMNS]
 
-    # concatenate the dataframes
-    return pd.concat([tokyo_df, paris_df, kaggle_df], ignore_index=True)
+    # concatenate the dataframes, keeping the categorical columns
+    return schema.concat([tokyo_df, paris_df, kaggle_df])
+
+
+def file_hash(path) -> str:
+    """Return the sha256 of the content of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(2**20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def part_hash(path) -> str:
+    """Return the hash of what normalise_part reads: the csv and its schema
+    file, or the absence of a schema file."""
+    digest = hashlib.sha256(file_hash(path).encode())
+    sidecar = schema.schema_path(path)
+    digest.update(file_hash(sidecar).encode() if sidecar.exists() else b"no schema")
+    return digest.hexdigest()
+
+
+class PartCache:
+    """On-disk cache of the normalised datasets of the combined data.
+
+    Each part is pickled with its dtypes, and manifest.json records the
+    path, content hash and row count of the dataset each part was built
+    from. The hash covers the csv and its schema file, see part_hash. A part
+    is only used while the hash of its dataset is unchanged.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.manifest_path = self.cache_dir / "manifest.json"
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            manifest = {}
+        # parts built by another version of normalise_part are not used
+        if manifest.get("version") != CACHE_VERSION:
+            manifest = {"version": CACHE_VERSION, "sources": {}}
+        return manifest
+
+    def _part_path(self, name: str) -> Path:
+        return self.cache_dir / f"{name}.pkl"
+
+    def get(self, name: str, digest: str) -> pd.DataFrame:
+        """Return the cached part, or None if its dataset has changed."""
+        entry = self.manifest["sources"].get(name)
+        if entry is None or entry["hash"] != digest:
+            return None
+        try:
+            part = pd.read_pickle(self._part_path(name))
+        except FileNotFoundError:
+            return None
+        if len(part) != entry["rows"]:
+            return None
+        return part
+
+    def put(self, name: str, path, digest: str, part: pd.DataFrame) -> None:
+        """Store a part and record its dataset in the manifest."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        part_path = self._part_path(name)
+        tmp_path = part_path.with_name(f"{part_path.name}.{os.getpid()}.tmp")
+        part.to_pickle(tmp_path)
+        os.replace(tmp_path, part_path)
+
+        self.manifest["sources"][name] = {
+            "path": str(path),
+            "hash": digest,
+            "rows": len(part),
+        }
+        tmp_path = self.manifest_path.with_name(f"manifest.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=4)
+        os.replace(tmp_path, self.manifest_path)
+
+
+@stage
+def normalise_part(path) -> pd.DataFrame:
+    """Read a processed dataset with the final columns and formatted strings.
+
+    str.title gives object columns, the part is cached with the schema dtypes
+    again so the concat only merges the categories instead of the values.
+    """
+    part = schema.read_csv(path)[FINAL_COLUMNS].copy()
+    return schema.apply_schema(format_the_strings(part))
+
+
+@stage
+def combine_incremental(sources: dict = None, cache_dir=CACHE_DIR) -> pd.DataFrame:
+    """Concatenate the normalised datasets, only reading and normalising the
+    datasets whose content changed since the last run, the other parts are
+    loaded from the cache.
+
+    Args:
+        sources (dict): the path of each dataset by name, in order. SOURCES
+            by default.
+        cache_dir (str): the directory of the cached parts and manifest.
+
+    Returns:
+        pd.DataFrame: the combined datasets, with the strings formatted.
+    """
+    cache = PartCache(cache_dir)
+    parts = []
+    for name, path in (sources or SOURCES).items():
+        digest = part_hash(path)
+        part = cache.get(name, digest)
+        if part is None:
+            part = normalise_part(path)
+            cache.put(name, path, digest, part)
+            print(f"{name} dataset normalised from {path}")
+        parts.append(part)
+
+    return schema.concat(parts)
 
 
+@stage
 def import_paris_data(paris_path: str) -> pd.DataFrame:
     """Import the Paris 2024 Olympics dataset from the specified path."""
-    return pd.read_csv(paris_path)
+    return schema.read_csv(paris_path)
 
 
+@stage
 def import_tokyo_data(tokyo_path: str) -> pd.DataFrame:
     """Import the Tokyo 2020 Olympics dataset from the specified path."""
-    return pd.read_csv(tokyo_path)
+    return schema.read_csv(tokyo_path)
 
 
+@stage
 def import_kaggle_data(kaggle_path: str) -> pd.DataFrame:
     """Import the Kaggle Olympics dataset from the specified path.
     This contains data from 1896 to 2016."""
-    return pd.read_csv(kaggle_path)
+    return schema.read_csv(kaggle_path)
 
 
+@stage
 def format_the_strings(data: pd.DataFrame) -> pd.DataFrame:
     """Format the strings in the dataframe to be title case.
     Example: "united states" -> "United States"
@@ -80,4 +225,5 @@ def format_the_strings(data: pd.DataFrame) -> pd.DataFrame:
 
 
 if __name__ == "__main__":
-    save_combined_data()
+    # the Parquet dataset is also written when pyarrow is installed
+    save_combined_data(parquet=parquet_store.available(), incremental=True)
@@ -0,0 +1,142 @@
+# corrections to the Paris results that no general cleaning step can make
+# the corrections are loaded from a data file and matched by the content of a
+# value or a row, not by its position, so they work on the whole article or on
+# any part of it, such as the new days of the live update
+
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from olympics_data_project.data_cleaning.paris_tokens import with_next
+
+# Get the current script's directory
+base_dir = Path(__file__).parent
+# convert the path to the project directory
+project_dir = base_dir.parent
+
+# Construct the path to the corrections file
+CORRECTIONS_PATH = project_dir / "data" / "raw" / "paris_corrections.json"
+
+
+class CorrectionRules:
+    """Index the corrections by the content they match.
+
+    The corrections file has three lists:
+        h2: a sport heading matched by the heading before it, its value and,
+            if given, the heading after it. The heading is replaced, deleted
+            or has another heading inserted before it.
+        events: the event of a row matched by its sport, its event and its
+            medal winners.
+        athletes: the athlete of a row matched by its sport, event, medal and
+            athlete. The athlete is changed and rows can be added for the
+            athletes that are missing.
+
+    Each list is stored in a dictionary, so matching a value or a row is a
+    single lookup.
+    """
+
+    def __init__(self, rules: dict):
+        self.h2_rules = {}
+        for rule in rules.get("h2", []):
+            key = (rule["previous"], rule["value"])
+            self.h2_rules.setdefault(key, []).append(rule)
+
+        self.event_rules = {
+            (rule["sport"], rule["event"], tuple(rule["medals"])): rule["set_event"]
+            for rule in rules.get("events", [])
+        }
+
+        self.athlete_rules = {
+            (rule["sport"], rule["event"], rule["medal"], rule["athlete"]): rule
+            for rule in rules.get("athletes", [])
+        }
+
+    @classmethod
+    def load(cls, path=CORRECTIONS_PATH) -> "CorrectionRules":
+        """Load the corrections from a json file"""
+        with open(path) as f:
+            rules = json.load(f)
+        return cls(rules)
+
+    def _match_h2(self, previous, val, following):
+        for rule in self.h2_rules.get((previous, val), ()):
+            if "next" not in rule or rule["next"] == following:
+                return rule
+        return None
+
+    def correct_h2(self, h2_data):
+        """Yield the h2 values with the corrections applied.
+
+        The rules are matched against the values as they were scraped, a
+        correction does not change what the next value is matched with.
+
+        Args:
+            h2_data (iterable): the cleaned h2 tag data
+
+        Yields:
+            str: the corrected h2 values
+        """
+        previous = None
+        for val, following in with_next(h2_data):
+            rule = self._match_h2(previous, val, following)
+            previous = val
+
+            if rule is None:
+                yield val
+            elif "insert_before" in rule:
+                yield rule["insert_before"]
+                yield val
+            elif "replace" in rule:
+                yield rule["replace"]
+            # a deleted value is not yielded
+
+    def correct_events(self, df: pd.DataFrame) -> pd.Series:
+        """Return the corrected event of each row, None where no rule matches.
+
+        Args:
+            df (pd.DataFrame): rows with Sport, Event and Medal Winners columns
+
+        Returns:
+            pd.Series: the corrected events, with the index of the DataFrame
+        """
+        keys = pd.Series(
+            list(zip(df["Sport"], df["Event"], df["Medal Winners"].map(tuple))),
+            index=df.index,
+            dtype=object,
+        )
+        return keys.map(self.event_rules.get)
+
+    def correct_athletes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Change the athletes of the matched rows and add the missing rows
+        at the end of the DataFrame.
+
+        Args:
+            df (pd.DataFrame): rows with Sport, Event, Medal and Athlete columns
+
+        Returns:
+            pd.DataFrame: the corrected DataFrame
+        """
+        keys = zip(df["Sport"], df["Event"], df["Medal"], df["Athlete"])
+        matches = [
+            (index, self.athlete_rules[key])
+            for index, key in zip(df.index, keys)
+            if key in self.athlete_rules
+        ]
+
+        # only the Athlete column is changed, the other columns are shared
+        # with df when copy on write is enabled
+        athletes = df["Athlete"].copy()
+        added = []
+        for index, rule in matches:
+            if "set_athlete" in rule:
+                athletes.loc[index] = rule["set_athlete"]
+            for values in rule.get("add", []):
+                row = {**df.loc[index].to_dict(), "Athlete": athletes.loc[index]}
+                added.append({**row, **values})
+
+        temp_df = df.assign(Athlete=athletes)
+        if added:
+            temp_df = pd.concat([temp_df, pd.DataFrame(added)], ignore_index=True)
+
+        return temp_df
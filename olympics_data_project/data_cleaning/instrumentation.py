@@ -0,0 +1,183 @@
+# measure the stages of the cleaning pipelines
+# a stage is a function decorated with @stage, it is only measured while a
+# profiler is active, otherwise the decorator costs a single check per call
+#
+# profile a block of code:
+#     with profile_stages("stages.json"):
+#         df = clean_paris_data(PARIS_PATH)
+#
+# or a whole run, the report is printed when the process exits:
+#     OLYMPICS_PROFILE_STAGES=1 python -m olympics_data_project.data_cleaning.clean_paris_data
+#     OLYMPICS_PROFILE_STAGES=stages.json python -m ...
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+# environment variable to profile a whole run, 1 prints the report and
+# any other value is the path of the json report
+PROFILE_ENV_VAR = "OLYMPICS_PROFILE_STAGES"
+
+# the profiler of the stages being run, None when profiling is disabled
+_active = None
+
+
+def _rows(value):
+    """Return the number of rows of a stage input or output, None if it has none."""
+    if isinstance(value, tuple) and value:
+        # stages such as deal_with_ties return the DataFrame first
+        return _rows(value[0])
+    if isinstance(value, (pd.DataFrame, pd.Series, list)):
+        return len(value)
+    return None
+
+
+def _memory(value) -> int:
+    """Return the bytes used by a DataFrame or Series, 0 for other values."""
+    if isinstance(value, tuple) and value:
+        return _memory(value[0])
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    return 0
+
+
+class StageProfiler:
+    """Add up the wall time, cpu time, rows and memory of each stage.
+
+    A stage called many times, such as create_event_df, has one entry with
+    the number of calls and the totals of all the calls. The memory is the
+    largest output of the stage.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def run(self, name: str, func, args: tuple, kwargs: dict):
+        """Call a stage and record its measurements."""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        result = func(*args, **kwargs)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+
+        rows_in = _rows(args[0]) if args else None
+        rows_out = _rows(result)
+        memory = _memory(result)
+
+        with self._lock:
+            entry = self.stages.setdefault(
+                name,
+                {
+                    "stage": name,
+                    "calls": 0,
+                    "wall_seconds": 0.0,
+                    "cpu_seconds": 0.0,
+                    "rows_in": None,
+                    "rows_out": None,
+                    "memory_bytes": 0,
+                },
+            )
+            entry["calls"] += 1
+            entry["wall_seconds"] += wall
+            entry["cpu_seconds"] += cpu
+            if rows_in is not None:
+                entry["rows_in"] = (entry["rows_in"] or 0) + rows_in
+            if rows_out is not None:
+                entry["rows_out"] = (entry["rows_out"] or 0) + rows_out
+            entry["memory_bytes"] = max(entry["memory_bytes"], memory)
+
+        return result
+
+    def records(self) -> list:
+        """Return the measurements of each stage, in the order they first ran."""
+        with self._lock:
+            return [dict(entry) for entry in self.stages.values()]
+
+    def report(self) -> str:
+        """Return the measurements as a table."""
+        header = (
+            f"{'stage':50} {'calls':>6} {'wall s':>8} {'cpu s':>8} "
+            f"{'rows in':>9} {'rows out':>9} {'MiB out':>8}"
+        )
+        lines = [header, "-" * len(header)]
+        for entry in self.records():
+            rows_in = "" if entry["rows_in"] is None else entry["rows_in"]
+            rows_out = "" if entry["rows_out"] is None else entry["rows_out"]
+            lines.append(
+                f"{entry['stage']:50} {entry['calls']:6d} "
+                f"{entry['wall_seconds']:8.3f} {entry['cpu_seconds']:8.3f} "
+                f"{rows_in:>9} {rows_out:>9} "
+                f"{entry['memory_bytes'] / 2**20:8.2f}"
+            )
+        return "\n".join(lines)
+
+    def save(self, path) -> None:
+        """Write the measurements to a json file."""
+        with open(path, "w") as f:
+            json.dump(self.records(), f, indent=4)
+        print(f"Stage report saved to {path}")
+
+
+def stage(func):
+    """Decorate a cleaning stage so it is measured while a profiler is active."""
+    # named after the file, the module is __main__ when a cleaner is run
+    name = f"{Path(func.__code__.co_filename).stem}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _active
+        if profiler is None:
+            return func(*args, **kwargs)
+        return profiler.run(name, func, args, kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def profile_stages(report_path=None):
+    """Measure the stages run in the block.
+
+    The report is printed at the end of the block, and written to
+    report_path as json if it is given.
+
+    Yields:
+        StageProfiler: the measurements of the stages
+    """
+    global _active
+    previous = _active
+    profiler = StageProfiler()
+    _active = profiler
+    try:
+        yield profiler
+    finally:
+        _active = previous
+        _finish(profiler, report_path)
+
+
+def _finish(profiler: StageProfiler, report_path) -> None:
+    print(profiler.report())
+    if report_path is not None:
+        profiler.save(report_path)
+
+
+def _profile_from_env() -> None:
+    """Profile the whole run when the environment variable is set."""
+    global _active
+    value = os.environ.get(PROFILE_ENV_VAR)
+    if not value or value == "0":
+        return
+    _active = StageProfiler()
+    atexit.register(_finish, _active, None if value == "1" else value)
+
+
+_profile_from_env()
@@ -0,0 +1,215 @@
+# update the Paris results during a Games without cleaning the whole article again
+# the AP News article lists the newest day first, so each poll only adds a block
+# of <h2> and <p> tags near the top of the story
+
+import difflib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from olympics_data_project.data_cleaning.clean_paris_data import (
+    COUNTRY_PATH,
+    CSV_SAVE_PATH,
+    PARIS_PATH,
+    SPORTS_PATH,
+    add_paris_columns,
+    assign_noc_to_paris,
+    clean_paris_data,
+    convert_medal_list_to_df,
+    deal_with_ties,
+    fill_athlete_none,
+    fix_athletes,
+    group_medals_with_events,
+    load_data,
+    melt_medals,
+    remove_bronze_ties,
+    remove_medal_colors,
+    replace_some_country_names,
+    replace_sport,
+    save_data_to_csv,
+    split_country_athlete,
+)
+from olympics_data_project.data_cleaning import paris_tokens, reference_data
+from olympics_data_project.data_cleaning.corrections import CorrectionRules
+from olympics_data_project.data_cleaning.paris_tokens import tokenize_h2, tokenize_p
+from olympics_data_project.web_scrapers.ap_news_scraper import (
+    AP_NEWS_URL,
+    parse_ap_news,
+)
+from olympics_data_project.web_scrapers.http_client import fetch, print_fetch_stats
+
+# the latest scrape, kept apart from the raw article the full clean reads
+SNAPSHOT_PATH = PARIS_PATH.with_name("paris2024_snapshot.json")
+
+
+def kept_h2(h2_values):
+    """Yield the h2 values the cleaning keeps, the dates and symbols are dropped"""
+    return paris_tokens.with_letters(paris_tokens.without_dates(h2_values))
+
+
+def diff_entries(old: list, new: list, kept=paris_tokens.p_results) -> tuple:
+    """Compare the tags of the previous snapshot and of the latest scrape.
+
+    Only the entries inserted in the new list are new results. An entry of
+    the old list that was edited or removed, such as a corrected name, is
+    already in the csv, so its rows cannot just be appended. Changes to
+    entries the cleaning drops, such as the introduction, are ignored.
+
+    Args:
+        old (list): the h2 or p tags of the previous snapshot.
+        new (list): the h2 or p tags of the latest scrape.
+        kept (callable): yields the values of a list the cleaning keeps,
+            kept_h2 for the h2 tags and paris_tokens.p_results for the p tags.
+
+    Returns:
+        tuple: the inserted entries of the new list, in order, and True if
+            an entry of the old list that the cleaning keeps was changed or
+            removed.
+    """
+    matcher = difflib.SequenceMatcher(a=old, b=new, autojunk=False)
+
+    added = []
+    changed = False
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        if any(True for _ in kept(old[i1:i2])):
+            changed = True
+        elif tag in ("insert", "replace"):
+            added.extend(new[j1:j2])
+
+    return added, changed
+
+
+def build_block_df(h2_data: list, grouped: list, sports: list) -> pd.DataFrame:
+    """Pair each h2 tag with a group of medals, in the same order as
+    combine_grouped_medals_with_h2.
+
+    A h2 tag is either a sport from the sports list, then the event is the
+    heading of the medals, or an event of the last sport seen.
+    """
+    rows = []
+    sport = None
+    for h2, (event, medals) in zip(h2_data, grouped):
+        if h2 in sports:
+            sport = h2
+            event = event or h2
+        else:
+            event = h2
+        rows.append({"Sport": sport or h2, "Event": event, "Medal Winners": medals})
+
+    return pd.DataFrame(rows, columns=["Sport", "Event", "Medal Winners"])
+
+
+def clean_new_results(h2_data: list, p_data: list) -> pd.DataFrame:
+    """Clean the h2 and p tags of the new days into rows of the Paris csv.
+
+    Only the cleaning steps that look at the content of the tags are used.
+    The h2 and athlete corrections are matched by content, so they are
+    applied to the new days as well.
+    """
+    corrections = CorrectionRules.load()
+
+    h2_data = [token.text for token in tokenize_h2(h2_data)]
+    h2_data = list(corrections.correct_h2(h2_data))
+    p_data = [token.text for token in tokenize_p(p_data)]
+    grouped = group_medals_with_events(p_data)
+
+    df = build_block_df(h2_data, grouped, reference_data.sport_names(SPORTS_PATH))
+    df = replace_sport(df)
+    df = convert_medal_list_to_df(df)
+    df = remove_medal_colors(df)
+    df = melt_medals(df)
+    df = split_country_athlete(df, COUNTRY_PATH)
+    bronze_df, tie_list = deal_with_ties(df)
+    df = remove_bronze_ties(df, bronze_df, tie_list)
+    df = fill_athlete_none(df)
+    df = fix_athletes(df, corrections)
+    df = add_paris_columns(df)
+    df = replace_some_country_names(df)
+    df = assign_noc_to_paris(df)
+
+    return df
+
+
+def clean_full_story(story: dict) -> pd.DataFrame:
+    """Clean the whole article with clean_paris_data, which reads it from a file."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        story_path = Path(tmp_dir) / "paris2024_results.json"
+        with open(story_path, "w") as file:
+            json.dump(story, file)
+        return clean_paris_data(story_path)
+
+
+def append_to_csv(df: pd.DataFrame, path) -> None:
+    """Append the rows to the csv file, in the order of its columns"""
+    columns = pd.read_csv(path, nrows=0).columns
+    df.reindex(columns=columns).to_csv(path, mode="a", header=False, index=False)
+    print(f"{len(df)} rows appended to {path}")
+
+
+def save_snapshot(story: dict, path) -> None:
+    """Replace the snapshot with the latest scrape, through a temporary file
+    so an interrupted write does not leave a partial snapshot."""
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as file:
+        json.dump(story, file)
+    os.replace(tmp_path, path)
+
+
+def update_paris_results(
+    story: dict,
+    snapshot_path=SNAPSHOT_PATH,
+    csv_path=CSV_SAVE_PATH,
+    seed_path=PARIS_PATH,
+) -> pd.DataFrame:
+    """Clean only what changed since the last snapshot and append it to the csv.
+
+    If a result already in the snapshot was edited or removed, its rows in
+    the csv are out of date, so the whole article is cleaned again and the
+    csv is replaced instead.
+
+    Args:
+        story (dict): the h2 and p tags of the latest scrape.
+        snapshot_path (str): the json file of the previous scrape, it is
+            replaced by the latest scrape.
+        csv_path (str): the Paris results csv file.
+        seed_path (str): the scrape the csv was cleaned from, copied to the
+            snapshot on the first update. It is never written.
+
+    Returns:
+        pd.DataFrame: the rows that were appended, or all the rows when the
+            whole article was cleaned again.
+    """
+    if not Path(snapshot_path).exists():
+        shutil.copy(seed_path, snapshot_path)
+    snapshot = load_data(snapshot_path)
+
+    h2_data, h2_changed = diff_entries(snapshot["h2"], story["h2"], kept_h2)
+    p_data, p_changed = diff_entries(snapshot["p"], story["p"])
+
+    if h2_changed or p_changed:
+        print("Results already in the csv changed, cleaning the whole article")
+        df = clean_full_story(story)
+        save_data_to_csv(df, csv_path)
+    else:
+        df = clean_new_results(h2_data, p_data)
+        if not df.empty:
+            append_to_csv(df, csv_path)
+
+    save_snapshot(story, snapshot_path)
+
+    return df
+
+
+if __name__ == "__main__":
+    response = fetch(AP_NEWS_URL)
+    response.raise_for_status()
+    story = parse_ap_news(response.text)
+    update_paris_results(story)
+    print_fetch_stats()
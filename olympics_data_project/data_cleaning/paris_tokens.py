@@ -0,0 +1,177 @@
+# walk the h2 and p tags scraped from AP News once and yield the cleaned values
+# each cleaning rule is a generator step, the steps are chained so the values
+# are not copied into a list between the steps, and the h2 and p steps of
+# clean_paris_data call the same generators
+
+from collections import namedtuple
+
+import regex as re
+
+# the kinds of tokens
+SPORT = "sport"
+EVENT = "event"
+MEDAL = "medal"
+
+Token = namedtuple("Token", ["kind", "text"])
+
+# look at the start of a value once and record everything the cleaning needs
+# date: the value is a date, such as 'Sunday, Aug. 11'
+# medal: the value starts with a medal, such as 'GOLD:' or 'Silver:'
+# team: the value starts with men or women
+# letter: the value starts with a letter
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?=(?P<date>[A-Z][a-z]+day))?
+    (?=(?P<medal>(?i:gold|silver|bronze):))?
+    (?=(?P<team>(?i:men|women)))?
+    (?=(?P<letter>[a-zA-Z]))?
+    """,
+    re.VERBOSE,
+)
+# a medal that is not at the start, such as 'MEN’S 90KG Gold: ...',
+# searched from the second character
+INNER_MEDAL_PATTERN = re.compile(r"(?:Gold|GOLD|Silver|Bronze):")
+
+# the medal split off a combined event and medal, first found wins
+INNER_MEDALS = [
+    ("Gold:", "Gold:"),
+    ("GOLD:", "Gold:"),
+    ("Silver:", "Silver:"),
+    ("Bronze:", "Bronze:"),
+]
+
+# marks the end of the values when looking ahead
+_END = object()
+
+
+def with_next(values):
+    """Yield each value with the value after it, None after the last value."""
+    values = iter(values)
+    current = next(values, _END)
+    while current is not _END:
+        following = next(values, _END)
+        yield current, None if following is _END else following
+        current = following
+
+
+def without_dates(h2_values):
+    """Yield the values that are not dates, such as 'Sunday, Aug. 11'"""
+    for val in h2_values:
+        if not TOKEN_PATTERN.match(val).group("date"):
+            yield val
+
+
+def with_letters(h2_values):
+    """Yield the values that start with a letter, and the 3X3 BASKETBALL
+    headings"""
+    for val in h2_values:
+        if val.startswith("3X3 BASKETBALL") or TOKEN_PATTERN.match(val).group("letter"):
+            yield val
+
+
+def combine_cycling_pursuit(h2_values):
+    """Yield CYCLING and the TEAM PURSUIT heading after it as one value"""
+    for val, following in with_next(h2_values):
+        if val == "CYCLING" and following is not None and "TEAM PURSUIT" in following:
+            continue
+        elif "TEAM PURSUIT" in val:
+            yield f"CYCLING {val}"
+        else:
+            yield val
+
+
+def update_3x3_basketball(h2_values):
+    """Yield 3X3 BASKETBALL as MEN’S 3X3 BASKETBALL and the value after it
+    as WOMEN’S 3X3 BASKETBALL"""
+    womens = False
+    for val in h2_values:
+        if val == "3X3 BASKETBALL":
+            yield f"MEN’S {val}"
+            womens = True
+        elif womens:
+            yield "WOMEN’S 3X3 BASKETBALL"
+            womens = False
+        else:
+            yield val
+            womens = False
+
+
+def clean_swimming_relays(h2_values):
+    """Yield the swimming headings with the missing medley relays added"""
+    for val, following in with_next(h2_values):
+        if val == "SWIMMING" and following is not None and "1500M" in following:
+            yield "WOMEN’S 50M FREESTYLE"
+            yield "WOMEN’S 4x100M MEDLEY RELAY"
+        elif val == "MEN’S 1500M FREESTYLE":
+            yield val
+            yield "MEN’S 4x100M MEDLEY RELAY"
+        else:
+            yield val
+
+
+def tokenize_h2(h2_data):
+    """Yield the sport and event headings of the h2 tags.
+
+    Chains without_dates, with_letters, combine_cycling_pursuit,
+    update_3x3_basketball and clean_swimming_relays, each value goes through
+    all of them before the next value is read.
+
+    Args:
+        h2_data (iterable): the h2 tag data from AP News website
+
+    Yields:
+        Token: a sport token for each heading
+    """
+    values = without_dates(h2_data)
+    values = with_letters(values)
+    values = combine_cycling_pursuit(values)
+    values = update_3x3_basketball(values)
+    for val in clean_swimming_relays(values):
+        yield Token(SPORT, val)
+
+
+def p_results(p_values):
+    """Yield the values that are events or results, events are all
+    uppercase or start with men or women, results start with a medal"""
+    for val in p_values:
+        medal, team = TOKEN_PATTERN.match(val).group("medal", "team")
+        if medal or team or val.isupper():
+            yield val
+
+
+def split_event_medals(p_values):
+    """Yield an event or medal token for each value, a value with both an
+    event and a medal, such as 'MEN’S 90KG Gold: Lasha Bekauri, Georgia',
+    is split in two tokens"""
+    for val in p_values:
+        if INNER_MEDAL_PATTERN.search(val, 1):
+            for medal, replacement in INNER_MEDALS:
+                if medal in val:
+                    event, _, result = val.partition(medal)
+                    yield Token(EVENT, event.rstrip())
+                    yield Token(MEDAL, replacement + result)
+                    break
+        elif TOKEN_PATTERN.match(val).group("medal"):
+            yield Token(MEDAL, val)
+        else:
+            yield Token(EVENT, val)
+
+
+def tokenize_p(p_data):
+    """Yield the events and medals of the p tags.
+
+    Chains p_results and split_event_medals.
+
+    Args:
+        p_data (iterable): the p tag data from AP News website
+
+    Yields:
+        Token: an event or medal token for each result
+    """
+    return split_event_medals(p_results(p_data))
+
+
+def tokenize(data: dict):
+    """Yield the tokens of the h2 tags, then the tokens of the p tags."""
+    yield from tokenize_h2(data["h2"])
+    yield from tokenize_p(data["p"])
@@ -0,0 +1,131 @@
+# a Parquet dataset of the combined Olympic data, partitioned by
+# Season/Year/Sport, next to all_olympics_data.csv
+# a reader of one sport or one Games only opens the files of its partitions
+# and only the columns it asks for, instead of parsing the whole csv
+#
+# pyarrow is optional, it is only imported when the store is used:
+#     pip install pyarrow
+#
+#     save_parquet(df)
+#     swimming = read_olympics(sports=["Swimming"])
+#     tokyo = read_olympics(years=[2020], columns=["Country", "Medal"])
+
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from olympics_data_project.data_cleaning import schema
+
+# Get the current script's directory
+base_dir = Path(__file__).parent
+# convert the path to the project directory
+project_dir = base_dir.parent
+
+# Construct the path to the Parquet dataset
+PARQUET_PATH = project_dir / "data" / "processed" / "all_olympics_data"
+
+PARTITION_COLUMNS = ["Season", "Year", "Sport"]
+FINAL_COLUMNS = [
+    "Athlete",
+    "Country",
+    "NOC",
+    "Season",
+    "Year",
+    "City",
+    "Sport",
+    "Event",
+    "Medal",
+]
+
+
+def available() -> bool:
+    """Return True if pyarrow is installed."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _require_pyarrow() -> None:
+    if not available():
+        raise ImportError(
+            "pyarrow is needed for the Parquet store, install it with "
+            "pip install pyarrow"
+        )
+
+
+def save_parquet(
+    df: pd.DataFrame, path=PARQUET_PATH, partition_cols: list = PARTITION_COLUMNS
+) -> None:
+    """Save the combined data as a Parquet dataset partitioned by
+    Season/Year/Sport by default, replacing any previous dataset at the path."""
+    _require_pyarrow()
+    path = Path(path)
+    if path.exists():
+        shutil.rmtree(path)
+
+    # write the values rather than the categories, a categorical column would
+    # store all its categories in every file, Parquet already encodes the
+    # values of each file as a dictionary
+    df = schema.apply_schema(df)
+    df = df.astype(
+        {column: object for column in schema.CATEGORY_COLUMNS if column in df}
+    )
+    df.to_parquet(path, engine="pyarrow", partition_cols=partition_cols, index=False)
+    print(f"Parquet dataset saved to {path}")
+
+
+def partition_filters(
+    seasons: list = None, years: list = None, sports: list = None
+) -> list:
+    """Return the pyarrow filters of the partitions to read, None reads all."""
+    filters = [
+        (column, "in", list(values))
+        for column, values in [("Season", seasons), ("Year", years), ("Sport", sports)]
+        if values is not None
+    ]
+    return filters or None
+
+
+def read_olympics(
+    path=PARQUET_PATH,
+    columns: list = None,
+    seasons: list = None,
+    years: list = None,
+    sports: list = None,
+) -> pd.DataFrame:
+    """Read the combined data from the Parquet dataset.
+
+    Only the partitions of the given seasons, years and sports, and only the
+    given columns, are read from disk.
+
+    Args:
+        path (str): the Parquet dataset.
+        columns (list): the columns to read, all by default.
+        seasons (list): the seasons to read, such as ["Summer"].
+        years (list): the years to read, such as [2020, 2024].
+        sports (list): the sports to read, such as ["Swimming"].
+
+    Returns:
+        pd.DataFrame: the rows of the partitions, with the schema dtypes.
+    """
+    _require_pyarrow()
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    filters = partition_filters(seasons, years, sports)
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    table = dataset.to_table(
+        columns=columns,
+        filter=None if filters is None else pq.filters_to_expression(filters),
+    )
+    df = table.to_pandas()
+
+    # the partition columns are read back at the end, put them back in place
+    order = list(
+        columns or [column for column in FINAL_COLUMNS if column in df.columns]
+    )
+    order += [column for column in df.columns if column not in order]
+    return schema.apply_schema(df[order])
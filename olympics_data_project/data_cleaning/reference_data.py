@@ -0,0 +1,118 @@
+# the reference files shared by the cleaners: the country names, the NOC regions
+# and the list of sports of the Paris article
+# each file is parsed once per process into lookups, and parsed again only when
+# the file changes on disk
+
+import json
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+# Get the current script's directory
+base_dir = Path(__file__).parent
+# convert the path to the project directory
+project_dir = base_dir.parent
+
+# Construct the path to the reference files
+COUNTRY_PATH = project_dir / "data" / "raw" / "country_codes.csv"
+NOC_PATH = project_dir / "data" / "raw" / "noc_regions.csv"
+SPORTS_PATH = project_dir / "data" / "raw" / "sports_list.json"
+
+# country names used by AP News that are not in the list of countries
+COUNTRY_ALIASES = {"Britain": "Great Britain", "AIN": "Belarus"}
+
+# parsed files by (parser, path), with the modification time and size
+# of the file when it was parsed
+_cache = {}
+_lock = threading.Lock()
+
+
+def cached(path, parse):
+    """Return parse(path), parsing the file again only when it has changed.
+
+    The parsed value is shared by every caller and must not be changed.
+
+    Args:
+        path (str): the reference file.
+        parse (callable): a function that takes the path and returns the
+            parsed value.
+    """
+    path = Path(path)
+    stat = path.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    key = (parse, path.resolve())
+
+    with _lock:
+        entry = _cache.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    value = parse(path)
+    with _lock:
+        _cache[key] = (version, value)
+    return value
+
+
+def clear_cache() -> None:
+    """Forget every parsed file."""
+    with _lock:
+        _cache.clear()
+
+
+def _parse_countries(path) -> dict:
+    countries = pd.read_csv(path)
+    names = frozenset(countries["country_name"].dropna())
+    # the names and aliases of the countries, the real names win
+    canonical = {**COUNTRY_ALIASES, **{name: name for name in names}}
+    return {"names": names, "canonical": canonical}
+
+
+def country_names(path=COUNTRY_PATH) -> frozenset:
+    """Return the set of country names."""
+    return cached(path, _parse_countries)["names"]
+
+
+def canonical_countries(path=COUNTRY_PATH) -> dict:
+    """Return the country of each country name and alias, such as
+    'Britain' -> 'Great Britain'."""
+    return cached(path, _parse_countries)["canonical"]
+
+
+def _parse_noc_regions(path) -> dict:
+    noc_df = pd.read_csv(path)
+    # a region with more than one NOC gets the first one
+    regions = noc_df.dropna(subset="region").drop_duplicates(subset="region")
+    return {
+        "noc_by_region": dict(zip(regions["region"], regions["NOC"])),
+        "region_by_noc": dict(zip(noc_df["NOC"], noc_df["region"])),
+    }
+
+
+def noc_by_region(path=NOC_PATH) -> dict:
+    """Return the NOC of each region, such as 'France' -> 'FRA'."""
+    return cached(path, _parse_noc_regions)["noc_by_region"]
+
+
+def region_by_noc(path=NOC_PATH) -> dict:
+    """Return the region of each NOC, such as 'FRA' -> 'France'."""
+    return cached(path, _parse_noc_regions)["region_by_noc"]
+
+
+def _parse_sports_list(path) -> tuple:
+    with open(path) as f:
+        return tuple(json.load(f))
+
+
+def _parse_sport_names(path) -> frozenset:
+    return frozenset(_parse_sports_list(path))
+
+
+def sports_list(path=SPORTS_PATH) -> tuple:
+    """Return the sport headers of the Paris article in order."""
+    return cached(path, _parse_sports_list)
+
+
+def sport_names(path=SPORTS_PATH) -> frozenset:
+    """Return the set of sport headers of the Paris article."""
+    return cached(path, _parse_sport_names)
@@ -0,0 +1,143 @@
+# the dtypes of the processed Olympic frames
+# the columns with few distinct values are categorical and Year is a small
+# integer, which cuts the memory of the frames and speeds up groupby and merge
+#
+# a csv loses the dtypes, so save_csv writes the categories next to the csv
+# in a .schema.json file and read_csv reads them back:
+#     save_csv(df, "all_olympics_data.csv")
+#     df = read_csv("all_olympics_data.csv")
+# the .schema.json files are not committed, without one read_csv works out
+# the same categories from the values of the csv
+
+import json
+from pathlib import Path
+
+import pandas as pd
+
+CATEGORY_COLUMNS = ["Country", "NOC", "Season", "City", "Sport", "Event", "Medal"]
+YEAR_DTYPE = "int16"
+
+# columns with a fixed category order, any other value is added at the end
+MEDAL_ORDER = [
+    "Gold",
+    "Gold (Tie)",
+    "Silver",
+    "Silver (Tie)",
+    "Bronze",
+    "Bronze (Tie)",
+]
+FIXED_CATEGORIES = {"Season": ["Summer", "Winter"], "Medal": MEDAL_ORDER}
+
+
+def categories(column: str, values) -> list:
+    """Return the categories of a column in a stable order.
+
+    The fixed categories of the column come first, then the other values
+    sorted, so the order does not depend on the order of the rows.
+    """
+    fixed = FIXED_CATEGORIES.get(column, [])
+    others = set(_unique(values)) - set(fixed)
+    return fixed + sorted(others, key=str)
+
+
+def _unique(values):
+    """Return the distinct values, the categories of a categorical column."""
+    values = pd.Series(values)
+    if values.dtype == "category":
+        return values.cat.categories
+    return values.dropna().unique()
+
+
+def _with_categories(series: pd.Series, column_categories: list) -> pd.Series:
+    """Return the series as a categorical with the given categories, values
+    missing from them are added at the end rather than lost."""
+    extra = set(_unique(series)) - set(column_categories)
+    dtype = pd.CategoricalDtype(list(column_categories) + sorted(extra, key=str))
+    if series.dtype == dtype:
+        return series
+    return series.astype(dtype)
+
+
+def apply_schema(df: pd.DataFrame, schema: dict = None) -> pd.DataFrame:
+    """Return the frame with the categorical columns and the Year dtype.
+
+    Only the columns of the schema in the frame are converted, the other
+    columns, such as Athlete, are kept as they are.
+
+    Args:
+        df (pd.DataFrame): a processed Olympic frame.
+        schema (dict): the categories of each column, such as the ones saved
+            by save_csv. By default they are worked out from the values.
+    """
+    schema = schema or {}
+    converted = {}
+    for column in CATEGORY_COLUMNS:
+        if column not in df.columns:
+            continue
+        column_categories = schema.get(column) or categories(column, df[column])
+        converted[column] = _with_categories(df[column], column_categories)
+    if "Year" in df.columns:
+        converted["Year"] = df["Year"].astype(YEAR_DTYPE)
+    return df.assign(**converted)
+
+
+def concat(frames: list) -> pd.DataFrame:
+    """Concatenate frames and keep the categorical columns categorical.
+
+    pd.concat gives object columns when the categories of the frames differ,
+    so the categories are first set to the union of the categories.
+    """
+    frames = [apply_schema(frame) for frame in frames]
+    schema = {}
+    for column in CATEGORY_COLUMNS:
+        if all(column in frame.columns for frame in frames):
+            values = [
+                value for frame in frames for value in frame[column].cat.categories
+            ]
+            schema[column] = categories(column, values)
+    return pd.concat(
+        [apply_schema(frame, schema) for frame in frames], ignore_index=True
+    )
+
+
+def schema_path(path) -> Path:
+    """Return the path of the schema saved next to a csv."""
+    return Path(path).with_suffix(".schema.json")
+
+
+def save_csv(df: pd.DataFrame, path) -> None:
+    """Save the frame to a csv, and its categories to the schema file."""
+    df = apply_schema(df)
+    df.to_csv(path, index=False)
+
+    schema = {
+        column: list(df[column].cat.categories)
+        for column in CATEGORY_COLUMNS
+        if column in df.columns
+    }
+    with open(schema_path(path), "w") as f:
+        json.dump(schema, f, indent=4)
+
+
+def read_csv(path, **kwargs) -> pd.DataFrame:
+    """Read a processed csv with the categories of its schema file.
+
+    Without a schema file, such as in a fresh checkout, the categories are
+    worked out from the values as in categories(): the fixed categories of
+    the column, then the other values sorted. For a csv written by save_csv
+    these are the categories its schema file would hold. Values missing from
+    the schema, such as rows appended to the csv since it was saved, are
+    added at the end of the categories.
+    """
+    schema = {}
+    if schema_path(path).exists():
+        with open(schema_path(path)) as f:
+            schema = json.load(f)
+
+    columns = pd.read_csv(path, nrows=0).columns
+    dtype = {column: "category" for column in CATEGORY_COLUMNS if column in columns}
+    if "Year" in columns:
+        dtype["Year"] = YEAR_DTYPE
+    dtype.update(kwargs.pop("dtype", {}))
+    df = pd.read_csv(path, dtype=dtype, **kwargs)
+    return apply_schema(df, schema)
@@ -2,6 +2,9 @@ from pathlib import Path
 
 import pandas as pd
 
+from olympics_data_project.data_cleaning import parquet_store, schema
+from olympics_data_project.data_cleaning.instrumentation import stage
+
 # Get the current script's directory
 base_dir = Path(__file__).parent
 # convert the path to the project directory
@@ -15,24 +18,30 @@ SWIMMING_DATA_PATH = (
 )
 
 
+@stage
 def extract_swimming_data(file_path: str) -> pd.DataFrame:
     """Extracts swimming data from the all olympics data csv file.
 
     Args:
-        file_path (str): file path to the all olympics data csv file.
+        file_path (str): file path to the all olympics data csv file, or to
+            the Parquet dataset to only read the swimming partitions.
 
     Returns:
         pd.DataFrame: A dataframe with only swimming data.
     """
 
     # load the all olympics data
-    all_data = pd.read_csv(file_path)
+    if Path(file_path).is_dir():
+        all_data = parquet_store.read_olympics(file_path, sports=["Swimming"])
+    else:
+        all_data = schema.read_csv(file_path)
     # filter out only swimming data
     swimming_data = all_data[all_data["Sport"].str.lower() == "swimming"]
 
     return swimming_data
 
 
+@stage
 def standardize_event_names(swimming_data: pd.DataFrame) -> pd.DataFrame:
     """Standardize the event names in the swimming data."""
 
@@ -58,6 +67,7 @@ def standardize_event_names(swimming_data: pd.DataFrame) -> pd.DataFrame:
     return swimming_data
 
 
+@stage
 def assign_gender(swimming_data: pd.DataFrame) -> pd.DataFrame:
     """Assign the gender category to the swimming data.
     Extract the string of men or women or mixed from the event name and assign
@@ -73,6 +83,7 @@ def assign_gender(swimming_data: pd.DataFrame) -> pd.DataFrame:
     return swimming_data
 
 
+@stage
 def remove_gender_from_event(swimming_data: pd.DataFrame) -> pd.DataFrame:
     """Remove Men, Women, or Mixed from the event name in the swimming data."""
 
@@ -86,6 +97,7 @@ def remove_gender_from_event(swimming_data: pd.DataFrame) -> pd.DataFrame:
     return swimming_data
 
 
+@stage
 def remove_apostrophes(swimming_data: pd.DataFrame) -> pd.DataFrame:
     """Remove apostrophes from the event names in the swimming data."""
 
@@ -96,6 +108,7 @@ def remove_apostrophes(swimming_data: pd.DataFrame) -> pd.DataFrame:
     return swimming_data
 
 
+@stage
 def add_meters_to_event_name(swimming_data: pd.DataFrame) -> pd.DataFrame:
     """Add meters (m) to the event name if it is missing in the swimming data."""
 
@@ -111,6 +124,7 @@ def add_meters_to_event_name(swimming_data: pd.DataFrame) -> pd.DataFrame:
     return swimming_data
 
 
+@stage
 def rename_10km_event(swimming_data: pd.DataFrame) -> pd.DataFrame:
     """Rename the 10 kilom event to 10km open water in the swimming data."""
 
@@ -122,6 +136,7 @@ def rename_10km_event(swimming_data: pd.DataFrame) -> pd.DataFrame:
     return swimming_data
 
 
+@stage
 def replace_meters_with_yards(swimming_data: pd.DataFrame) -> pd.DataFrame:
     """If the event name has yard in it, replace the m with yds in the swimming data."""
 
@@ -137,6 +152,7 @@ def replace_meters_with_yards(swimming_data: pd.DataFrame) -> pd.DataFrame:
     return swimming_data
 
 
+@stage
 def capitalize_events(swimming_data: pd.DataFrame) -> pd.DataFrame:
     """Capitalize the event names in the swimming data."""
 
@@ -145,6 +161,7 @@ def capitalize_events(swimming_data: pd.DataFrame) -> pd.DataFrame:
     return swimming_data
 
 
+@stage
 def remove_athletes_from_relay(df: pd.DataFrame) -> pd.DataFrame:
     """Remove any individual athletes from relay results and
     remove any duplicate rows of countries for a relay medal.
@@ -171,7 +188,8 @@ def remove_athletes_from_relay(df: pd.DataFrame) -> pd.DataFrame:
                 "Sport",
                 "Event",
                 "Medal",
-            ]
+            ],
+            observed=True,
         )
         .size()
         .reset_index(name="Medal_Count")
@@ -386,4 +404,4 @@ if __name__ == "__main__":
     swimming_data = capitalize_events(swimming_data)
     swimming_data = remove_athletes_from_relay(swimming_data)
     # save the data
-    swimming_data.to_csv(SWIMMING_DATA_PATH, index=False)
+    schema.save_csv(swimming_data, SWIMMING_DATA_PATH)
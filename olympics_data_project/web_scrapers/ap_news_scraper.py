@@ -3,26 +3,26 @@
 
 import json
 
-import requests
-from bs4 import BeautifulSoup
+from olympics_data_project.web_scrapers.html_parsing import AP_NEWS_STRAINER, make_soup
+from olympics_data_project.web_scrapers.http_client import fetch, print_fetch_stats
 
 AP_NEWS_URL = "https://apnews.com/article/olympics-2024-medal-winners-today-b9522fd1223ae6599569ffe1ee48cc62"
 
 
-def scrape_ap_news(url):
-    """Scrape the AP News Paris 2024 Olympic results
+def parse_ap_news(html) -> dict:
+    """Parse the <h2> and <p> tags of the AP News story body.
+
+    Only the div with class RichTextStoryBody is built into a tree,
+    the rest of the page is skipped while parsing.
+
     Args:
-        url (str): The URL of the AP News website
+        html (str or bytes): the html of the AP News page.
+
     Returns:
-        dict: the <h2> and <p> tags from the website
-            which contains the important information.
+        dict: the text of the <h2> and <p> tags with keys h2 and p.
     """
-    # comfirm the connection to the website
-    response = requests.get(url)
-    assert response.status_code == 200
-
     # get the class = RichTextStoryBody
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = make_soup(html, parse_only=AP_NEWS_STRAINER)
     text = soup.find_all("div", class_="RichTextStoryBody")
 
     # get all the data in <h2> and <p> tags
@@ -34,11 +34,29 @@ def scrape_ap_news(url):
         for p in tags.find_all("p"):
             p_tags.append(p.text)
 
-    assert len(h2_tags) == 337
-    assert len(p_tags) == 1138
-
     # combine the data in <h2> and <p> tags
-    paris_data = {"h2": h2_tags, "p": p_tags}
+    return {"h2": h2_tags, "p": p_tags}
+
+
+def scrape_ap_news(url, check_counts: bool = True):
+    """Scrape the AP News Paris 2024 Olympic results
+    Args:
+        url (str): The URL of the AP News website
+        check_counts (bool): check the number of tags of the finished
+            article, turn off while the Games are still going on.
+    Returns:
+        dict: the <h2> and <p> tags from the website
+            which contains the important information.
+    """
+    # comfirm the connection to the website
+    response = fetch(url)
+    assert response.status_code == 200
+
+    paris_data = parse_ap_news(response.text)
+
+    if check_counts:
+        assert len(paris_data["h2"]) == 337
+        assert len(paris_data["p"]) == 1138
 
     # save the data to a json file
     with open("data/raw/paris2024_results.json", "w") as file:
@@ -48,3 +66,4 @@ def scrape_ap_news(url):
 if __name__ == "__main__":
     scrape_ap_news(AP_NEWS_URL)
     print("AP News Paris Olympic data has been scraped and saved successfully.")
+    print_fetch_stats()
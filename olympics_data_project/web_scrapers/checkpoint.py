@@ -0,0 +1,75 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+# Get the current script's directory
+base_dir = Path(__file__).parent
+# convert the path to the project directory
+project_dir = base_dir.parent
+
+# Construct the path to the crawl checkpoints
+CHECKPOINT_DIR = project_dir / "data" / "checkpoints"
+
+
+class JsonlCheckpoint:
+    """Append-only JSON lines file of the items a scraper has finished.
+
+    Each line is {"key": ..., "value": ...}. Lines are flushed to disk as soon
+    as they are written so a crash loses at most the item being scraped, and
+    a restarted crawl can skip the keys that are already saved.
+
+    Example:
+        checkpoint = JsonlCheckpoint(CHECKPOINT_DIR / "tokyo2020_medals.jsonl")
+        for url in urls:
+            if url not in checkpoint.keys():
+                checkpoint.append(url, scrape(url))
+        results = checkpoint.compact()
+        checkpoint.remove()
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._repair()
+
+    def _repair(self) -> None:
+        """Drop a partial last line left by a crash in the middle of a write."""
+        if not self.path.exists():
+            return
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def records(self):
+        """Yield the saved (key, value) pairs one line at a time."""
+        if not self.path.exists():
+            return
+        with open(self.path) as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record["key"], record["value"]
+
+    def keys(self) -> set:
+        """Return the keys that are already saved."""
+        return {key for key, _ in self.records()}
+
+    def append(self, key, value) -> None:
+        """Save the value of a finished item."""
+        line = json.dumps({"key": key, "value": value}) + "\n"
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def compact(self) -> dict:
+        """Return the saved values by key, the last saved value of a key wins."""
+        return dict(self.records())
+
+    def remove(self) -> None:
+        """Delete the checkpoint once its results have been finalised."""
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,67 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+# default number of pages fetched at the same time
+MAX_WORKERS = 8
+# default number of seconds between two requests to the same host
+POLITENESS_DELAY = 0.5
+
+
+class HostThrottle:
+    """Keep a minimum delay between requests sent to the same host.
+
+    Each call to wait() reserves the next free time slot for the host of
+    the url and sleeps until that slot. It is safe to share between threads.
+    """
+
+    def __init__(self, delay: float = POLITENESS_DELAY):
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url: str) -> None:
+        """Block until a request to the host of the url is allowed."""
+        if self.delay <= 0:
+            return
+
+        host = urlparse(url).netloc
+
+        # reserve the next slot for the host
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.delay
+
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def map_concurrently(
+    func, urls: list, max_workers: int = MAX_WORKERS, delay: float = POLITENESS_DELAY
+) -> list:
+    """Call func on each url using a pool of threads.
+
+    Args:
+        func (callable): function that takes a url and returns its result.
+        urls (list): the urls to process.
+        max_workers (int): the maximum number of urls processed at the same time.
+            A value of 1 processes the urls one after another.
+        delay (float): the minimum number of seconds between two requests
+            to the same host.
+
+    Returns:
+        list: the results of func in the same order as the urls.
+    """
+    throttle = HostThrottle(delay)
+
+    def task(url):
+        throttle.wait(url)
+        return func(url)
+
+    if max_workers <= 1:
+        return [task(url) for url in urls]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(task, urls))
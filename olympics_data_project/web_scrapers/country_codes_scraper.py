@@ -1,7 +1,8 @@
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 
+from olympics_data_project.web_scrapers.http_client import fetch, print_fetch_stats
+
 FILE_PATH = "data/raw/country_codes.csv"
 IBAN_URL = "https://www.iban.com/country-codes"
 
@@ -32,7 +33,7 @@ def scrape_iban_website(url: str) -> dict:
             ...
     """
     # Send a GET request to the IBAN website
-    response = requests.get(url)
+    response = fetch(url)
 
     assert response.status_code == 200, "Failed to fetch web page"
 
@@ -84,3 +85,4 @@ if __name__ == "__main__":
     country_codes_df = convert_country_codes_to_df(country_codes)
     save_country_codes(country_codes_df, FILE_PATH)
     print("Country codes saved to data/raw/country_codes.csv")
+    print_fetch_stats()
@@ -0,0 +1,53 @@
+import importlib.util
+import os
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# environment variable to force a parser backend, such as "html.parser"
+PARSER_ENV_VAR = "SCRAPER_HTML_PARSER"
+
+# only keep the AP News story body, the class attribute is matched
+# as a whole string while parsing so look for the class as a word
+AP_NEWS_STRAINER = SoupStrainer(
+    "div", class_=re.compile(r"(^|\s)RichTextStoryBody(\s|$)")
+)
+# only keep the headings and tables of an Olympedia page
+MEDALS_STRAINER = SoupStrainer(["h2", "table"])
+
+
+def available_parsers() -> list:
+    """Return the BeautifulSoup parser backends that are installed,
+    fastest first."""
+    parsers = []
+    if importlib.util.find_spec("lxml") is not None:
+        parsers.append("lxml")
+    parsers.append("html.parser")
+    return parsers
+
+
+def choose_parser() -> str:
+    """Choose the parser backend at runtime.
+
+    The SCRAPER_HTML_PARSER environment variable wins when it is set,
+    otherwise lxml is used if it is installed, falling back to html.parser.
+    """
+    parser = os.environ.get(PARSER_ENV_VAR)
+    if parser:
+        return parser
+    return available_parsers()[0]
+
+
+def make_soup(markup, parse_only: SoupStrainer = None, parser: str = None):
+    """Parse html, only building the parts of the tree kept by the strainer.
+
+    Args:
+        markup (str or bytes): the html to parse.
+        parse_only (SoupStrainer): the elements to keep. The whole document
+            is kept when it is None.
+        parser (str): the parser backend, chosen with choose_parser() if None.
+
+    Returns:
+        BeautifulSoup: the parsed document.
+    """
+    return BeautifulSoup(markup, parser or choose_parser(), parse_only=parse_only)
@@ -0,0 +1,323 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from olympics_data_project.web_scrapers.rate_limit import RateLimiter, RetryPolicy
+from olympics_data_project.web_scrapers.recorder import (
+    ARCHIVE_ENV_VAR,
+    FIXTURE_ARCHIVE,
+    HTTP_MODE_ENV_VAR,
+    LATENCY_ENV_VAR,
+    record_traffic,
+    replay_traffic,
+)
+
+# Get the current script's directory
+base_dir = Path(__file__).parent
+# convert the path to the project directory
+project_dir = base_dir.parent
+
+# Construct the path to the on-disk response cache
+CACHE_DIR = project_dir / "data" / "cache" / "http"
+
+# number of keep-alive connections kept open per host
+POOL_SIZE = 16
+# seconds to wait for a response
+TIMEOUT = 30
+
+
+class ResponseCache:
+    """Content-addressed on-disk cache of HTTP responses.
+
+    The body of each response is stored once under the sha256 of its content
+    in objects/, and index/ maps the sha256 of each url to the body hash and
+    the ETag and Last-Modified validators of the response.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.index_dir = self.cache_dir / "index"
+        self.objects_dir = self.cache_dir / "objects"
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+    def _index_path(self, url: str) -> Path:
+        return self.index_dir / (
+            hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json"
+        )
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def get(self, url: str) -> dict:
+        """Return the index entry of the url, or None if it is not cached."""
+        try:
+            with open(self._index_path(url)) as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        # the body may have been removed from the cache
+        if not self._object_path(entry["body"]).exists():
+            return None
+        return entry
+
+    def load_body(self, entry: dict) -> bytes:
+        """Load the body of a cached response."""
+        return self._object_path(entry["body"]).read_bytes()
+
+    def put(self, url: str, response: requests.Response) -> dict:
+        """Store a response and return its index entry."""
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()
+
+        object_path = self._object_path(digest)
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_write(object_path, content)
+
+        entry = {
+            "url": url,
+            "body": digest,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_type": response.headers.get("Content-Type"),
+            "encoding": response.encoding,
+            "stored_at": time.time(),
+        }
+        self._write_entry(url, entry)
+        return entry
+
+    def touch(self, url: str, entry: dict) -> None:
+        """Mark a cached response as just revalidated."""
+        entry["stored_at"] = time.time()
+        self._write_entry(url, entry)
+
+    def _write_entry(self, url: str, entry: dict) -> None:
+        _atomic_write(self._index_path(url), json.dumps(entry).encode("utf-8"))
+
+
+class HttpClient:
+    """A pooled requests session with an optional on-disk response cache.
+
+    Cached pages are revalidated with If-None-Match / If-Modified-Since so an
+    unchanged page costs a 304. Pages fetched less than max_age seconds ago
+    are served from the cache without any request.
+
+    Requests that reach the network wait for the rate limiter of their host,
+    and connection errors and 429/5xx responses are retried following the
+    retry policy.
+    """
+
+    def __init__(
+        self,
+        cache_dir=CACHE_DIR,
+        max_age: float = 0.0,
+        pool_size: int = POOL_SIZE,
+        timeout: float = TIMEOUT,
+        rate_limiter: RateLimiter = None,
+        retry_policy: RetryPolicy = None,
+    ):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.max_age = max_age
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "retries": 0,
+            "throttled_seconds": 0.0,
+            "backoff_seconds": 0.0,
+        }
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request, using the cache when possible."""
+        kwargs.setdefault("timeout", self.timeout)
+
+        if self.cache is None:
+            self._count("misses")
+            return self._send(url, **kwargs)
+
+        entry = self.cache.get(url)
+
+        # a recent copy is returned without contacting the website
+        if entry and time.time() - entry["stored_at"] < self.max_age:
+            self._count("hits")
+            return self._cached_response(url, entry)
+
+        # ask the website to only send the page if it has changed
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self._send(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self._count("revalidated")
+            self.cache.touch(url, entry)
+            return self._cached_response(url, entry)
+
+        self._count("misses")
+        if response.status_code == 200:
+            self.cache.put(url, response)
+        return response
+
+    def cache_stats(self) -> dict:
+        """Return the number of cache hits, revalidations and misses."""
+        with self._lock:
+            return {key: self.stats[key] for key in ["hits", "revalidated", "misses"]}
+
+    def retry_stats(self) -> dict:
+        """Return the number of retries and the seconds spent waiting
+        for the rate limiter and backing off before retries."""
+        with self._lock:
+            return {
+                key: self.stats[key]
+                for key in ["retries", "throttled_seconds", "backoff_seconds"]
+            }
+
+    def _count(self, key: str, amount=1) -> None:
+        with self._lock:
+            self.stats[key] += amount
+
+    def _send(self, url: str, **kwargs) -> requests.Response:
+        """Send a request to the website, retrying failures."""
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self._count("throttled_seconds", self.rate_limiter.acquire(url))
+
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if not self.retry_policy.should_retry(attempt):
+                    raise
+                wait = self.retry_policy.backoff(attempt)
+            else:
+                if not self.retry_policy.should_retry(attempt, response.status_code):
+                    return response
+                wait = self.retry_policy.backoff(
+                    attempt, response.headers.get("Retry-After")
+                )
+                response.close()
+
+            self._count("retries")
+            self._count("backoff_seconds", wait)
+            time.sleep(wait)
+            attempt += 1
+
+    def _cached_response(self, url: str, entry: dict) -> requests.Response:
+        """Build a response object from a cache entry."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = self.cache.load_body(entry)
+        response.encoding = entry["encoding"]
+        for header, key in [
+            ("Content-Type", "content_type"),
+            ("ETag", "etag"),
+            ("Last-Modified", "last_modified"),
+        ]:
+            if entry[key]:
+                response.headers[header] = entry[key]
+        return response
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write a file so that readers never see a partial file."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+# the client shared by all the scrapers
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Return the shared client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = client_from_env()
+        return _client
+
+
+def client_from_env() -> HttpClient:
+    """Create the shared client for the mode in SCRAPER_HTTP_MODE.
+
+    record: fetch from the websites and save every response to the
+        archive in SCRAPER_FIXTURE_ARCHIVE.
+    replay: answer from the archive without any network access, delaying
+        each response by SCRAPER_REPLAY_LATENCY seconds. A url missing from
+        the archive raises ReplayMiss, which is not retried.
+    Any other value fetches from the websites with the cache and rate limiter.
+    """
+    mode = os.environ.get(HTTP_MODE_ENV_VAR, "")
+    archive_path = os.environ.get(ARCHIVE_ENV_VAR, FIXTURE_ARCHIVE)
+
+    if mode == "replay":
+        # the archive already holds the pages, so skip the cache and rate limit
+        client = HttpClient(cache_dir=None)
+        latency = float(os.environ.get(LATENCY_ENV_VAR, 0))
+        replay_traffic(client.session, archive_path, latency=latency)
+        return client
+
+    if mode == "record":
+        # skip the cache so every page is recorded in full, not as a 304
+        client = HttpClient(cache_dir=None, rate_limiter=RateLimiter())
+        record_traffic(
+            client.session,
+            archive_path,
+            pool_connections=POOL_SIZE,
+            pool_maxsize=POOL_SIZE,
+        )
+        return client
+
+    return HttpClient(rate_limiter=RateLimiter())
+
+
+def set_client(client: HttpClient) -> None:
+    """Replace the shared client, for example to change the cache settings."""
+    global _client
+    with _client_lock:
+        _client = client
+
+
+def fetch(url: str, **kwargs) -> requests.Response:
+    """GET a url through the shared client."""
+    return get_client().get(url, **kwargs)
+
+
+def print_fetch_stats() -> None:
+    """Print the cache, retry and throttling counts of the shared client."""
+    stats = get_client().cache_stats()
+    print(
+        f"HTTP cache: {stats['hits']} hits, {stats['revalidated']} revalidated (304), "
+        f"{stats['misses']} misses"
+    )
+    stats = get_client().retry_stats()
+    print(
+        f"HTTP retries: {stats['retries']}, "
+        f"{stats['throttled_seconds']:.1f}s throttled, "
+        f"{stats['backoff_seconds']:.1f}s backing off"
+    )
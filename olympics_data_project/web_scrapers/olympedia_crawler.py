@@ -0,0 +1,327 @@
+# crawl the medal results of every Summer and Winter Olympics on Olympedia
+# https://www.olympedia.org/editions
+
+import json
+import os
+import queue
+import re
+import threading
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from olympics_data_project.web_scrapers.concurrency import (
+    MAX_WORKERS,
+    POLITENESS_DELAY,
+    HostThrottle,
+)
+from olympics_data_project.web_scrapers.http_client import fetch, print_fetch_stats
+from olympics_data_project.web_scrapers.tokyo2020_medals_scraper import (
+    parse_events_medals,
+)
+from olympics_data_project.web_scrapers.tokyo2020_scraper import (
+    LINK_BASE,
+    edition_result_url,
+    parse_sports_links,
+)
+
+# Get the current script's directory
+base_dir = Path(__file__).parent
+# convert the path to the project directory
+project_dir = base_dir.parent
+
+# Construct the path to store the raw medal results of each edition
+OLYMPEDIA_DIR = project_dir / "data" / "raw" / "olympedia"
+
+SEASONS = ("Summer", "Winter")
+
+# links to an edition look like /editions/61
+EDITION_HREF = re.compile(r"^/editions/(\d+)$")
+
+
+def parse_editions(html, link_base: str = LINK_BASE) -> list:
+    """Parse the Olympic editions from the Olympedia editions page.
+
+    The page has one table per kind of Games, each after a <h2> heading
+    such as "Summer Olympics". Each row links to the edition with the year
+    as the link text, followed by a cell with the host city.
+
+    Args:
+        html (str or bytes): the html of the editions page.
+        link_base (str): the website the relative links are joined to.
+
+    Returns:
+        list: a dictionary per edition with the keys
+            edition_id, year, season, city and url.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    editions = []
+    for h2 in soup.find_all("h2"):
+        # only keep the Summer and Winter Olympics tables
+        season = next((s for s in SEASONS if s in h2.get_text()), None)
+        table = h2.find_next("table")
+        if season is None or table is None:
+            continue
+
+        for row in table.find_all("tr"):
+            link = row.find("a", href=EDITION_HREF)
+            if link is None:
+                continue
+            cells = link.find_parent("td").find_next_siblings("td")
+            editions.append(
+                {
+                    "edition_id": int(EDITION_HREF.match(link["href"]).group(1)),
+                    "year": int(link.get_text(strip=True)),
+                    "season": season,
+                    "city": cells[0].get_text(strip=True) if cells else "",
+                    "url": edition_result_url(
+                        EDITION_HREF.match(link["href"]).group(1), link_base
+                    ),
+                }
+            )
+
+    return editions
+
+
+def edition_file_name(edition: dict) -> str:
+    """Return the raw file name of an edition, such as 2020_summer_tokyo_medals.json"""
+    city = re.sub(r"[^a-z0-9]+", "_", edition["city"].lower()).strip("_")
+    return f"{edition['year']}_{edition['season'].lower()}_{city}_medals.json"
+
+
+class OlympediaCrawler:
+    """Crawl the medal results of many Olympic editions with a pool of workers.
+
+    Each edition results page is fetched to find its sport pages, and each
+    sport page is fetched to get the medal results of its events. The pages
+    go through one work queue shared by max_workers threads, a url is only
+    fetched once, and requests to the same host are spaced by delay seconds.
+
+    When the last sport of an edition is scraped, the edition is written to
+    out_dir in the same format as tokyo2020_medals.json, and editions.json
+    lists the editions and their files, including the ones written by
+    earlier crawls. An edition with a sport page that failed is not written
+    or listed, so the next crawl fetches it again.
+    """
+
+    def __init__(
+        self,
+        out_dir=OLYMPEDIA_DIR,
+        link_base: str = LINK_BASE,
+        max_workers: int = MAX_WORKERS,
+        delay: float = POLITENESS_DELAY,
+        seasons: tuple = SEASONS,
+    ):
+        self.out_dir = Path(out_dir)
+        self.link_base = link_base
+        self.max_workers = max_workers
+        self.throttle = HostThrottle(delay)
+        self.seasons = seasons
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._seen_urls = set()
+        self._editions = {}
+        self.errors = []
+
+    def discover_editions(self) -> list:
+        """Return the Summer and Winter editions listed on the editions page."""
+        response = self._get(self.link_base + "/editions")
+        editions = parse_editions(response.content, self.link_base)
+        return [e for e in editions if e["season"] in self.seasons]
+
+    def crawl(self, editions: list = None) -> dict:
+        """Crawl the editions and write one raw medals file per edition.
+
+        Args:
+            editions (list): the editions to crawl, the editions found by
+                discover_editions() that are not in editions.json yet if None.
+
+        Returns:
+            dict: the edition ids as keys and the written file paths as values.
+        """
+        if editions is None:
+            done = self._read_index()
+            editions = [
+                edition
+                for edition in self.discover_editions()
+                if edition_file_name(edition) not in done
+            ]
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        for edition in editions:
+            self._submit(("edition", edition))
+
+        workers = [
+            threading.Thread(target=self._work, daemon=True)
+            for _ in range(max(1, self.max_workers))
+        ]
+        for worker in workers:
+            worker.start()
+
+        # wait for the queue to be empty, then stop the workers
+        self._queue.join()
+        for _ in workers:
+            self._queue.put(None)
+        for worker in workers:
+            worker.join()
+
+        self._write_index()
+        return {
+            edition_id: state["path"]
+            for edition_id, state in self._editions.items()
+            if state["path"] is not None
+        }
+
+    def _submit(self, task: tuple) -> bool:
+        """Queue a task unless its url has already been queued."""
+        url = task[1]["url"]
+        with self._lock:
+            if url in self._seen_urls:
+                return False
+            self._seen_urls.add(url)
+        self._queue.put(task)
+        return True
+
+    def _work(self) -> None:
+        while True:
+            task = self._queue.get()
+            if task is None:
+                self._queue.task_done()
+                return
+            try:
+                self._run(task)
+            except Exception as error:
+                print(f"Failed to crawl {task[1]['url']}: {error}")
+                with self._lock:
+                    self.errors.append((task[1]["url"], repr(error)))
+            finally:
+                self._queue.task_done()
+
+    def _run(self, task: tuple) -> None:
+        if task[0] == "edition":
+            self._crawl_edition(task[1])
+            return
+
+        # the sport is done even when its page fails, so the edition is
+        # finished, and a failed sport leaves the edition incomplete
+        medals = None
+        try:
+            medals = self._crawl_sport(task[1])
+        finally:
+            self._sport_done(task[1], medals)
+
+    def _get(self, url: str):
+        self.throttle.wait(url)
+        response = fetch(url)
+        response.raise_for_status()
+        return response
+
+    def _crawl_edition(self, edition: dict) -> None:
+        response = self._get(edition["url"])
+        links = parse_sports_links(response.content, self.link_base) or []
+
+        # if the url has editions then it is a sport category, not an event link
+        sports = [
+            (link["text"], link["href"]) for link in links if "editions" in link["href"]
+        ]
+
+        # a sport page listed more than once is only fetched once
+        indexes_by_url = {}
+        for index, (_, sport_url) in enumerate(sports):
+            indexes_by_url.setdefault(sport_url, []).append(index)
+
+        with self._lock:
+            self._editions[edition["edition_id"]] = {
+                "edition": edition,
+                "sports": sports,
+                "results": {},
+                "pending": len(indexes_by_url),
+                "failed": 0,
+                "path": None,
+            }
+
+        if not sports:
+            self._write_edition(edition["edition_id"])
+
+        for sport_url, indexes in indexes_by_url.items():
+            task = {
+                "url": sport_url,
+                "edition_id": edition["edition_id"],
+                "indexes": indexes,
+            }
+            if not self._submit(("sport", task)):
+                self._sport_done(task, {})
+
+    def _crawl_sport(self, task: dict) -> dict:
+        response = self._get(task["url"])
+        return parse_events_medals(response.content)
+
+    def _sport_done(self, task: dict, medals: dict) -> None:
+        """Store the medals of a sport, None if its page failed, and write
+        the edition when it is complete."""
+        with self._lock:
+            state = self._editions[task["edition_id"]]
+            for index in task["indexes"]:
+                state["results"][index] = medals or {}
+            state["failed"] += medals is None
+            state["pending"] -= 1
+            complete = state["pending"] == 0
+        if complete:
+            self._write_edition(task["edition_id"])
+
+    def _write_edition(self, edition_id: int) -> None:
+        state = self._editions[edition_id]
+        if state["failed"]:
+            print(
+                f"Not saving {edition_file_name(state['edition'])}, "
+                f"{state['failed']} sport pages failed"
+            )
+            return
+
+        # keep the sports in the same order as the links
+        medals = {
+            sport_name: state["results"].get(index, {})
+            for index, (sport_name, _) in enumerate(state["sports"])
+        }
+
+        path = self.out_dir / edition_file_name(state["edition"])
+        with open(path, "w") as f:
+            json.dump(medals, f, indent=4)
+        state["path"] = path
+        print(f"Medal results saved to {path}")
+
+    def _read_index(self) -> dict:
+        """Return the editions in editions.json with their file names as keys."""
+        index_path = self.out_dir / "editions.json"
+        if not index_path.exists():
+            return {}
+        with open(index_path) as f:
+            return {edition["file"]: edition for edition in json.load(f)}
+
+    def _write_index(self) -> None:
+        """Add the editions written by this crawl to editions.json."""
+        index_path = self.out_dir / "editions.json"
+        index = self._read_index()
+
+        # an edition crawled again replaces its previous entry
+        for state in self._editions.values():
+            if state["path"] is not None:
+                edition = dict(state["edition"], file=state["path"].name)
+                index[edition["file"]] = edition
+
+        editions = sorted(
+            index.values(), key=lambda edition: (edition["year"], edition["season"])
+        )
+        tmp_path = index_path.with_name(f"editions.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(editions, f, indent=4)
+        os.replace(tmp_path, index_path)
+
+
+if __name__ == "__main__":
+    crawler = OlympediaCrawler()
+    files = crawler.crawl()
+    print(f"Crawled {len(files)} Olympic editions, {len(crawler.errors)} pages failed")
+    print_fetch_stats()
@@ -1,8 +1,9 @@
 import json
 
-import requests
 from bs4 import BeautifulSoup
 
+from olympics_data_project.web_scrapers.http_client import fetch, print_fetch_stats
+
 # URL to scrape
 BASE_URL = "https://www.lemonde.fr/en/sport/jo-2024/results/"
 
@@ -20,7 +21,7 @@ def get_paris_results(url):
     medal_results = {}
 
     # Send a GET request to the URL
-    response = requests.get(url)
+    response = fetch(url)
 
     # Check if the request was successful
     if response.status_code == 200:
@@ -89,3 +90,4 @@ if __name__ == "__main__":
         json.dump(paris_results, f, indent=4)
 
     print("Medal results saved to data/raw/paris2024_medals.json")
+    print_fetch_stats()
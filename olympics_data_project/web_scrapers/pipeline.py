@@ -0,0 +1,239 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from olympics_data_project.web_scrapers.concurrency import (
+    MAX_WORKERS,
+    POLITENESS_DELAY,
+    HostThrottle,
+)
+from olympics_data_project.web_scrapers.http_client import fetch
+
+# default number of processes parsing pages, one per cpu
+PARSE_WORKERS = os.cpu_count() or 1
+# default number of fetched pages waiting for, or being, parsed
+QUEUE_SIZE = 16
+
+
+def _timed_parse(parse, content: bytes) -> tuple:
+    """Parse a page in a worker process and time it."""
+    start = time.perf_counter()
+    result = parse(content)
+    return result, time.perf_counter() - start
+
+
+class StageStats:
+    """Count the items and busy time of one stage of the pipeline."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.bytes = 0
+        self.busy_seconds = 0.0
+        self.wall_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float, size: int = 0) -> None:
+        with self._lock:
+            self.items += 1
+            self.bytes += size
+            self.busy_seconds += seconds
+
+    def throughput(self) -> float:
+        """Return the items per second of wall time."""
+        return self.items / self.wall_seconds if self.wall_seconds else 0.0
+
+    def __str__(self) -> str:
+        size = f", {self.bytes / 1024:.0f} KiB" if self.bytes else ""
+        return (
+            f"{self.name}: {self.items} pages{size}, "
+            f"{self.throughput():.1f} pages/s, {self.busy_seconds:.2f}s busy"
+        )
+
+
+class FetchParsePipeline:
+    """Fetch pages with a pool of threads and parse them with a pool of processes.
+
+    The fetch threads put the raw bytes of each page on a bounded queue. The
+    pages are handed to the process pool from that queue, with at most
+    queue_size pages queued or being parsed, so the fetchers wait when the
+    parsers fall behind and the memory used by pages stays bounded.
+
+    Args:
+        parse (callable): a module level function that takes the bytes of a
+            page and returns its result. It must be picklable.
+        fetch_workers (int): the number of threads fetching pages.
+        parse_workers (int): the number of processes parsing pages. A value
+            of 0 parses the pages in the calling thread.
+        queue_size (int): the maximum number of fetched pages not yet parsed.
+        delay (float): the minimum number of seconds between two requests
+            to the same host.
+    """
+
+    def __init__(
+        self,
+        parse,
+        fetch_workers: int = MAX_WORKERS,
+        parse_workers: int = PARSE_WORKERS,
+        queue_size: int = QUEUE_SIZE,
+        delay: float = POLITENESS_DELAY,
+    ):
+        self.parse = parse
+        self.fetch_workers = max(1, fetch_workers)
+        self.parse_workers = parse_workers
+        self.queue_size = max(1, queue_size)
+        self.throttle = HostThrottle(delay)
+
+        self.fetch_stats = StageStats("fetch")
+        self.parse_stats = StageStats("parse")
+        self.max_queued = 0
+        self.errors = []
+
+    def run(self, urls: list, on_result=None, keep_results: bool = True) -> list:
+        """Fetch and parse the urls.
+
+        Args:
+            urls (list): the pages to scrape.
+            on_result (callable): called with the url and the result of each
+                page as soon as it is parsed, from the calling thread.
+            keep_results (bool): keep the results to return them. Turn off
+                when on_result saves them so they are not held in memory.
+
+        Returns:
+            list: the parse results in the same order as the urls, None for
+                the pages that could not be fetched or parsed, or for every
+                page if keep_results is False.
+        """
+        results = [None] * len(urls)
+        pages = queue.Queue(maxsize=self.queue_size)
+        # pages queued plus pages being parsed
+        slots = threading.Semaphore(self.queue_size)
+        todo = queue.Queue()
+        for index, url in enumerate(urls):
+            todo.put((index, url))
+
+        start = time.perf_counter()
+        fetchers = [
+            threading.Thread(target=self._fetch_pages, args=(todo, pages, slots))
+            for _ in range(self.fetch_workers)
+        ]
+        for fetcher in fetchers:
+            fetcher.start()
+
+        def store(index, url, result):
+            if keep_results:
+                results[index] = result
+            if on_result is not None:
+                on_result(url, result)
+
+        executor = None
+        if self.parse_workers > 0:
+            executor = ProcessPoolExecutor(max_workers=self.parse_workers)
+        try:
+            self._parse_pages(pages, slots, executor, store, len(fetchers))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            for fetcher in fetchers:
+                fetcher.join()
+
+        self.parse_stats.wall_seconds = time.perf_counter() - start
+        return results
+
+    def _fetch_pages(self, todo: queue.Queue, pages: queue.Queue, slots) -> None:
+        while True:
+            try:
+                index, url = todo.get_nowait()
+            except queue.Empty:
+                # tell the parse stage this fetcher is done
+                pages.put(None)
+                return
+
+            # wait for room before downloading so at most queue_size
+            # pages are held in memory
+            slots.acquire()
+            content = None
+            self.throttle.wait(url)
+            start = time.perf_counter()
+            try:
+                response = fetch(url)
+                if response.status_code == 200:
+                    content = response.content
+                else:
+                    self._error(url, f"status code {response.status_code}")
+            except Exception as error:
+                self._error(url, repr(error))
+            seconds = time.perf_counter() - start
+
+            if content is None:
+                slots.release()
+                continue
+            self.fetch_stats.add(seconds, len(content))
+            pages.put((index, url, content))
+            self.max_queued = max(self.max_queued, pages.qsize())
+
+    def _parse_pages(self, pages, slots, executor, store, n_fetchers: int) -> None:
+        start = time.perf_counter()
+        pending = []
+        finished_fetchers = 0
+
+        while finished_fetchers < n_fetchers:
+            # collect the pages that are parsed, in the calling thread
+            pending = self._collect(pending, store, wait=False)
+            try:
+                item = pages.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            if item is None:
+                finished_fetchers += 1
+                continue
+            index, url, content = item
+
+            if executor is None:
+                # a page that fails to parse must still free its slot, or the
+                # fetchers waiting for one never finish
+                try:
+                    self._store(index, url, _timed_parse(self.parse, content), store)
+                except Exception as error:
+                    self._error(url, repr(error))
+                finally:
+                    slots.release()
+                continue
+
+            future = executor.submit(_timed_parse, self.parse, content)
+            # free the slot as soon as the page is parsed
+            future.add_done_callback(lambda _: slots.release())
+            pending.append((index, url, future))
+
+        self.fetch_stats.wall_seconds = time.perf_counter() - start
+        self._collect(pending, store, wait=True)
+
+    def _collect(self, pending: list, store, wait: bool) -> list:
+        still_pending = []
+        for index, url, future in pending:
+            if not wait and not future.done():
+                still_pending.append((index, url, future))
+                continue
+            try:
+                self._store(index, url, future.result(), store)
+            except Exception as error:
+                self._error(url, repr(error))
+        return still_pending
+
+    def _store(self, index: int, url: str, timed_result: tuple, store) -> None:
+        result, seconds = timed_result
+        self.parse_stats.add(seconds)
+        store(index, url, result)
+
+    def _error(self, url: str, message: str) -> None:
+        print(f"Failed to scrape {url}: {message}")
+        self.errors.append((url, message))
+
+    def report(self) -> str:
+        """Return the throughput of each stage."""
+        return (
+            f"{self.fetch_stats}\n{self.parse_stats}\n"
+            f"at most {self.max_queued} pages waiting to be parsed"
+        )
@@ -0,0 +1,144 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# default number of requests per second allowed to each host
+DEFAULT_RATE = 4.0
+# default number of requests that can be sent at once before the rate applies
+DEFAULT_BURST = 4
+
+# responses that are worth trying again
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """A token bucket that refills at rate tokens per second up to capacity.
+
+    Each request takes one token, and waits for the bucket to refill when
+    it is empty. It is safe to share between threads.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until one is available.
+
+        Returns:
+            float: the number of seconds spent waiting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # take the token now, a negative balance is the wait for it
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """Give each host its own token bucket.
+
+    Args:
+        rate (float): the requests per second allowed for each host.
+        burst (int): the number of requests allowed at once.
+        host_rates (dict): the rate of specific hosts, such as
+            {"www.olympedia.org": 2.0}, overriding the default rate.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        host_rates: dict = None,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.host_rates = host_rates or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        """Wait for the host of the url to allow a request.
+
+        Returns:
+            float: the number of seconds spent waiting.
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate = self.host_rates.get(host, self.rate)
+                bucket = self._buckets[host] = TokenBucket(rate, self.burst)
+        return bucket.acquire()
+
+
+class RetryPolicy:
+    """When and how long to wait before sending a failed request again.
+
+    The wait doubles with each attempt, starting at backoff_base seconds and
+    capped at backoff_max, with full jitter so that many workers do not retry
+    at the same moment. A Retry-After header from the website is used instead
+    when it is present.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 60.0,
+        retry_statuses: tuple = RETRY_STATUSES,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+
+    def should_retry(self, attempt: int, status_code: int = None) -> bool:
+        """Check if a request should be sent again.
+
+        Args:
+            attempt (int): the number of retries already made.
+            status_code (int): the response status, None for a connection error.
+        """
+        if attempt >= self.max_retries:
+            return False
+        return status_code is None or status_code in self.retry_statuses
+
+    def backoff(self, attempt: int, retry_after: str = None) -> float:
+        """Return the number of seconds to wait before the next attempt."""
+        wait = parse_retry_after(retry_after)
+        if wait is not None:
+            return min(wait, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+
+def parse_retry_after(value: str) -> float:
+    """Convert a Retry-After header to a number of seconds.
+
+    The header is either a number of seconds or an HTTP date.
+    Returns None if the header is missing or can not be read.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
@@ -0,0 +1,153 @@
+import base64
+import gzip
+import json
+import random
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Get the current script's directory
+base_dir = Path(__file__).parent
+# convert the path to the project directory
+project_dir = base_dir.parent
+
+# Construct the path to the default archive of recorded traffic
+FIXTURE_ARCHIVE = project_dir / "data" / "fixtures" / "scraper_traffic.jsonl.gz"
+
+# environment variables to record or replay the traffic of the scrapers
+HTTP_MODE_ENV_VAR = "SCRAPER_HTTP_MODE"
+ARCHIVE_ENV_VAR = "SCRAPER_FIXTURE_ARCHIVE"
+LATENCY_ENV_VAR = "SCRAPER_REPLAY_LATENCY"
+
+
+class ReplayMiss(requests.RequestException):
+    """No response was recorded for the request.
+
+    It is not a ConnectionError, so the client fails at once instead of
+    retrying a request the archive can never answer.
+    """
+
+
+class FixtureArchive:
+    """A gzip compressed JSON lines file of request/response pairs.
+
+    Each recorded pair is written as its own gzip member, so the archive
+    is valid after every write and a recording can be extended later.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def append(self, request: requests.PreparedRequest, response) -> None:
+        """Save a request and the response it received."""
+        record = {
+            "method": request.method,
+            "url": request.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+            "body": base64.b64encode(response.content).decode("ascii"),
+        }
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(self.path, "ab") as f:
+                f.write(line)
+
+    def load(self) -> dict:
+        """Return the recorded responses by (method, url), in recording order."""
+        recorded = {}
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                key = (record["method"], record["url"])
+                recorded.setdefault(key, []).append(record)
+        return recorded
+
+
+class RecordingAdapter(HTTPAdapter):
+    """A pooled transport adapter that saves every response to an archive."""
+
+    def __init__(self, archive: FixtureArchive, **kwargs):
+        self.archive = archive
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        self.archive.append(request, response)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """A transport adapter that answers from an archive instead of the network.
+
+    The responses recorded for a url are replayed in order, repeating the last
+    one. Each response is delayed by latency seconds plus a random jitter to
+    imitate the website.
+    """
+
+    def __init__(
+        self, archive: FixtureArchive, latency: float = 0.0, jitter: float = 0.0
+    ):
+        super().__init__()
+        self.recorded = archive.load()
+        self.latency = latency
+        self.jitter = jitter
+        self._replayed = {}
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        key = (request.method, request.url)
+        with self._lock:
+            records = self.recorded.get(key)
+            if not records:
+                raise ReplayMiss(
+                    f"No recorded response for {request.method} {request.url}",
+                    request=request,
+                )
+            position = self._replayed.get(key, 0)
+            self._replayed[key] = position + 1
+        record = records[min(position, len(records) - 1)]
+
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        response = requests.Response()
+        response.status_code = record["status"]
+        response.reason = record["reason"]
+        response.headers = CaseInsensitiveDict(record["headers"])
+        response.encoding = record["encoding"]
+        response._content = base64.b64decode(record["body"])
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+def record_traffic(session: requests.Session, path, **adapter_kwargs) -> FixtureArchive:
+    """Save every response the session receives to the archive at path."""
+    archive = FixtureArchive(path)
+    adapter = RecordingAdapter(archive, **adapter_kwargs)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return archive
+
+
+def replay_traffic(
+    session: requests.Session, path, latency: float = 0.0, jitter: float = 0.0
+) -> ReplayAdapter:
+    """Answer the requests of the session from the archive at path."""
+    adapter = ReplayAdapter(FixtureArchive(path), latency=latency, jitter=jitter)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
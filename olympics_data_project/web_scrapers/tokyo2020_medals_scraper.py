@@ -1,8 +1,76 @@
 import json
 
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+
+from olympics_data_project.web_scrapers.checkpoint import (
+    CHECKPOINT_DIR,
+    JsonlCheckpoint,
+)
+from olympics_data_project.web_scrapers.html_parsing import MEDALS_STRAINER, make_soup
+from olympics_data_project.web_scrapers.http_client import fetch, print_fetch_stats
+from olympics_data_project.web_scrapers.concurrency import (
+    MAX_WORKERS,
+    POLITENESS_DELAY,
+    map_concurrently,
+)
+from olympics_data_project.web_scrapers.pipeline import FetchParsePipeline
+
+
+def parse_events_medals(html) -> dict:
+    """Parse the Medals table of an Olympedia sport page.
+
+    Only the <h2> and <table> elements are built into a tree,
+    the rest of the page is skipped while parsing.
+
+    Args:
+        html (str or bytes): the html of the sport page.
+
+    Returns:
+        dict: A dictionary containing the event names as keys and a list of medal winners as values.
+    """
+    # store the medals results in a dictionary
+    medals_dict = {}
+
+    soup = make_soup(html, parse_only=MEDALS_STRAINER)
+
+    # Find the <h2> tag with the exact text "Medals"
+    medals_h2 = soup.find("h2", string="Medals")
+
+    # Check if the <h2> tag is found
+    if medals_h2:
+        # Find the next <table> element after the <h2> tag
+        medals_table = medals_h2.find_next("table", class_="table table-striped")
+
+        # Check if the table is found
+        if medals_table:
+            # Find all <tr> tags within the table
+            rows = medals_table.find_all("tr")
+
+            # Iterate over each <tr> tag (each event)
+            for row in rows:
+                # Find all <a> tags within this <tr>
+                links = row.find_all("a")
+
+                # Group the event's href links and their text
+                event_data = []
+                for link in links:
+                    href = link.get("href")
+                    text = link.get_text(strip=True)
+                    event_data.append({"href": href, "text": text})
+
+                # Print the event data for each row
+                if event_data:
+                    for i, data in enumerate(event_data):
+                        if i == 0:
+                            medals_dict[data["text"]] = []
+                        else:
+                            medals_dict[event_data[0]["text"]].append(data["text"])
+        else:
+            print("No table found after the 'Medals' heading.")
+    else:
+        print("<h2> with text 'Medals' not found.")
+
+    return medals_dict
 
 
 def scrape_events_medals(url):
@@ -14,79 +82,118 @@ def scrape_events_medals(url):
         dict: A dictionary containing the event names as keys and a list of medal winners as values.
 
     """
-    # store the medals results in a dictionary
-    medals_dict = {}
-
     # Send a GET request to the URL
-    response = requests.get(url)
+    response = fetch(url)
 
     # Check if the request was successful
     if response.status_code == 200:
-        # Parse the HTML content with BeautifulSoup
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        # Find the <h2> tag with the exact text "Medals"
-        medals_h2 = soup.find("h2", string="Medals")
-
-        # Check if the <h2> tag is found
-        if medals_h2:
-            # Find the next <table> element after the <h2> tag
-            medals_table = medals_h2.find_next("table", class_="table table-striped")
-
-            # Check if the table is found
-            if medals_table:
-                # Find all <tr> tags within the table
-                rows = medals_table.find_all("tr")
-
-                # Iterate over each <tr> tag (each event)
-                for row in rows:
-                    # Find all <a> tags within this <tr>
-                    links = row.find_all("a")
-
-                    # Group the event's href links and their text
-                    event_data = []
-                    for link in links:
-                        href = link.get("href")
-                        text = link.get_text(strip=True)
-                        event_data.append({"href": href, "text": text})
-
-                    # Print the event data for each row
-                    if event_data:
-                        for i, data in enumerate(event_data):
-                            if i == 0:
-                                medals_dict[data["text"]] = []
-                            else:
-                                medals_dict[event_data[0]["text"]].append(data["text"])
-            else:
-                print("No table found after the 'Medals' heading.")
-        else:
-            print("<h2> with text 'Medals' not found.")
+        return parse_events_medals(response.content)
+
+    print(f"Failed to retrieve the webpage. Status code: {response.status_code}")
+    return {}
+
+
+def scrape_all_events_medals(
+    sports_links_df: pd.DataFrame,
+    max_workers: int = MAX_WORKERS,
+    delay: float = POLITENESS_DELAY,
+    checkpoint: JsonlCheckpoint = None,
+    parse_workers: int = 0,
+) -> dict:
+    """Scrape the medal results of every sport in the sports links.
+
+    With a checkpoint, each sport is appended to the checkpoint as soon as it
+    is scraped instead of being kept in memory, and the sports already in the
+    checkpoint are skipped. The returned dict is then read from the checkpoint.
+
+    Args:
+        sports_links_df (pd.DataFrame): the links with columns href and text.
+            Only the links with editions in the url are sport categories.
+        max_workers (int): the maximum number of sports scraped at the same time.
+        delay (float): the minimum number of seconds between two requests
+            to the same host.
+        checkpoint (JsonlCheckpoint): where to save the medal results of each
+            sport, keyed by the sport url.
+        parse_workers (int): the number of processes parsing the pages while
+            max_workers threads fetch them. A value of 0 fetches and parses
+            each page on the same thread.
+
+    Returns:
+        dict: the sport names as keys and the medal results of each event as values.
+    """
+
+    # if the url has editions then it is a sport category, not an event link
+    sport_links = [
+        (row.text, row.href)
+        for row in sports_links_df.itertuples()
+        if "editions" in row.href
+    ]
+    sport_urls = [sport_link for _, sport_link in sport_links]
+
+    # skip the sports that were scraped before a restart
+    if checkpoint is not None:
+        done = checkpoint.keys()
+        sport_urls = [url for url in dict.fromkeys(sport_urls) if url not in done]
+
+    def scrape_sport(sport_link):
+        print(f"Scraping medal results for {sport_link}...")
+        medal_results = scrape_events_medals(sport_link)
+        if checkpoint is None:
+            return medal_results
+        save_sport(sport_link, medal_results)
+
+    def save_sport(sport_link, medal_results):
+        # failed pages are empty and are not saved so they are retried
+        if checkpoint is not None and medal_results:
+            checkpoint.append(sport_link, medal_results)
+
+    if parse_workers > 0:
+        pipeline = FetchParsePipeline(
+            parse_events_medals,
+            fetch_workers=max_workers,
+            parse_workers=parse_workers,
+            delay=delay,
+        )
+        medal_results = pipeline.run(
+            sport_urls, on_result=save_sport, keep_results=checkpoint is None
+        )
+        print(pipeline.report())
     else:
-        print(f"Failed to retrieve the webpage. Status code: {response.status_code}")
+        medal_results = map_concurrently(
+            scrape_sport, sport_urls, max_workers=max_workers, delay=delay
+        )
 
-    return medals_dict
+    if checkpoint is not None:
+        # the results were only written to the checkpoint, read them back once
+        saved = checkpoint.compact()
+        return {
+            sport_name: saved.get(sport_link, {})
+            for sport_name, sport_link in sport_links
+        }
+
+    # keep the sports in the same order as the links
+    return {
+        sport_name: results or {}
+        for (sport_name, _), results in zip(sport_links, medal_results)
+    }
 
 
 if __name__ == "__main__":
     # load the links from the data/raw/tokyo2020_links.csv
     sports_links_df = pd.read_csv("./data/raw/tokyo2020_links.csv")
 
-    # create a dictionary to store the medal results
-    tokyo2020_medals = {}
+    # save each sport as it is scraped so a failed crawl can be restarted
+    checkpoint = JsonlCheckpoint(CHECKPOINT_DIR / "tokyo2020_medals.jsonl")
 
-    # iterate over the sports links
-    for row in sports_links_df.itertuples():
-        sport_name = row.text
-        sport_link = row.href
-
-        # if the url has editions then it is a sport category, not an event link
-        if "editions" in sport_link:
-            print(f"Scraping medal results for {sport_name}...")
-            medal_results = scrape_events_medals(sport_link)
-            tokyo2020_medals[sport_name] = medal_results
+    # scrape the medal results for every sport
+    tokyo2020_medals = scrape_all_events_medals(sports_links_df, checkpoint=checkpoint)
 
     # save the dictionary to a JSON file
     with open("./data/raw/tokyo2020_medals.json", "w") as f:
         json.dump(tokyo2020_medals, f, indent=4)
 
+    # the crawl is complete so the next run starts from scratch
+    checkpoint.remove()
+
     print("Medal results saved to data/raw/tokyo2020_medals.json")
+    print_fetch_stats()
@@ -1,54 +1,80 @@
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 
-# URL to scrape
-BASE_URL = "https://www.olympedia.org/editions/61/result"
+from olympics_data_project.web_scrapers.http_client import fetch, print_fetch_stats
+
 # Base URL for the links
 LINK_BASE = "https://www.olympedia.org"
+# Olympedia edition id of the Tokyo 2020 Olympics
+TOKYO_EDITION_ID = 61
+
+
+def edition_result_url(edition_id: int, link_base: str = LINK_BASE) -> str:
+    """Return the url of the results page of an Olympic edition."""
+    return f"{link_base}/editions/{edition_id}/result"
+
+
+# URL to scrape
+BASE_URL = edition_result_url(TOKYO_EDITION_ID)
+
+
+def parse_sports_links(html, link_base: str = LINK_BASE) -> list:
+    """Parse the links to the sports and events of an edition results page.
+
+    Args:
+        html (str or bytes): the html of the results page.
+        link_base (str): the website the relative links are joined to.
+
+    Returns:
+        list: a dictionary with the href and text of each link,
+            or None if the results table is not found.
+    """
+    # Parse the HTML content with BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Find the table with class 'table'
+    table = soup.find("table", class_="table")
 
+    # Check if table is found
+    if not table:
+        print("Table with class 'table' not found.")
+        return None
 
-def get_sports_links(url):
+    # Find all <a> tags within the table
+    links = table.find_all("a")
+
+    # Extract hrefs and their corresponding text
+    data = []
+    for link in links:
+        href = link.get("href")
+        # add the base to the href
+        href = link_base + href
+        text = link.get_text(strip=True)  # Strip whitespace from the text
+        data.append({"href": href, "text": text})
+
+    return data
+
+
+def get_sports_links(url, link_base: str = LINK_BASE):
     """Get the links to the sports from the given URL.
     Args:
         url (str): The base URL to scrape.
+        link_base (str): the website the relative links are joined to.
 
     Returns:
         pd.DataFrame: A DataFrame containing the hrefs and their corresponding text.
     """
 
     # Send a GET request to the URL
-    response = requests.get(url)
+    response = fetch(url)
 
     # Check if the request was successful
     if response.status_code == 200:
-        # Parse the HTML content with BeautifulSoup
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        # Find the table with class 'table'
-        table = soup.find("table", class_="table")
-
-        # Check if table is found
-        if table:
-            # Find all <a> tags within the table
-            links = table.find_all("a")
-
-            # Extract hrefs and their corresponding text
-            data = []
-            for link in links:
-                href = link.get("href")
-                # add the base to the href
-                href = LINK_BASE + href
-                text = link.get_text(strip=True)  # Strip whitespace from the text
-                data.append({"href": href, "text": text})
-
-            # Create a pandas DataFrame from the extracted data
-            df = pd.DataFrame(data)
-
-            # Return the DataFrame
-            return df
-        else:
-            print("Table with class 'table' not found.")
+        data = parse_sports_links(response.content, link_base)
+
+        # Create a pandas DataFrame from the extracted data
+        if data is not None:
+            return pd.DataFrame(data)
     else:
         print(f"Failed to retrieve the webpage. Status code: {response.status_code}")
 
@@ -59,3 +85,4 @@ if __name__ == "__main__":
 
     # save the DataFrame to a CSV file
     sports_links.to_csv("../data/raw/tokyo2020_links.csv", index=False)
+    print_fetch_stats()
@@ -0,0 +1,36 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+
+from olympics_data_project.web_scrapers import http_client
+from stub_server import StubServer
+
+
+@pytest.fixture(autouse=True)
+def isolated_http_client(tmp_path):
+    """Give each test its own shared HTTP client with a temporary cache."""
+    client = http_client.HttpClient(cache_dir=tmp_path / "http_cache")
+    http_client.set_client(client)
+    yield client
+    http_client.set_client(None)
+
+
+@pytest.fixture
+def stub_server():
+    """Start a local StubServer for a dictionary of pages.
+
+    Usage: server = stub_server({"/path": "<html>...</html>"}, latency=0.1)
+    """
+    servers = []
+
+    def start(pages: dict, latency: float = 0.0) -> StubServer:
+        server = StubServer(pages, latency=latency).start()
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.stop()
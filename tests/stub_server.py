@@ -0,0 +1,151 @@
+"""A local HTTP server that serves fixed pages, used by the scraper tests
+and benchmarks so they can run without a network connection."""
+
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubServer:
+    """Serve a dictionary of {path: html} from localhost.
+
+    Every response is delayed by latency seconds to imitate a remote site.
+    The server records each request, the status codes it sent and the
+    largest number of requests that were being handled at the same time.
+    Pages carry an ETag and a Last-Modified header, and a matching
+    conditional request is answered with a 304.
+
+    failures maps a path to a list of (status, headers) responses that are
+    sent, one per request, before the page itself is served.
+    """
+
+    LAST_MODIFIED = "Sat, 10 Aug 2024 12:00:00 GMT"
+
+    def __init__(self, pages: dict, latency: float = 0.0):
+        self.pages = pages
+        self.latency = latency
+        self.requests = []
+        self.statuses = []
+        self.failures = {}
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        """Return the full url of a path served by the stub."""
+        return self.base_url + path
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests.append((self.path, time.monotonic()))
+                    stub._in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub._in_flight)
+                try:
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                    with stub._lock:
+                        failures = stub.failures.get(self.path)
+                        failure = failures.pop(0) if failures else None
+                    if failure is not None:
+                        status, headers = failure
+                        self._send(status, headers=headers)
+                        return
+
+                    body = stub.pages.get(self.path)
+                    if body is None:
+                        self._send(404)
+                        return
+                    if isinstance(body, str):
+                        body = body.encode("utf-8")
+
+                    etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+                    if_none_match = self.headers.get("If-None-Match")
+                    if_modified_since = self.headers.get("If-Modified-Since")
+                    if if_none_match == etag or (
+                        if_none_match is None
+                        and if_modified_since == stub.LAST_MODIFIED
+                    ):
+                        self._send(304, etag=etag)
+                        return
+
+                    self._send(200, body, etag=etag)
+                finally:
+                    with stub._lock:
+                        stub._in_flight -= 1
+
+            def _send(self, status, body=b"", etag=None, headers=None):
+                with stub._lock:
+                    stub.statuses.append(status)
+                self.send_response(status)
+                for header, value in (headers or {}).items():
+                    self.send_header(header, value)
+                if etag:
+                    self.send_header("ETag", etag)
+                    self.send_header("Last-Modified", stub.LAST_MODIFIED)
+                if status != 304:
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def make_medals_page(events: dict) -> str:
+    """Build an Olympedia style sport page with a Medals table.
+
+    Args:
+        events (dict): the event names as keys and the list of
+            medal winners (athletes and NOCs) as values.
+
+    Returns:
+        str: the html of the page.
+    """
+    rows = []
+    for n, (event, winners) in enumerate(events.items()):
+        links = [f'<td><a href="/results/{n}">{event}</a></td>']
+        links += [
+            f'<td><a href="/athletes/{i}">{w}</a></td>' for i, w in enumerate(winners)
+        ]
+        rows.append("<tr>" + "".join(links) + "</tr>")
+
+    return (
+        "<html><body>"
+        "<h2>Results</h2><table class='table'><tr><td>ignored</td></tr></table>"
+        "<h2>Medals</h2>"
+        "<table class='table table-striped'>"
+        "<tr><th>Event</th><th>Gold</th><th>Silver</th><th>Bronze</th></tr>"
+        + "".join(rows)
+        + "</table></body></html>"
+    )
@@ -0,0 +1,73 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pandas as pd
+
+from olympics_data_project.web_scrapers.checkpoint import JsonlCheckpoint
+from olympics_data_project.web_scrapers.tokyo2020_medals_scraper import (
+    scrape_all_events_medals,
+)
+from stub_server import make_medals_page
+
+
+def test_append_and_compact(tmp_path):
+    checkpoint = JsonlCheckpoint(tmp_path / "crawl.jsonl")
+    checkpoint.append("a", {"x": [1]})
+    checkpoint.append("b", {"y": [2]})
+    checkpoint.append("a", {"x": [3]})
+
+    # a new object reads what is on disk
+    reopened = JsonlCheckpoint(tmp_path / "crawl.jsonl")
+    assert reopened.keys() == {"a", "b"}
+    assert reopened.compact() == {"a": {"x": [3]}, "b": {"y": [2]}}
+
+
+def test_partial_last_line_is_dropped(tmp_path):
+    path = tmp_path / "crawl.jsonl"
+    checkpoint = JsonlCheckpoint(path)
+    checkpoint.append("a", [1])
+    with open(path, "a") as f:
+        f.write('{"key": "b", "val')
+
+    checkpoint = JsonlCheckpoint(path)
+    checkpoint.append("c", [3])
+    assert checkpoint.compact() == {"a": [1], "c": [3]}
+
+
+def test_resume_medals_crawl(stub_server, tmp_path):
+    pages = {
+        "/editions/61/sports/SWM": make_medals_page(
+            {"100 metres Freestyle, Men": ["Caeleb Dressel", "USA"]}
+        ),
+        "/editions/61/sports/BK3": make_medals_page(
+            {"3x3 Basketball, Men": ["LAT", "ROC", "SRB"]}
+        ),
+    }
+    server = stub_server(dict(pages))
+    links_df = pd.DataFrame(
+        {
+            "href": [server.url(path) for path in pages],
+            "text": ["Swimming", "3x3 Basketball"],
+        }
+    )
+    expected = scrape_all_events_medals(links_df, max_workers=1, delay=0)
+
+    # the first crawl fails on the basketball page
+    del server.pages["/editions/61/sports/BK3"]
+    checkpoint = JsonlCheckpoint(tmp_path / "medals.jsonl")
+    partial = scrape_all_events_medals(
+        links_df, max_workers=1, delay=0, checkpoint=checkpoint
+    )
+    assert partial["3x3 Basketball"] == {}
+    assert checkpoint.keys() == {server.url("/editions/61/sports/SWM")}
+
+    # the restart only fetches the missing sport
+    server.pages["/editions/61/sports/BK3"] = pages["/editions/61/sports/BK3"]
+    server.requests.clear()
+    resumed = scrape_all_events_medals(
+        links_df, max_workers=2, delay=0, checkpoint=JsonlCheckpoint(checkpoint.path)
+    )
+    assert [path for path, _ in server.requests] == ["/editions/61/sports/BK3"]
+    assert resumed == expected
+    assert list(resumed) == ["Swimming", "3x3 Basketball"]
@@ -10,6 +10,7 @@ from olympics_data_project.data_cleaning.clean_kaggle_data import (
     remove_columns,
     FINAL_COLUMNS,
     remove_hyphen_numbers,
+    read_medal_rows,
 )
 
 
@@ -55,3 +56,25 @@ def test_remove_hyphen_numbers():
     assert (
         not df["Country"].str.contains(r"-\d").any()
     ), "Country names still contain hyphen numbers"
+
+
+def test_read_medal_rows(tmp_path):
+    path = tmp_path / "athlete_events.csv"
+    path.write_text(
+        "ID,Name,Sex,Team,NOC,Year,Season,City,Sport,Event,Medal\n"
+        "1,A,M,France,FRA,1900,Summer,Paris,Rowing,Eights,Gold\n"
+        "2,B,F,Canada,CAN,1988,Winter,Calgary,Skiing,Slalom,Silver\n"
+        "3,C,M,Italy,ITA,1900,Summer,Paris,Rowing,Eights,\n"
+        "4,D,F,Japan,JPN,1964,Summer,Tokyo,Judo,Open,Bronze\n"
+    )
+
+    df = read_medal_rows(path, chunksize=2)
+    assert list(df["Name"]) == ["A", "D"]
+    # the rows keep their line in the csv and only the used columns are read
+    assert list(df.index) == [0, 3]
+    assert "Sex" not in df.columns
+    assert df["Year"].dtype == "int64"
+    assert remove_columns(df).columns.tolist() == FINAL_COLUMNS
+
+    df = read_medal_rows(path, season=None)
+    assert list(df["Name"]) == ["A", "B", "D"]
@@ -2,6 +2,7 @@ import sys
 import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import numpy as np
 import pandas as pd
 import olympics_data_project.data_cleaning.clean_paris_data as cpd
 from olympics_data_project.data_cleaning.clean_paris_data import (
@@ -227,3 +228,185 @@ def test_convert_to_df():
     assert isinstance(df, pd.DataFrame)
     assert df.shape == (3, 3)
     assert df.columns.tolist() == ["Sport", "Medal Winners", "Event"]
+
+
+def test_adjust_event_and_sports():
+    """Test that each row gets the sport of the last header before it,
+    headers are matched in the order of the sports list"""
+    sport_list = ["ROWING", "SWIMMING", "ROWING"]
+    df = pd.DataFrame(
+        {
+            "Sport": [
+                "WOMEN’S 50M FREESTYLE",
+                "ROWING",
+                "MEN’S EIGHT",
+                "ROWING",
+                "SWIMMING",
+                "ROWING",
+                "WOMEN’S EIGHT",
+                "SWIMMING",
+            ]
+        }
+    )
+
+    df = cpd.adjust_event_and_sports(df, sport_list)
+    assert df["Sport"].tolist() == [
+        "ROWING",
+        "ROWING",
+        "ROWING",
+        "ROWING",
+        "SWIMMING",
+        "ROWING",
+        "ROWING",
+        "ROWING",
+    ]
+
+
+def test_convert_medal_list_to_df():
+    """Test that the medals are split into Gold, Silver and Bronze columns,
+    the last medal of a color wins and missing medals are None"""
+
+    df = pd.DataFrame(
+        {
+            "Sport": ["ATHLETICS", "BOXING", "WRESTLING"],
+            "Event": ["WOMEN’S MARATHON", "MEN’S 51KG", "MEN’S FREESTYLE 65KG"],
+            "Medal Winners": [
+                [
+                    "Gold: Netherlands (Sifan Hassan)",
+                    "Silver: Ethiopia (Tigst Assefa)",
+                    "Bronze: Kenya (Hellen Obiri)",
+                ],
+                [
+                    "Gold: Uzbekistan (Hasanboy Dusmatov)",
+                    "Silver: Colombia (Yuberjen Martinez)",
+                ],
+                [
+                    "Gold: Japan (Kiyooka Kotaro)",
+                    "Bronze: Albania (Islam Dudaev)",
+                    "Bronze: Puerto Rico (Sebastian Rivera)",
+                ],
+            ],
+        }
+    )
+
+    medals_df = cpd.convert_medal_list_to_df(df)
+    assert medals_df.columns.tolist() == [
+        "Sport",
+        "Event",
+        "Medal Winners",
+        "Gold",
+        "Silver",
+        "Bronze",
+        "Tie",
+    ]
+    assert medals_df["Gold"].tolist() == [
+        "Gold: Netherlands (Sifan Hassan)",
+        "Gold: Uzbekistan (Hasanboy Dusmatov)",
+        "Gold: Japan (Kiyooka Kotaro)",
+    ]
+    assert medals_df.loc[1, "Bronze"] is None
+    assert medals_df.loc[2, "Silver"] is None
+    assert medals_df.loc[2, "Bronze"] == "Bronze: Puerto Rico (Sebastian Rivera)"
+    assert medals_df["Tie"].tolist() == [None, None, None]
+
+
+def test_split_country_athlete():
+    """Test that the athlete and country are split for each format
+    used by AP News"""
+
+    df = pd.DataFrame(
+        {
+            "Athlete": [
+                "Tom Pidcock, Britain",
+                "Sifan Hassan, Netherlands",
+                "Yang, Liu",
+                "Julien Alfred, St. Lucia.",
+                "Netherlands (Sifan Hassan)",
+                "Britain (Emma Finucane)",
+                "United States",
+                None,
+            ]
+        }
+    )
+
+    split_df = cpd.split_country_athlete(df, COUNTRY_PATH)
+    assert split_df["Athlete"].tolist() == [
+        "Tom Pidcock",
+        "Sifan Hassan",
+        "Yang Liu",
+        "Julien Alfred",
+        "Sifan Hassan",
+        "Emma Finucane)",
+        "United States",
+        None,
+    ]
+    assert split_df["Country"].tolist() == [
+        "Great Britain",
+        "Netherlands",
+        "China",
+        "St. Lucia",
+        "Netherlands",
+        "Great Britain",
+        "United States",
+        None,
+    ]
+
+
+def test_stage_copy_on_write():
+    """Test that with copy on write a step shares the columns it does not
+    change and does not change its input"""
+    df = pd.DataFrame({"Country": ["Britain", "France"], "Athlete": ["A", "B"]})
+
+    with pd.option_context("mode.copy_on_write", True):
+        result = cpd.replace_some_country_names(df)
+
+        assert np.shares_memory(result["Athlete"].to_numpy(), df["Athlete"].to_numpy())
+        assert result["Country"].tolist() == ["Great Britain", "France"]
+        assert df["Country"].tolist() == ["Britain", "France"]
+
+
+def test_deal_with_ties():
+    """Test that each athlete of a tie gets a row, the athletes of a row
+    stop at the first athlete without a country"""
+    df = pd.DataFrame(
+        {
+            "Sport": ["WRESTLING", "JUDO", "GYMNASTICS", "BOXING", "JUDO"],
+            "Event": [
+                "MEN’S GRECO-ROMAN 87KG",
+                "MEN’S 90KG",
+                "MEN’S HORIZONTAL BAR",
+                "WOMEN’S 57KG",
+                "MEN’S 100KG",
+            ],
+            "Medal": ["Bronze", "Bronze", "Bronze", "Bronze", "Gold"],
+            "Athlete": [
+                "Dauren Kurugliev and Zurabi Datunashvili, Serbia",
+                "Sanshiro Murao, Japan and Lasha Bekauri",
+                "Angel Barajas, Colombia and Zhang Boheng, China",
+                "Wu Yu, China",
+                "Zelym Kotsoiev, Azerbaijan",
+            ],
+            "Country": [None, None, None, "China", None],
+        }
+    )
+
+    bronze_df, tie_list = cpd.deal_with_ties(df)
+    assert tie_list == [0, 0, 1, 2, 2]
+    assert bronze_df["Athlete"].tolist() == [
+        "Dauren Kurugliev",
+        "Zurabi Datunashvili",
+        "Sanshiro Murao",
+        "Angel Barajas",
+        "Zhang Boheng",
+    ]
+    assert bronze_df["Country"].tolist() == [
+        "Greece",
+        "Serbia",
+        "Japan",
+        "Colombia",
+        "China",
+    ]
+
+    df = cpd.remove_bronze_ties(df, bronze_df, tie_list)
+    assert df["Athlete"].tolist()[:2] == ["Wu Yu, China", "Zelym Kotsoiev, Azerbaijan"]
+    assert len(df) == 7
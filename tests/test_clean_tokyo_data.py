@@ -1,5 +1,8 @@
 import sys
 import os
+import json
+
+import pytest
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import pandas as pd
@@ -89,6 +92,61 @@ def test_event_df():
     ]
 
 
+def test_parse_tokyo_medals(tmp_path):
+    path = tmp_path / "medals.json"
+    path.write_text(
+        json.dumps(
+            {
+                "Athletics": {
+                    "High Jump, Men": [
+                        "Gianmarco Tamberi",
+                        "Mutaz Essa Barshim",
+                        "ITA",
+                        "QAT",
+                        "Maksim Nedasekau",
+                        "BLR",
+                    ],
+                    "Long Jump, Men": ["A", "GRE", "B", "C", "D", "CUB", "ESP", "USA"],
+                },
+                "Judo": {"Team, Mixed": ["FRA", "JPN", "GER", "ISR"]},
+            }
+        )
+    )
+
+    final_df = ctd.parse_tokyo_medals(path)
+    assert list(final_df.columns) == ctd.FINAL_COLUMNS
+    assert final_df["Year"].unique()[0] == ctd.TOKYO_YEAR
+
+    # a tie for gold is followed by bronze
+    high_jump = final_df[final_df["Event"] == "High Jump, Men"]
+    assert list(high_jump["Athlete"]) == [
+        "Gianmarco Tamberi",
+        "Mutaz Essa Barshim",
+        "Maksim Nedasekau",
+    ]
+    assert list(high_jump["NOC"]) == ["ITA", "QAT", "BLR"]
+    assert list(high_jump["Medal"]) == ["Gold (Tie)", "Gold (Tie)", "Bronze"]
+
+    # three athletes tied for silver
+    long_jump = final_df[final_df["Event"] == "Long Jump, Men"]
+    assert list(long_jump["NOC"]) == ["GRE", "CUB", "ESP", "USA"]
+    assert list(long_jump["Medal"]) == ["Gold"] + ["Silver (Tie)"] * 3
+
+    # teams have no athlete and the fourth team shares bronze
+    judo = final_df[final_df["Sport"] == "Judo"]
+    assert judo["Athlete"].isna().all()
+    assert list(judo["NOC"]) == ["FRA", "JPN", "GER", "ISR"]
+    assert list(judo["Medal"]) == ["Gold", "Silver", "Bronze (Tie)", "Bronze (Tie)"]
+
+
+def test_parse_tokyo_medals_unpaired(tmp_path):
+    path = tmp_path / "medals.json"
+    path.write_text(json.dumps({"Rowing": {"Single Sculls, Men": ["A", "B", "NZL"]}}))
+
+    with pytest.raises(ValueError, match="Single Sculls, Men"):
+        ctd.parse_tokyo_medals(path)
+
+
 def test_clean_noc_data():
     df = pd.DataFrame({"NOC": [["USA"], ["CAN"], ["GBR"], "FRA"]})
     clean_noc_df = ctd.clean_noc_data(df)
@@ -1,3 +1,4 @@
+import json
 import sys
 import os
 
@@ -96,4 +97,74 @@ def test_format_strings():
     assert formatted_data["City"].tolist() == ["Rio", "Paris"]
     assert formatted_data["Sport"].tolist() == ["Athletics", "Swimming"]
     assert formatted_data["Event"].tolist() == ["100M", "100M Butterfly"]
-    assert formatted_data["Medal"].tolist() == ["Gold", "Gold"]
\ No newline at end of file
+    assert formatted_data["Medal"].tolist() == ["Gold", "Gold"]
+
+
+def copy_sources(tmp_path) -> dict:
+    sources = {}
+    for name, path in cd.SOURCES.items():
+        sources[name] = tmp_path / path.name
+        sources[name].write_bytes(path.read_bytes())
+    return sources
+
+
+def count_normalised(monkeypatch) -> list:
+    """Record the path of each dataset normalised by combine_incremental."""
+    normalised = []
+    normalise_part = cd.normalise_part
+
+    def counted_normalise_part(path):
+        normalised.append(path)
+        return normalise_part(path)
+
+    monkeypatch.setattr(cd, "normalise_part", counted_normalise_part)
+    return normalised
+
+
+def test_combine_incremental(tmp_path, monkeypatch):
+    """Test that only the datasets that changed are normalised again"""
+    sources = copy_sources(tmp_path)
+    cache_dir = tmp_path / "cache"
+    normalised = count_normalised(monkeypatch)
+
+    combined_data = cd.combine_incremental(sources, cache_dir)
+    assert normalised == list(sources.values())
+    expected = cd.schema.apply_schema(cd.format_the_strings(cd.combine_datasets()))
+    pd.testing.assert_frame_equal(combined_data, expected)
+
+    # nothing changed, every part comes from the cache
+    normalised.clear()
+    pd.testing.assert_frame_equal(
+        cd.combine_incremental(sources, cache_dir), combined_data
+    )
+    assert normalised == []
+
+    with open(sources["tokyo"], "a") as f:
+        f.write("Ann,FRA,2020,Summer,Tokyo,Judo,Open,Gold,France\n")
+    combined_data = cd.combine_incremental(sources, cache_dir)
+    assert normalised == [sources["tokyo"]]
+    assert len(combined_data) == len(expected) + 1
+
+    with open(cache_dir / "manifest.json") as f:
+        manifest = json.load(f)
+    assert manifest["sources"]["tokyo"]["rows"] == 1081
+    assert manifest["sources"]["tokyo"]["hash"] == cd.part_hash(sources["tokyo"])
+
+    # a new schema file changes how the csv is read, so the part is rebuilt
+    normalised.clear()
+    with open(cd.schema.schema_path(sources["paris"]), "w") as f:
+        json.dump({"Season": ["Summer", "Winter", "Spring"]}, f)
+    combined_data = cd.combine_incremental(sources, cache_dir)
+    assert normalised == [sources["paris"]]
+
+
+def test_combine_incremental_version(tmp_path, monkeypatch):
+    """Test that the parts of another cache version are not used"""
+    sources = copy_sources(tmp_path)
+    cache_dir = tmp_path / "cache"
+    cd.combine_incremental(sources, cache_dir)
+
+    monkeypatch.setattr(cd, "CACHE_VERSION", cd.CACHE_VERSION + 1)
+    normalised = count_normalised(monkeypatch)
+    cd.combine_incremental(sources, cache_dir)
+    assert normalised == list(sources.values())
@@ -0,0 +1,139 @@
+import sys
+import os
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import olympics_data_project.data_cleaning.clean_paris_data as cpd
+from olympics_data_project.data_cleaning.corrections import CorrectionRules
+
+RULES = {
+    "h2": [
+        {
+            "previous": "SHOOTING",
+            "value": "WOMEN’S 50M FREESTYLE",
+            "replace": "SWIMMING",
+        },
+        {"previous": "DIVING", "value": "WOMEN", "delete": True},
+        {
+            "previous": "JUDO",
+            "value": "ROWING",
+            "next": "WOMEN’S QUADRUPLE SCULLS",
+            "insert_before": "MEN’S 90KG",
+        },
+    ],
+    "events": [
+        {
+            "sport": "RUGBY SEVENS",
+            "event": "RUGBY SEVENS",
+            "medals": ["Gold: France", "Silver: Fiji", "Bronze: South Africa"],
+            "set_event": "MEN’S",
+        }
+    ],
+    "athletes": [
+        {
+            "sport": "CANOE SPRINT",
+            "event": "WOMEN’S KAYAK DOUBLE 500M",
+            "medal": "Bronze",
+            "athlete": "Jule Marie Hake and Paulina Paszek and Hungary",
+            "set_athlete": "Jule Marie Hake and Paulina Paszek",
+            "add": [{"Athlete": "Noemi Pup and Sara Fojt", "Country": "Hungary"}],
+        }
+    ],
+}
+
+
+def test_correct_h2():
+    """Test that the h2 rules are matched by the values around them"""
+    rules = CorrectionRules(RULES)
+
+    h2_data = [
+        "SHOOTING",
+        "WOMEN’S 50M FREESTYLE",
+        "DIVING",
+        "WOMEN",
+        "JUDO",
+        "ROWING",
+        "WOMEN’S QUADRUPLE SCULLS",
+        "JUDO",
+        "ROWING",
+    ]
+    assert list(rules.correct_h2(h2_data)) == [
+        "SHOOTING",
+        "SWIMMING",
+        "DIVING",
+        "JUDO",
+        "MEN’S 90KG",
+        "ROWING",
+        "WOMEN’S QUADRUPLE SCULLS",
+        "JUDO",
+        "ROWING",
+    ]
+
+
+def test_correct_h2_on_part_of_the_data():
+    """Test that the same rule matches wherever the values are"""
+    rules = CorrectionRules(RULES)
+
+    assert list(rules.correct_h2(["DIVING", "WOMEN"])) == ["DIVING"]
+    assert list(rules.correct_h2(["WOMEN"])) == ["WOMEN"]
+
+
+def test_insert_p_events():
+    """Test that the rows named after their sport get the event of their medals
+    and that the event corrections are applied"""
+    rules = CorrectionRules(RULES)
+
+    df = pd.DataFrame(
+        {
+            "Sport": ["ATHLETICS", "ATHLETICS", "RUGBY SEVENS"],
+            "Event": ["ATHLETICS", "WOMEN’S MARATHON", "RUGBY SEVENS"],
+            "Medal Winners": [
+                ["Gold: Kenya"],
+                ["Gold: Netherlands (Sifan Hassan)"],
+                ["Gold: France", "Silver: Fiji", "Bronze: South Africa"],
+            ],
+        }
+    )
+    medal_events = ["MEN’S MARATHON", None, "WOMEN’S"]
+
+    df = cpd.insert_p_events(df, medal_events, rules)
+    assert df["Event"].tolist() == ["MEN’S MARATHON", "WOMEN’S MARATHON", "MEN’S"]
+
+
+def test_fix_athletes():
+    """Test that the athletes are matched by content and the missing
+    athletes are added at the end"""
+    rules = CorrectionRules(RULES)
+
+    df = pd.DataFrame(
+        {
+            "Sport": ["CANOE SPRINT", "SWIMMING"],
+            "Event": ["WOMEN’S KAYAK DOUBLE 500M", "MEN’S 100M BREASTSTROKE"],
+            "Medal": ["Bronze", "Gold"],
+            "Athlete": [
+                "Jule Marie Hake and Paulina Paszek and Hungary",
+                "Nicolo Martinenghi",
+            ],
+            "Country": ["Germany", "Italy"],
+        },
+        index=[695, 696],
+    )
+
+    df = cpd.fix_athletes(df, rules)
+    assert df["Athlete"].tolist() == [
+        "Jule Marie Hake and Paulina Paszek",
+        "Nicolo Martinenghi",
+        "Noemi Pup and Sara Fojt",
+    ]
+    assert df["Country"].tolist() == ["Germany", "Italy", "Hungary"]
+    assert df["Medal"].tolist() == ["Bronze", "Gold", "Bronze"]
+
+
+def test_corrections_file():
+    """Test that the corrections file can be loaded"""
+    rules = CorrectionRules.load()
+
+    assert len(rules.h2_rules) == 5
+    assert len(rules.event_rules) == 17
+    assert len(rules.athlete_rules) == 1
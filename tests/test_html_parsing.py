@@ -0,0 +1,101 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+
+import pytest
+from bs4 import BeautifulSoup
+
+import olympics_data_project.web_scrapers.html_parsing as hp
+from olympics_data_project.web_scrapers.ap_news_scraper import parse_ap_news
+from olympics_data_project.web_scrapers.tokyo2020_medals_scraper import (
+    parse_events_medals,
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "html")
+AP_NEWS_HTML = os.path.join(FIXTURES_DIR, "ap_news_medal_winners.html")
+OLYMPEDIA_HTML = os.path.join(FIXTURES_DIR, "olympedia_sport_medals.html")
+
+
+def read_fixture(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def full_tree_ap_news(html):
+    """The AP News parsing without a strainer."""
+    soup = BeautifulSoup(html, "html.parser")
+    h2_tags, p_tags = [], []
+    for tags in soup.find_all("div", class_="RichTextStoryBody"):
+        h2_tags += [h2.text for h2 in tags.find_all("h2")]
+        p_tags += [p.text for p in tags.find_all("p")]
+    return {"h2": h2_tags, "p": p_tags}
+
+
+def full_tree_medals_table(html):
+    """The rows of the Medals table without a strainer."""
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.find("h2", string="Medals").find_next(
+        "table", class_="table table-striped"
+    )
+    return [
+        [a.get_text(strip=True) for a in row.find_all("a")]
+        for row in table.find_all("tr")
+        if row.find_all("a")
+    ]
+
+
+@pytest.mark.parametrize("parser", hp.available_parsers())
+def test_ap_news_strained_matches_full_tree(parser, monkeypatch):
+    monkeypatch.setenv(hp.PARSER_ENV_VAR, parser)
+    html = read_fixture(AP_NEWS_HTML)
+
+    paris_data = parse_ap_news(html)
+
+    assert paris_data == full_tree_ap_news(html)
+    assert len(paris_data["h2"]) == 337
+    assert len(paris_data["p"]) == 1138
+
+
+@pytest.mark.parametrize("parser", hp.available_parsers())
+def test_medals_strained_matches_full_tree(parser, monkeypatch):
+    monkeypatch.setenv(hp.PARSER_ENV_VAR, parser)
+    html = read_fixture(OLYMPEDIA_HTML)
+
+    medals = parse_events_medals(html)
+
+    rows = full_tree_medals_table(html)
+    assert medals == {row[0]: row[1:] for row in rows}
+
+
+def test_medals_match_saved_tokyo_results():
+    html = read_fixture(OLYMPEDIA_HTML)
+    tokyo_path = os.path.join(
+        os.path.dirname(__file__),
+        "..",
+        "olympics_data_project",
+        "data",
+        "raw",
+        "tokyo2020_medals.json",
+    )
+    with open(tokyo_path) as f:
+        tokyo_medals = json.load(f)
+
+    assert parse_events_medals(html) == tokyo_medals["Swimming"]
+
+
+def test_strainer_keeps_multi_class_story_body():
+    html = (
+        "<div class='Nav'><p>menu</p></div>"
+        "<div class='RichTextStoryBody RichTextBody'><h2>SWIMMING</h2><p>x</p></div>"
+    )
+    assert parse_ap_news(html) == {"h2": ["SWIMMING"], "p": ["x"]}
+
+
+def test_choose_parser(monkeypatch):
+    monkeypatch.delenv(hp.PARSER_ENV_VAR, raising=False)
+    assert hp.choose_parser() == hp.available_parsers()[0]
+
+    monkeypatch.setenv(hp.PARSER_ENV_VAR, "html.parser")
+    assert hp.choose_parser() == "html.parser"
@@ -0,0 +1,95 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from olympics_data_project.web_scrapers.http_client import HttpClient
+from olympics_data_project.web_scrapers.tokyo2020_medals_scraper import (
+    scrape_events_medals,
+)
+from stub_server import make_medals_page
+
+PAGES = {
+    "/a": "<html><body><p>Same page</p></body></html>",
+    "/b": "<html><body><p>Same page</p></body></html>",
+    "/editions/61/sports/BK3": make_medals_page(
+        {"3x3 Basketball, Men": ["LAT", "ROC", "SRB"]}
+    ),
+}
+
+
+def test_revalidation_returns_304(stub_server, tmp_path):
+    server = stub_server(PAGES)
+    client = HttpClient(cache_dir=tmp_path / "cache")
+
+    first = client.get(server.url("/a"))
+    second = client.get(server.url("/a"))
+
+    assert first.text == second.text == PAGES["/a"]
+    assert second.status_code == 200
+    assert server.statuses == [200, 304]
+    assert client.cache_stats() == {"hits": 0, "revalidated": 1, "misses": 1}
+
+
+def test_last_modified_revalidation(stub_server, tmp_path):
+    server = stub_server(PAGES)
+    client = HttpClient(cache_dir=tmp_path / "cache")
+    client.get(server.url("/a"))
+
+    # drop the ETag so only Last-Modified is sent
+    entry = client.cache.get(server.url("/a"))
+    entry["etag"] = None
+    client.cache.touch(server.url("/a"), entry)
+
+    assert client.get(server.url("/a")).text == PAGES["/a"]
+    assert server.statuses == [200, 304]
+
+
+def test_fresh_entries_skip_the_network(stub_server, tmp_path):
+    server = stub_server(PAGES)
+    client = HttpClient(cache_dir=tmp_path / "cache", max_age=60)
+
+    client.get(server.url("/a"))
+    client.get(server.url("/a"))
+
+    assert len(server.requests) == 1
+    assert client.cache_stats() == {"hits": 1, "revalidated": 0, "misses": 1}
+
+
+def test_cache_survives_a_new_client(stub_server, tmp_path):
+    server = stub_server(PAGES)
+    HttpClient(cache_dir=tmp_path / "cache").get(server.url("/a"))
+
+    client = HttpClient(cache_dir=tmp_path / "cache")
+    assert client.get(server.url("/a")).text == PAGES["/a"]
+    assert client.cache_stats()["revalidated"] == 1
+
+
+def test_identical_bodies_are_stored_once(stub_server, tmp_path):
+    server = stub_server(PAGES)
+    client = HttpClient(cache_dir=tmp_path / "cache")
+
+    client.get(server.url("/a"))
+    client.get(server.url("/b"))
+
+    objects = [p for p in (tmp_path / "cache" / "objects").rglob("*") if p.is_file()]
+    assert len(objects) == 1
+
+
+def test_scraper_rerun_costs_a_304(stub_server, isolated_http_client):
+    server = stub_server(PAGES)
+    url = server.url("/editions/61/sports/BK3")
+
+    assert scrape_events_medals(url) == scrape_events_medals(url)
+    assert server.statuses == [200, 304]
+    assert isolated_http_client.cache_stats()["revalidated"] == 1
+
+
+def test_no_cache(stub_server):
+    server = stub_server(PAGES)
+    client = HttpClient(cache_dir=None)
+
+    client.get(server.url("/a"))
+    client.get(server.url("/a"))
+
+    assert server.statuses == [200, 200]
+    assert client.cache_stats()["misses"] == 2
@@ -0,0 +1,50 @@
+import sys
+import os
+import json
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import olympics_data_project.data_cleaning.clean_paris_data as cpd
+from olympics_data_project.data_cleaning import instrumentation
+from olympics_data_project.data_cleaning.instrumentation import profile_stages, stage
+
+
+@stage
+def double_rows(df: pd.DataFrame) -> pd.DataFrame:
+    return pd.concat([df, df], ignore_index=True)
+
+
+def test_stage_without_profiler():
+    """Test that a stage runs unchanged when no profiler is active"""
+    df = pd.DataFrame({"Athlete": ["A", "B"]})
+
+    assert instrumentation._active is None
+    assert len(double_rows(df)) == 4
+    assert double_rows.__name__ == "double_rows"
+
+
+def test_profile_stages(tmp_path, capsys):
+    """Test that the calls, rows and memory of each stage are recorded"""
+    df = pd.DataFrame(
+        {"Country": ["Britain", "France"], "Athlete": ["A", "B"]},
+    )
+    report_path = tmp_path / "stages.json"
+
+    with profile_stages(report_path) as profiler:
+        double_rows(double_rows(df))
+        cpd.replace_some_country_names(df)
+
+    assert instrumentation._active is None
+    records = {record["stage"]: record for record in profiler.records()}
+    doubled = records["test_instrumentation.double_rows"]
+    assert doubled["calls"] == 2
+    assert doubled["rows_in"] == 2 + 4
+    assert doubled["rows_out"] == 4 + 8
+    assert doubled["memory_bytes"] > 0
+    assert records["clean_paris_data.replace_some_country_names"]["rows_out"] == 2
+
+    # the report is printed and saved
+    assert "clean_paris_data.replace_some_country_names" in capsys.readouterr().out
+    with open(report_path) as f:
+        assert [record["stage"] for record in json.load(f)] == list(records)
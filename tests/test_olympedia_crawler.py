@@ -0,0 +1,185 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+
+import olympics_data_project.web_scrapers.olympedia_crawler as oc
+from stub_server import make_medals_page
+
+EDITIONS_PAGE = """
+<html><body>
+<h2>Olympic Games</h2>
+<h2>Summer Olympics</h2>
+<table class="table">
+<tr><th>#</th><th>Year</th><th>City</th></tr>
+<tr><td>XXXII</td><td><a href="/editions/61">2020</a></td><td>Tokyo</td></tr>
+<tr><td>XXXIII</td><td><a href="/editions/63">2024</a></td><td>Paris</td></tr>
+</table>
+<h2>Winter Olympics</h2>
+<table class="table">
+<tr><td>XXIV</td><td><a href="/editions/62">2022</a></td><td>Beijing</td></tr>
+</table>
+<h2>Youth Olympic Games</h2>
+<table class="table">
+<tr><td>IV</td><td><a href="/editions/75">2026</a></td><td>Dakar</td></tr>
+</table>
+</body></html>
+"""
+
+
+def result_page(sports):
+    rows = "".join(
+        f'<tr><td><a href="{href}">{text}</a></td></tr>' for href, text in sports
+    )
+    return f'<html><body><table class="table">{rows}</table></body></html>'
+
+
+SITE = {
+    "/editions": EDITIONS_PAGE,
+    "/editions/61/result": result_page(
+        [
+            ("/editions/61/sports/BK3", "3x3 Basketball"),
+            ("/results/18000000", "3x3 Basketball, Men"),
+            ("/editions/61/sports/ARC", "Archery"),
+            ("/editions/61/sports/BK3", "3x3 Basketball"),
+        ]
+    ),
+    "/editions/61/sports/BK3": make_medals_page(
+        {"3x3 Basketball, Men": ["LAT", "ROC", "SRB"]}
+    ),
+    "/editions/61/sports/ARC": make_medals_page(
+        {"Individual, Women": ["An San", "KOR", "Yelena Osipova", "ROC"]}
+    ),
+    "/editions/63/result": result_page([("/editions/63/sports/SWM", "Swimming")]),
+    "/editions/63/sports/SWM": make_medals_page(
+        {"100 metres Freestyle, Men": ["Pan Zhanle", "CHN"]}
+    ),
+    "/editions/62/result": result_page([("/editions/62/sports/CUR", "Curling")]),
+    "/editions/62/sports/CUR": make_medals_page({"Curling, Men": ["SWE", "GBR"]}),
+}
+
+
+def test_parse_editions():
+    editions = oc.parse_editions(EDITIONS_PAGE, "http://stub")
+    assert [(e["edition_id"], e["year"], e["season"], e["city"]) for e in editions] == [
+        (61, 2020, "Summer", "Tokyo"),
+        (63, 2024, "Summer", "Paris"),
+        (62, 2022, "Winter", "Beijing"),
+    ]
+    assert editions[0]["url"] == "http://stub/editions/61/result"
+
+
+def test_edition_file_name():
+    edition = {"year": 1956, "season": "Summer", "city": "Melbourne / Stockholm"}
+    assert (
+        oc.edition_file_name(edition) == "1956_summer_melbourne_stockholm_medals.json"
+    )
+
+
+def test_crawl_every_edition(stub_server, tmp_path):
+    server = stub_server(SITE, latency=0.02)
+    crawler = oc.OlympediaCrawler(
+        out_dir=tmp_path, link_base=server.base_url, max_workers=3, delay=0
+    )
+
+    files = crawler.crawl()
+
+    assert sorted(files) == [61, 62, 63]
+    with open(tmp_path / "2020_summer_tokyo_medals.json") as f:
+        tokyo = json.load(f)
+    assert tokyo == {
+        "3x3 Basketball": {"3x3 Basketball, Men": ["LAT", "ROC", "SRB"]},
+        "Archery": {"Individual, Women": ["An San", "KOR", "Yelena Osipova", "ROC"]},
+    }
+    with open(tmp_path / "2022_winter_beijing_medals.json") as f:
+        assert json.load(f) == {"Curling": {"Curling, Men": ["SWE", "GBR"]}}
+
+    # every page is fetched once even when it is linked twice
+    paths = [path for path, _ in server.requests]
+    assert len(paths) == len(set(paths)) == len(SITE)
+    assert server.max_in_flight <= 3
+
+    with open(tmp_path / "editions.json") as f:
+        index = json.load(f)
+    assert [e["file"] for e in index] == [
+        "2020_summer_tokyo_medals.json",
+        "2022_winter_beijing_medals.json",
+        "2024_summer_paris_medals.json",
+    ]
+
+
+def test_crawl_keeps_going_after_a_failed_page(stub_server, tmp_path):
+    site = dict(SITE)
+    del site["/editions/61/sports/ARC"]
+    server = stub_server(site)
+    editions = oc.parse_editions(EDITIONS_PAGE, server.base_url)
+    crawler = oc.OlympediaCrawler(
+        out_dir=tmp_path, link_base=server.base_url, max_workers=2, delay=0
+    )
+
+    files = crawler.crawl(editions[:2])
+
+    # the edition with a failed page is neither written nor listed
+    assert list(files) == [63]
+    assert not (tmp_path / "2020_summer_tokyo_medals.json").exists()
+    with open(tmp_path / "editions.json") as f:
+        assert [e["file"] for e in json.load(f)] == ["2024_summer_paris_medals.json"]
+    assert [url for url, _ in crawler.errors] == [server.url("/editions/61/sports/ARC")]
+
+
+def test_crawl_fetches_incomplete_editions_again(stub_server, tmp_path):
+    site = dict(SITE)
+    del site["/editions/61/sports/ARC"]
+    oc.OlympediaCrawler(
+        out_dir=tmp_path, link_base=stub_server(site).base_url, delay=0
+    ).crawl()
+
+    server = stub_server(SITE)
+    files = oc.OlympediaCrawler(
+        out_dir=tmp_path, link_base=server.base_url, delay=0
+    ).crawl()
+
+    # only the edition missing from the index is crawled again
+    assert list(files) == [61]
+    paths = {path for path, _ in server.requests}
+    assert "/editions/62/result" not in paths
+    with open(tmp_path / "2020_summer_tokyo_medals.json") as f:
+        assert json.load(f)["Archery"] != {}
+    with open(tmp_path / "editions.json") as f:
+        assert len(json.load(f)) == 3
+
+
+def test_worker_survives_a_failing_sport_done(stub_server, tmp_path, monkeypatch):
+    server = stub_server(SITE)
+    crawler = oc.OlympediaCrawler(
+        out_dir=tmp_path, link_base=server.base_url, max_workers=1, delay=0
+    )
+
+    def failing_sport_done(task, medals):
+        raise RuntimeError("cannot store the medals")
+
+    monkeypatch.setattr(crawler, "_sport_done", failing_sport_done)
+    crawler.crawl(oc.parse_editions(EDITIONS_PAGE, server.base_url))
+
+    # the one worker records every sport and the crawl still finishes
+    assert len(crawler.errors) == 4
+    assert not list(tmp_path.glob("*_medals.json"))
+
+
+def test_partial_crawls_keep_the_index(stub_server, tmp_path):
+    server = stub_server(SITE)
+    editions = oc.parse_editions(EDITIONS_PAGE, server.base_url)
+
+    for edition in [editions[0], editions[1], editions[0]]:
+        crawler = oc.OlympediaCrawler(
+            out_dir=tmp_path, link_base=server.base_url, max_workers=2, delay=0
+        )
+        crawler.crawl([edition])
+
+    with open(tmp_path / "editions.json") as f:
+        index = json.load(f)
+    assert sorted(e["file"] for e in index) == sorted(
+        oc.edition_file_name(edition) for edition in editions[:2]
+    )
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,131 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import shutil
+
+import pandas as pd
+
+import olympics_data_project.data_cleaning.clean_paris_data as cpd
+import olympics_data_project.data_cleaning.paris_live_update as plu
+from olympics_data_project.data_cleaning.clean_paris_data import (
+    CSV_SAVE_PATH,
+    PARIS_PATH,
+    load_data,
+)
+
+# the first day of the finished article, Sunday Aug. 11, is the first
+# 14 h2 tags and the p tags after the introduction up to index 50
+LAST_DAY_H2 = 14
+LAST_DAY_P = 50
+
+
+def previous_day_snapshot(story: dict) -> dict:
+    return {
+        "h2": story["h2"][LAST_DAY_H2:],
+        "p": story["p"][:1] + story["p"][LAST_DAY_P:],
+    }
+
+
+def test_diff_entries():
+    old = ["intro", "MEN’S", "Gold: Serbia"]
+    new = ["new intro", "WOMEN’S", "Gold: Italy", "MEN’S", "Gold: Serbia"]
+    # the introduction is not a result, so changing it is not a change
+    assert plu.diff_entries(old, new) == (
+        ["new intro", "WOMEN’S", "Gold: Italy"],
+        False,
+    )
+    assert plu.diff_entries(new, new) == ([], False)
+
+    edited = ["new intro", "WOMEN’S", "Gold: Italy (Tie)", "MEN’S", "Gold: Serbia"]
+    assert plu.diff_entries(new, edited)[1]
+    assert plu.diff_entries(new, new[:3])[1]
+
+
+def test_group_medals_with_events():
+    p_data = [
+        "MEN’S KEIRIN",
+        "Gold: Netherlands (Harrie Lavreysen)",
+        "Silver: Australia (Matthew Richardson)",
+        "Bronze: Australia (Matthew Glaetzer",
+        "Gold: New Zealand (Ellesse Andrews)",
+        "Silver: Germany (Lea Friedrich)",
+        "Bronze: Britain (Emma Finucane)",
+    ]
+    grouped = plu.group_medals_with_events(p_data)
+    assert [event for event, _ in grouped] == ["MEN’S KEIRIN", None]
+    assert grouped[1][1][0] == "Gold: New Zealand (Ellesse Andrews)"
+
+
+def test_update_matches_full_clean(tmp_path):
+    story = load_data(PARIS_PATH)
+    snapshot_path = tmp_path / "paris2024_results.json"
+    with open(snapshot_path, "w") as f:
+        json.dump(previous_day_snapshot(story), f)
+    csv_path = tmp_path / "paris2024_results.csv"
+    shutil.copy(CSV_SAVE_PATH, csv_path)
+
+    new_rows = plu.update_paris_results(story, snapshot_path, csv_path)
+
+    full_df = pd.read_csv(CSV_SAVE_PATH)
+    updated_df = pd.read_csv(csv_path)
+    assert len(new_rows) == 39
+    assert list(updated_df.columns) == list(full_df.columns)
+    # the appended rows are the rows the full clean made for the same day
+    appended = updated_df.iloc[len(full_df) :]
+    assert len(appended.merge(full_df)) == len(appended)
+    assert set(appended["Event"]) >= {"WOMEN’S MARATHON", "MEN’S KEIRIN"}
+    assert load_data(snapshot_path) == story
+
+    # nothing is appended when the article did not change
+    assert plu.update_paris_results(story, snapshot_path, csv_path).empty
+    assert len(pd.read_csv(csv_path)) == len(updated_df)
+
+
+def test_update_seeds_snapshot(tmp_path):
+    story = load_data(PARIS_PATH)
+    seed_path = tmp_path / "paris2024_results.json"
+    with open(seed_path, "w") as f:
+        json.dump(previous_day_snapshot(story), f)
+    snapshot_path = tmp_path / "paris2024_snapshot.json"
+    csv_path = tmp_path / "paris2024_results.csv"
+    shutil.copy(CSV_SAVE_PATH, csv_path)
+
+    new_rows = plu.update_paris_results(story, snapshot_path, csv_path, seed_path)
+
+    assert len(new_rows) == 39
+    assert load_data(snapshot_path) == story
+    # the raw article the full clean reads is left as it was
+    assert load_data(seed_path) == previous_day_snapshot(story)
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_update_with_edited_result(tmp_path, monkeypatch):
+    """Test that editing a result already in the csv replaces its rows
+    instead of appending them again"""
+    # the full clean also saves the p events of the article
+    monkeypatch.setattr(cpd, "save_p_events", lambda p_events: None)
+    story = load_data(PARIS_PATH)
+    snapshot_path = tmp_path / "paris2024_snapshot.json"
+    with open(snapshot_path, "w") as f:
+        json.dump(story, f)
+    csv_path = tmp_path / "paris2024_results.csv"
+    shutil.copy(CSV_SAVE_PATH, csv_path)
+
+    edited = {"h2": story["h2"], "p": list(story["p"])}
+    assert edited["p"][10] == "Gold: Netherlands (Harrie Lavreysen)"
+    edited["p"][10] = "Gold: Netherlands (Harrie Lavreysen Jr.)"
+    plu.update_paris_results(edited, snapshot_path, csv_path)
+
+    # the csv is the full clean with the edited row changed, no rows added
+    expected_df = pd.read_csv(CSV_SAVE_PATH)
+    edited_row = (expected_df["Event"] == "MEN’S KEIRIN") & (
+        expected_df["Medal"] == "Gold"
+    )
+    assert edited_row.sum() == 1
+    expected_df.loc[edited_row, "Athlete"] = "Harrie Lavreysen Jr."
+    updated_df = pd.read_csv(csv_path)
+    assert len(updated_df) == len(expected_df)
+    pd.testing.assert_frame_equal(updated_df, expected_df)
+    assert load_data(snapshot_path) == edited
@@ -0,0 +1,96 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import olympics_data_project.data_cleaning.clean_paris_data as cpd
+from olympics_data_project.data_cleaning.clean_paris_data import PARIS_PATH
+from olympics_data_project.data_cleaning.paris_tokens import (
+    EVENT,
+    MEDAL,
+    SPORT,
+    Token,
+    tokenize,
+    tokenize_h2,
+    tokenize_p,
+)
+
+
+def test_tokenize_h2():
+    test_data = [
+        "Sunday, Aug. 11",
+        "______",
+        "CYCLING",
+        "WOMEN’S TEAM PURSUIT",
+        "3X3 BASKETBALL",
+        "WOMEN",
+        "SWIMMING",
+        "MEN’S 1500M FREESTYLE",
+    ]
+    assert [token.text for token in tokenize_h2(test_data)] == [
+        "CYCLING WOMEN’S TEAM PURSUIT",
+        "MEN’S 3X3 BASKETBALL",
+        "WOMEN’S 3X3 BASKETBALL",
+        "WOMEN’S 50M FREESTYLE",
+        "WOMEN’S 4x100M MEDLEY RELAY",
+        "MEN’S 1500M FREESTYLE",
+        "MEN’S 4x100M MEDLEY RELAY",
+    ]
+    assert {token.kind for token in tokenize_h2(test_data)} == {SPORT}
+
+
+def test_tokenize_p():
+    test_data = [
+        "PARIS (AP) — The 2024 Olympics are done.",
+        "\n",
+        "▶ See other events still in progress",
+        "WOMEN’S MARATHON",
+        "Gold: Netherlands (Sifan Hassan)",
+        "MEN’S 90KG Gold: Lasha Bekauri, Georgia",
+        "GOLD: Tom Pidcock, Britain",
+        "Women’s sabre team",
+    ]
+    assert list(tokenize_p(test_data)) == [
+        Token(EVENT, "WOMEN’S MARATHON"),
+        Token(MEDAL, "Gold: Netherlands (Sifan Hassan)"),
+        Token(EVENT, "MEN’S 90KG"),
+        Token(MEDAL, "Gold: Lasha Bekauri, Georgia"),
+        Token(MEDAL, "GOLD: Tom Pidcock, Britain"),
+        Token(EVENT, "Women’s sabre team"),
+    ]
+
+
+def test_tokenize_matches_cleaning_steps():
+    data = cpd.load_data(PARIS_PATH)
+
+    h2_data = cpd.remove_dates_from_h2(data["h2"])
+    h2_data = cpd.remove_symbols_from_h2(h2_data)
+    h2_data = cpd.combine_cycling_pursuit(h2_data)
+    h2_data = cpd.update_3x3_basketball(h2_data)
+    h2_data = cpd.clean_swimming_relays(h2_data)
+    p_data = cpd.remove_headlines_from_p(data["p"])
+    p_data = cpd.clean_medals_events_from_p(p_data)
+
+    tokens = list(tokenize(data))
+    assert [token.text for token in tokens if token.kind == SPORT] == h2_data
+    assert [token.text for token in tokens if token.kind != SPORT] == p_data
+
+
+def test_cleaning_steps():
+    """Test that each step of clean_paris_data applies only its own rule"""
+    h2_data = ["Sunday, Aug. 11", "______", "3X3 BASKETBALL", "CYCLING"]
+    assert cpd.remove_dates_from_h2(h2_data) == h2_data[1:]
+    assert cpd.remove_symbols_from_h2(h2_data) == [
+        "Sunday, Aug. 11",
+        "3X3 BASKETBALL",
+        "CYCLING",
+    ]
+    # the last value has no value after it
+    assert cpd.combine_cycling_pursuit(h2_data) == h2_data
+
+    p_data = ["▶ See other events", "MEN’S 90KG Gold: Lasha Bekauri, Georgia"]
+    assert cpd.remove_headlines_from_p(p_data) == p_data[1:]
+    assert cpd.clean_medals_events_from_p(p_data) == [
+        "▶ See other events",
+        "MEN’S 90KG",
+        "Gold: Lasha Bekauri, Georgia",
+    ]
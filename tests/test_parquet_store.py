@@ -0,0 +1,72 @@
+import sys
+import os
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from olympics_data_project.data_cleaning import parquet_store, schema
+
+
+def olympics_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Athlete": ["Leon Marchand", "Caeleb Dressel", "Hidilyn Diaz"],
+            "Country": ["France", "United States", "Philippines"],
+            "NOC": ["FRA", "USA", "PHI"],
+            "Season": ["Summer", "Summer", "Summer"],
+            "Year": [2024, 2020, 2020],
+            "City": ["Paris", "Tokyo", "Tokyo"],
+            "Sport": ["Swimming", "Swimming", "Weightlifting"],
+            "Event": ["200M Butterfly, Men", "50M Freestyle, Men", "55Kg, Women"],
+            "Medal": ["Gold", "Gold", "Gold"],
+        }
+    )
+
+
+def test_partition_filters():
+    assert parquet_store.partition_filters() is None
+    assert parquet_store.partition_filters(years=[2020], sports=["Swimming"]) == [
+        ("Year", "in", [2020]),
+        ("Sport", "in", ["Swimming"]),
+    ]
+
+
+def test_save_and_read_olympics(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "all_olympics_data"
+    parquet_store.save_parquet(olympics_df(), path)
+
+    assert (path / "Season=Summer" / "Year=2020" / "Sport=Swimming").is_dir()
+    df = parquet_store.read_olympics(path)
+    expected = schema.apply_schema(olympics_df())
+    pd.testing.assert_frame_equal(
+        df.sort_values("Athlete").reset_index(drop=True),
+        expected.sort_values("Athlete").reset_index(drop=True),
+        check_categorical=False,
+    )
+    assert df["Year"].dtype == "int16"
+
+
+def test_read_olympics_filters(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "all_olympics_data"
+    parquet_store.save_parquet(olympics_df(), path)
+
+    swimming = parquet_store.read_olympics(path, sports=["Swimming"])
+    assert sorted(swimming["Athlete"]) == ["Caeleb Dressel", "Leon Marchand"]
+
+    tokyo = parquet_store.read_olympics(
+        path, columns=["Athlete", "Medal"], years=[2020]
+    )
+    assert list(tokyo.columns) == ["Athlete", "Medal"]
+    assert sorted(tokyo["Athlete"]) == ["Caeleb Dressel", "Hidilyn Diaz"]
+
+
+def test_save_replaces_dataset(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "all_olympics_data"
+    parquet_store.save_parquet(olympics_df(), path)
+    parquet_store.save_parquet(olympics_df().head(1), path)
+
+    assert len(parquet_store.read_olympics(path)) == 1
@@ -0,0 +1,124 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import time
+
+import pandas as pd
+
+import olympics_data_project.web_scrapers.tokyo2020_medals_scraper as tms
+from olympics_data_project.web_scrapers.checkpoint import JsonlCheckpoint
+from olympics_data_project.web_scrapers.pipeline import FetchParsePipeline
+from stub_server import make_medals_page
+
+PAGES = {
+    f"/editions/61/sports/S{s:02d}": make_medals_page(
+        {f"Event {s}": [f"Athlete {s}", "USA", "CHN", "JPN"]}
+    )
+    for s in range(12)
+}
+
+
+def slow_parse(content: bytes) -> int:
+    time.sleep(0.05)
+    return len(content)
+
+
+def test_results_in_url_order(stub_server):
+    server = stub_server(PAGES, latency=0.01)
+    urls = [server.url(path) for path in PAGES]
+
+    pipeline = FetchParsePipeline(
+        tms.parse_events_medals, fetch_workers=4, parse_workers=2, delay=0
+    )
+    results = pipeline.run(urls)
+
+    assert results == [tms.parse_events_medals(PAGES[path]) for path in PAGES]
+    assert pipeline.fetch_stats.items == len(PAGES)
+    assert pipeline.parse_stats.items == len(PAGES)
+    assert pipeline.parse_stats.throughput() > 0
+
+
+def test_backpressure_bounds_fetched_pages(stub_server):
+    server = stub_server(PAGES)
+    urls = [server.url(path) for path in PAGES]
+    fetched = []
+
+    pipeline = FetchParsePipeline(
+        slow_parse, fetch_workers=4, parse_workers=0, queue_size=2, delay=0
+    )
+    pipeline.run(urls, on_result=lambda url, _: fetched.append(len(server.requests)))
+
+    # when a page is parsed, at most queue_size more pages have been fetched
+    assert all(n_fetched <= parsed + 2 for parsed, n_fetched in enumerate(fetched, 1))
+    assert pipeline.max_queued <= 2
+
+
+def test_failed_pages(stub_server):
+    server = stub_server(PAGES)
+    urls = [server.url("/editions/61/sports/S00"), server.url("/missing")]
+
+    pipeline = FetchParsePipeline(tms.parse_events_medals, parse_workers=0, delay=0)
+    results = pipeline.run(urls)
+
+    assert results[0] == {"Event 0": ["Athlete 0", "USA", "CHN", "JPN"]}
+    assert results[1] is None
+    assert pipeline.errors == [(urls[1], "status code 404")]
+
+
+def failing_parse(content: bytes) -> int:
+    raise ValueError("not a medals page")
+
+
+def test_failed_parse_inline(stub_server):
+    pages = {f"/page/{n}": "<html></html>" for n in range(60)}
+    server = stub_server(pages)
+    urls = [server.url(path) for path in pages]
+
+    pipeline = FetchParsePipeline(
+        failing_parse, fetch_workers=4, parse_workers=0, queue_size=2, delay=0
+    )
+    results = pipeline.run(urls)
+
+    assert results == [None] * len(urls)
+    assert len(pipeline.errors) == len(urls)
+
+
+def test_results_not_kept(stub_server):
+    server = stub_server(PAGES)
+    urls = [server.url(path) for path in PAGES]
+    saved = {}
+
+    pipeline = FetchParsePipeline(slow_parse, parse_workers=0, delay=0)
+    results = pipeline.run(urls, on_result=saved.__setitem__, keep_results=False)
+
+    assert results == [None] * len(urls)
+    assert saved == {server.url(path): len(PAGES[path]) for path in PAGES}
+
+
+def test_scrape_all_events_medals_with_parse_workers(stub_server, tmp_path):
+    server = stub_server(PAGES)
+    links_df = pd.DataFrame(
+        {
+            "href": [server.url(path) for path in PAGES],
+            "text": [f"Sport {s}" for s in range(len(PAGES))],
+        }
+    )
+
+    threaded = tms.scrape_all_events_medals(links_df, max_workers=4, delay=0)
+    pipelined = tms.scrape_all_events_medals(
+        links_df, max_workers=4, delay=0, parse_workers=2
+    )
+
+    assert pipelined == threaded
+    assert list(pipelined) == list(threaded)
+
+    checkpointed = tms.scrape_all_events_medals(
+        links_df,
+        max_workers=4,
+        delay=0,
+        parse_workers=2,
+        checkpoint=JsonlCheckpoint(tmp_path / "medals.jsonl"),
+    )
+    assert checkpointed == threaded
+    assert list(checkpointed) == list(threaded)
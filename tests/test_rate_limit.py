@@ -0,0 +1,107 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import time
+from email.utils import formatdate
+
+import pytest
+import requests
+
+from olympics_data_project.web_scrapers.http_client import HttpClient
+from olympics_data_project.web_scrapers.rate_limit import (
+    RateLimiter,
+    RetryPolicy,
+    TokenBucket,
+    parse_retry_after,
+)
+
+PAGES = {"/page": "<html><body><p>Medals</p></body></html>"}
+
+
+def test_token_bucket_burst_then_rate():
+    bucket = TokenBucket(rate=20, capacity=2)
+    start = time.monotonic()
+    waits = [bucket.acquire() for _ in range(4)]
+
+    # the burst is free, then one token every 0.05 seconds
+    assert waits[:2] == [0.0, 0.0]
+    assert time.monotonic() - start >= 0.09
+
+
+def test_rate_limiter_buckets_per_host():
+    limiter = RateLimiter(rate=1, burst=1, host_rates={"fast.test": 1000})
+    assert limiter.acquire("http://slow.test/a") == 0.0
+    assert limiter.acquire("http://other.test/a") == 0.0
+    assert limiter.acquire("http://fast.test/a") == 0.0
+    assert limiter.acquire("http://fast.test/b") < 0.01
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 8 <= parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+
+
+def test_backoff_is_capped_with_jitter():
+    policy = RetryPolicy(backoff_base=1, backoff_max=4)
+    for attempt in range(10):
+        assert 0 <= policy.backoff(attempt) <= min(4, 2**attempt)
+    assert policy.backoff(0, retry_after="120") == 4
+
+
+def test_should_retry():
+    policy = RetryPolicy(max_retries=2)
+    assert policy.should_retry(0, 503)
+    assert policy.should_retry(1, None)
+    assert not policy.should_retry(0, 404)
+    assert not policy.should_retry(2, 503)
+
+
+def test_client_retries_until_success(stub_server):
+    server = stub_server(PAGES)
+    server.failures["/page"] = [(503, {}), (429, {"Retry-After": "0.2"})]
+    client = HttpClient(cache_dir=None, retry_policy=RetryPolicy(backoff_base=0.01))
+
+    start = time.monotonic()
+    response = client.get(server.url("/page"))
+
+    assert response.status_code == 200
+    assert response.text == PAGES["/page"]
+    assert server.statuses == [503, 429, 200]
+    # the Retry-After header is respected
+    assert time.monotonic() - start >= 0.2
+    stats = client.retry_stats()
+    assert stats["retries"] == 2
+    assert stats["backoff_seconds"] >= 0.2
+
+
+def test_client_gives_up_after_max_retries(stub_server):
+    server = stub_server(PAGES)
+    server.failures["/page"] = [(503, {})] * 5
+    client = HttpClient(
+        cache_dir=None, retry_policy=RetryPolicy(max_retries=2, backoff_base=0.01)
+    )
+
+    assert client.get(server.url("/page")).status_code == 503
+    assert server.statuses == [503, 503, 503]
+
+
+def test_client_retries_connection_errors():
+    client = HttpClient(
+        cache_dir=None, retry_policy=RetryPolicy(max_retries=1, backoff_base=0.01)
+    )
+    with pytest.raises(requests.ConnectionError):
+        client.get("http://127.0.0.1:9/unreachable")
+    assert client.retry_stats()["retries"] == 1
+
+
+def test_client_counts_throttled_time(stub_server):
+    server = stub_server(PAGES)
+    client = HttpClient(cache_dir=None, rate_limiter=RateLimiter(rate=10, burst=1))
+
+    for _ in range(3):
+        client.get(server.url("/page"))
+
+    assert client.retry_stats()["throttled_seconds"] >= 0.15
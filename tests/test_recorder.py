@@ -0,0 +1,123 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import time
+
+import pandas as pd
+import pytest
+import requests
+
+from olympics_data_project.web_scrapers import http_client
+from olympics_data_project.web_scrapers.recorder import (
+    FixtureArchive,
+    ReplayMiss,
+    record_traffic,
+    replay_traffic,
+)
+from olympics_data_project.web_scrapers.tokyo2020_medals_scraper import (
+    scrape_all_events_medals,
+)
+from stub_server import make_medals_page
+
+SITE = {
+    "/editions/61/sports/BK3": make_medals_page(
+        {"3x3 Basketball, Men": ["LAT", "ROC", "SRB"]}
+    ),
+    "/editions/61/sports/ARC": make_medals_page(
+        {"Individual, Women": ["An San", "KOR", "Yelena Osipova", "ROC"]}
+    ),
+}
+
+
+def test_record_then_replay_without_network(stub_server, tmp_path):
+    archive_path = tmp_path / "traffic.jsonl.gz"
+    server = stub_server(SITE)
+    links_df = pd.DataFrame(
+        {
+            "href": [server.url(path) for path in SITE],
+            "text": ["3x3 Basketball", "Archery"],
+        }
+    )
+
+    recording = http_client.HttpClient(cache_dir=None)
+    record_traffic(recording.session, archive_path)
+    http_client.set_client(recording)
+    recorded = scrape_all_events_medals(links_df, max_workers=2, delay=0)
+    assert len(FixtureArchive(archive_path).load()) == 2
+
+    # the website is gone, the archive answers instead
+    server.stop()
+    replaying = http_client.HttpClient(cache_dir=None)
+    replay_traffic(replaying.session, archive_path)
+    http_client.set_client(replaying)
+    replayed = scrape_all_events_medals(links_df, max_workers=2, delay=0)
+
+    assert replayed == recorded
+    assert replayed["Archery"]["Individual, Women"][0] == "An San"
+
+
+def test_replay_latency_injection(stub_server, tmp_path):
+    archive_path = tmp_path / "traffic.jsonl.gz"
+    server = stub_server(SITE)
+    url = server.url("/editions/61/sports/BK3")
+    session = requests.Session()
+    record_traffic(session, archive_path)
+    session.get(url)
+
+    session = requests.Session()
+    replay_traffic(session, archive_path, latency=0.1)
+    start = time.monotonic()
+    response = session.get(url)
+
+    assert time.monotonic() - start >= 0.1
+    assert response.status_code == 200
+    assert response.text == SITE["/editions/61/sports/BK3"]
+    assert response.headers["Content-Type"] == "text/html; charset=utf-8"
+
+
+def test_replay_in_recording_order(stub_server, tmp_path):
+    archive_path = tmp_path / "traffic.jsonl.gz"
+    server = stub_server(SITE)
+    server.failures["/editions/61/sports/BK3"] = [(503, {})]
+    url = server.url("/editions/61/sports/BK3")
+    session = requests.Session()
+    record_traffic(session, archive_path)
+    assert session.get(url).status_code == 503
+    assert session.get(url).status_code == 200
+
+    session = requests.Session()
+    replay_traffic(session, archive_path)
+    assert [session.get(url).status_code for _ in range(3)] == [503, 200, 200]
+
+
+def test_replay_unknown_url(tmp_path):
+    archive_path = tmp_path / "traffic.jsonl.gz"
+    FixtureArchive(archive_path).path.write_bytes(b"")
+    session = requests.Session()
+    replay_traffic(session, archive_path)
+    with pytest.raises(ReplayMiss):
+        session.get("http://127.0.0.1:9/missing")
+
+
+def test_client_from_env_replay(stub_server, tmp_path, monkeypatch):
+    archive_path = tmp_path / "traffic.jsonl.gz"
+    server = stub_server(SITE)
+    url = server.url("/editions/61/sports/ARC")
+
+    monkeypatch.setenv("SCRAPER_FIXTURE_ARCHIVE", str(archive_path))
+    monkeypatch.setenv("SCRAPER_HTTP_MODE", "record")
+    http_client.client_from_env().get(url)
+
+    monkeypatch.setenv("SCRAPER_HTTP_MODE", "replay")
+    server.stop()
+    client = http_client.client_from_env()
+    assert client.cache is None
+    assert client.get(url).text == SITE["/editions/61/sports/ARC"]
+
+    # a url missing from the archive fails at once, without retries
+    start = time.perf_counter()
+    with pytest.raises(ReplayMiss):
+        client.get(server.url("/editions/61/sports/BK3"))
+    assert time.perf_counter() - start < 0.5
+    assert client.stats["retries"] == 0
@@ -0,0 +1,49 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from olympics_data_project.data_cleaning import reference_data
+
+
+def test_country_lookups():
+    names = reference_data.country_names()
+    canonical = reference_data.canonical_countries()
+
+    assert "France" in names
+    assert canonical["France"] == "France"
+    assert canonical["Britain"] == "Great Britain"
+
+
+def test_noc_lookups():
+    assert reference_data.noc_by_region()["France"] == "FRA"
+    assert reference_data.region_by_noc()["FRA"] == "France"
+
+
+def test_sports_list():
+    sports = reference_data.sports_list()
+
+    assert sports[0] == "ATHLETICS"
+    assert reference_data.sport_names() == frozenset(sports)
+
+
+def test_parsed_once(tmp_path):
+    """Test that a file is parsed once and shared by the callers"""
+    path = tmp_path / "sports_list.json"
+    path.write_text('["ROWING", "SWIMMING"]')
+
+    first = reference_data.sports_list(path)
+    assert reference_data.sports_list(path) is first
+
+
+def test_parsed_again_when_changed(tmp_path):
+    """Test that a file is parsed again when it changes on disk"""
+    path = tmp_path / "sports_list.json"
+    path.write_text('["ROWING", "SWIMMING"]')
+    assert reference_data.sports_list(path) == ("ROWING", "SWIMMING")
+
+    path.write_text('["ROWING", "SWIMMING", "DIVING"]')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert reference_data.sports_list(path) == ("ROWING", "SWIMMING", "DIVING")
+    assert reference_data.sport_names(path) == {"ROWING", "SWIMMING", "DIVING"}
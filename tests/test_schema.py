@@ -0,0 +1,86 @@
+import sys
+import os
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from olympics_data_project.data_cleaning import schema
+
+
+def medals_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Athlete": ["Leon Marchand", "Ariarne Titmus", "Summer McIntosh"],
+            "Country": ["France", "Australia", "Canada"],
+            "NOC": ["FRA", "AUS", "CAN"],
+            "Year": [2024, 2024, 2024],
+            "Sport": ["Swimming", "Swimming", "Swimming"],
+            "Medal": ["Silver", "Gold", "Bronze (Tie)"],
+        }
+    )
+
+
+def test_apply_schema():
+    df = schema.apply_schema(medals_df())
+
+    assert df["Athlete"].dtype == object
+    assert df["Year"].dtype == "int16"
+    assert df["Country"].dtype == "category"
+    # the categories do not depend on the order of the rows
+    assert list(df["Country"].cat.categories) == ["Australia", "Canada", "France"]
+    assert list(df["Medal"].cat.categories) == schema.MEDAL_ORDER
+
+
+def test_save_and_read_csv(tmp_path):
+    path = tmp_path / "medals.csv"
+    schema.save_csv(medals_df(), path)
+
+    assert schema.schema_path(path).exists()
+    df = schema.read_csv(path)
+    pd.testing.assert_frame_equal(df, schema.apply_schema(medals_df()))
+
+
+def test_read_csv_without_schema_file(tmp_path):
+    """Test that a csv read without its schema file gets the same dtypes"""
+    path = tmp_path / "medals.csv"
+    schema.save_csv(medals_df(), path)
+    with_schema = schema.read_csv(path)
+
+    schema.schema_path(path).unlink()
+    pd.testing.assert_frame_equal(schema.read_csv(path), with_schema)
+
+
+def test_read_csv_with_new_values(tmp_path):
+    """Test that values added to the csv after it was saved are kept"""
+    path = tmp_path / "medals.csv"
+    schema.save_csv(medals_df(), path)
+    with open(path, "a") as f:
+        f.write("Kristof Milak,Hungary,HUN,2024,Swimming,Silver\n")
+
+    df = schema.read_csv(path)
+    assert df["Country"].isna().sum() == 0
+    assert list(df["Country"].cat.categories) == [
+        "Australia",
+        "Canada",
+        "France",
+        "Hungary",
+    ]
+
+
+def test_concat():
+    other = pd.DataFrame(
+        {
+            "Athlete": ["Michael Phelps"],
+            "Country": ["United States"],
+            "NOC": ["USA"],
+            "Year": [2008],
+            "Sport": ["Swimming"],
+            "Medal": ["Gold"],
+        }
+    )
+
+    df = schema.concat([medals_df(), other])
+    assert len(df) == 4
+    assert df["Country"].dtype == "category"
+    assert df["Country"].cat.categories[-1] == "United States"
+    assert df["Year"].dtype == "int16"
@@ -0,0 +1,100 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import time
+
+import pandas as pd
+import olympics_data_project.web_scrapers.tokyo2020_medals_scraper as tms
+from olympics_data_project.web_scrapers.concurrency import HostThrottle
+from stub_server import make_medals_page
+
+SPORT_PAGES = {
+    "/editions/61/sports/SWM": make_medals_page(
+        {
+            "100 metres Freestyle, Men": [
+                "Caeleb Dressel",
+                "USA",
+                "Kyle Chalmers",
+                "AUS",
+            ],
+            "4 x 100 metres Freestyle Relay, Men": ["USA", "ITA", "AUS"],
+        }
+    ),
+    "/editions/61/sports/BK3": make_medals_page(
+        {"3x3 Basketball, Men": ["LAT", "ROC", "SRB"]}
+    ),
+    "/editions/61/sports/ARC": make_medals_page(
+        {"Individual, Women": ["An San", "KOR", "Yelena Osipova", "ROC"]}
+    ),
+}
+
+
+def make_links_df(server):
+    return pd.DataFrame(
+        {
+            "href": [
+                server.url("/editions/61/sports/SWM"),
+                server.url("/results/1"),
+                server.url("/editions/61/sports/BK3"),
+                server.url("/editions/61/sports/ARC"),
+            ],
+            "text": [
+                "Swimming",
+                "100 metres Freestyle, Men",
+                "3x3 Basketball",
+                "Archery",
+            ],
+        }
+    )
+
+
+def test_scrape_events_medals(stub_server):
+    server = stub_server(SPORT_PAGES)
+    medals = tms.scrape_events_medals(server.url("/editions/61/sports/BK3"))
+    assert medals == {"3x3 Basketball, Men": ["LAT", "ROC", "SRB"]}
+
+
+def test_concurrent_matches_sequential(stub_server):
+    server = stub_server(SPORT_PAGES, latency=0.05)
+    links_df = make_links_df(server)
+
+    sequential = tms.scrape_all_events_medals(links_df, max_workers=1, delay=0)
+    concurrent = tms.scrape_all_events_medals(links_df, max_workers=3, delay=0)
+
+    assert concurrent == sequential
+    assert list(concurrent) == ["Swimming", "3x3 Basketball", "Archery"]
+    assert concurrent["Swimming"]["4 x 100 metres Freestyle Relay, Men"] == [
+        "USA",
+        "ITA",
+        "AUS",
+    ]
+
+
+def test_concurrency_limit(stub_server):
+    server = stub_server(SPORT_PAGES, latency=0.1)
+    links_df = make_links_df(server)
+
+    tms.scrape_all_events_medals(links_df, max_workers=2, delay=0)
+
+    assert server.max_in_flight == 2
+
+
+def test_host_throttle_spaces_requests():
+    throttle = HostThrottle(delay=0.05)
+    times = []
+    for _ in range(3):
+        throttle.wait("http://127.0.0.1:8000/page")
+        times.append(time.monotonic())
+
+    # the first request is immediate and the next ones wait for their slot
+    assert times[1] - times[0] >= 0.045
+    assert times[2] - times[1] >= 0.045
+
+
+def test_host_throttle_per_host():
+    throttle = HostThrottle(delay=1.0)
+    start = time.monotonic()
+    throttle.wait("http://host-a.test/page")
+    throttle.wait("http://host-b.test/page")
+    assert time.monotonic() - start < 0.5